@@ -0,0 +1,78 @@
+"""phone index national digits
+
+Revision ID: 1c7e5a3f9d24
+Revises: f4a9c2d7e815
+Create Date: 2026-10-21 14:37:05.862190
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c7e5a3f9d24'
+down_revision = 'f4a9c2d7e815'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Under "alembic" so alembic.ini's INFO level applies
+logger = logging.getLogger("alembic.runtime.migration.phone_index_national_digits")
+
+_DIGITS = "regexp_replace(phone_raw, '[^0-9]', '', 'g')"
+
+# Must match app.services.phone_index.normalize_phone_number
+_NATIONAL = (
+    f"CASE WHEN {_DIGITS} LIKE '84%' AND (btrim(phone_raw) LIKE '+%' OR length({_DIGITS}) >= 11) "
+    f"THEN '0' || substr({_DIGITS}, 3) ELSE {_DIGITS} END"
+)
+
+# Previous normalization: country code and the leading 0 of 10-digit numbers stripped
+_STRIPPED = (
+    f"CASE WHEN {_DIGITS} LIKE '84%' THEN substr({_DIGITS}, 3) "
+    f"WHEN {_DIGITS} LIKE '0%' AND length({_DIGITS}) = 10 THEN substr({_DIGITS}, 2) ELSE {_DIGITS} END"
+)
+
+
+def _renormalize(expression: str) -> int:
+    # Each batch commits on its own, so search stays available and a rerun resumes
+    conn = op.get_bind()
+    last_id, total = -1, 0
+    with op.get_context().autocommit_block():
+        while True:
+            result = conn.execute(
+                sa.text(
+                    f"""
+                    WITH batch AS (
+                        SELECT legacy_id, {expression} AS digits
+                        FROM conversation_phone_index
+                        WHERE legacy_id > :last_id
+                        ORDER BY legacy_id
+                        LIMIT :limit
+                    )
+                    UPDATE conversation_phone_index p
+                    SET phone_digits = left(batch.digits, 32), phone_digits_rev = left(reverse(batch.digits), 32)
+                    FROM batch
+                    WHERE p.legacy_id = batch.legacy_id
+                    RETURNING p.legacy_id
+                    """
+                ),
+                {"last_id": last_id, "limit": BATCH_SIZE},
+            )
+            ids = [row[0] for row in result]
+            if not ids:
+                break
+            last_id = max(ids)
+            total += len(ids)
+    return total
+
+
+def upgrade() -> None:
+    # Indexed phones keep the national 0 prefix, so queries match them without extra variants
+    logger.info("re-normalized %d indexed phones", _renormalize(_NATIONAL))
+
+
+def downgrade() -> None:
+    logger.info("re-normalized %d indexed phones", _renormalize(_STRIPPED))
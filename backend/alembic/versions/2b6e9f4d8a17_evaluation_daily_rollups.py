@@ -0,0 +1,62 @@
+"""evaluation daily rollups
+
+Revision ID: 2b6e9f4d8a17
+Revises: 9d3b5e7a1c20
+Create Date: 2026-10-19 14:55:31.640288
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b6e9f4d8a17'
+down_revision = '9d3b5e7a1c20'
+branch_labels = None
+depends_on = None
+
+ERROR_TYPES = (
+    'repetition',
+    'ask_after_known',
+    'missing_required',
+    'policy_violation',
+    'kb_mismatch',
+    'tone_issue',
+)
+
+
+def upgrade() -> None:
+    op.create_table('evaluation_daily_rollups',
+    sa.Column('bot_index', sa.Integer(), nullable=False, comment='Legacy bot id; 0 when unknown'),
+    sa.Column('day', sa.Date(), nullable=False, comment='UTC date of evaluation created_at'),
+    sa.Column('evaluations', sa.Integer(), nullable=False),
+    sa.Column('overall_good', sa.Integer(), nullable=False),
+    sa.Column('overall_average', sa.Integer(), nullable=False),
+    sa.Column('overall_poor', sa.Integer(), nullable=False),
+    sa.Column('reviewed', sa.Integer(), nullable=False),
+    *[sa.Column(f'{t}_sum', sa.Integer(), nullable=False) for t in ERROR_TYPES],
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('bot_index', 'day')
+    )
+    # Initial backfill; backfill_evaluation_rollups.py rebuilds it later if needed
+    op.execute(
+        f"""
+        INSERT INTO evaluation_daily_rollups
+            (bot_index, day, evaluations, overall_good, overall_average, overall_poor, reviewed,
+             {", ".join(f"{t}_sum" for t in ERROR_TYPES)}, updated_at)
+        SELECT COALESCE(bot_index, 0),
+               CAST(created_at AT TIME ZONE 'UTC' AS DATE),
+               COUNT(*),
+               COUNT(*) FILTER (WHERE overall = 'good'),
+               COUNT(*) FILTER (WHERE overall = 'average'),
+               COUNT(*) FILTER (WHERE overall = 'poor'),
+               COUNT(*) FILTER (WHERE reviewed),
+               {", ".join(f"COALESCE(SUM({t}_count), 0)" for t in ERROR_TYPES)},
+               now()
+        FROM evaluations
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('evaluation_daily_rollups')
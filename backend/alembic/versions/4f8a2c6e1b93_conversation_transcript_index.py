@@ -0,0 +1,41 @@
+"""conversation transcript index
+
+Revision ID: 4f8a2c6e1b93
+Revises: 7c41f0b9d2e5
+Create Date: 2026-10-19 12:08:44.913520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '4f8a2c6e1b93'
+down_revision = '7c41f0b9d2e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.create_table('conversation_transcript_index',
+    sa.Column('conversation_id', sa.Text(), nullable=False),
+    sa.Column('turn_idx', sa.Integer(), nullable=False, comment='Position in bot_memory.messages'),
+    sa.Column('legacy_id', sa.Integer(), nullable=True, comment='Legacy conversation.id'),
+    sa.Column('bot_id', sa.Integer(), nullable=True),
+    sa.Column('role', sa.String(length=32), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('tsv', postgresql.TSVECTOR(), nullable=False, comment="to_tsvector('simple', unaccent(text))"),
+    sa.Column('memory_hash', sa.String(length=32), nullable=True, comment='MD5 of the bot_memory the turn was parsed from'),
+    sa.Column('created_at', sa.DateTime(timezone=False), nullable=True, comment='Legacy conversation.created_at'),
+    sa.Column('indexed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('conversation_id', 'turn_idx')
+    )
+    op.create_index('idx_transcript_tsv', 'conversation_transcript_index', ['tsv'], unique=False, postgresql_using='gin')
+    op.create_index('idx_transcript_bot_created_at', 'conversation_transcript_index', ['bot_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transcript_bot_created_at', table_name='conversation_transcript_index')
+    op.drop_index('idx_transcript_tsv', table_name='conversation_transcript_index')
+    op.drop_table('conversation_transcript_index')
@@ -0,0 +1,31 @@
+"""kb extractions
+
+Revision ID: 5e2f7c9a4b61
+Revises: c8e1a4f7b352
+Create Date: 2026-10-19 17:12:05.913842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5e2f7c9a4b61'
+down_revision = 'c8e1a4f7b352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('kb_extractions',
+    sa.Column('cache_key', sa.String(length=64), nullable=False, comment='sha256 of (system prompt, knowledge.md, model, params)'),
+    sa.Column('model', sa.String(length=64), nullable=False),
+    sa.Column('knowledge_base', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('kb_extractions')
@@ -0,0 +1,30 @@
+"""transcript headline config
+
+Revision ID: 6b1d4e8f2a95
+Revises: a3d8f1b6c074
+Create Date: 2026-10-20 09:14:27.481203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1d4e8f2a95'
+down_revision = 'a3d8f1b6c074'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same lexemes as to_tsvector('simple', unaccent(text)), but parsed from the original
+    # text, so ts_headline can mark accent-folded matches without losing diacritics
+    op.execute("CREATE TEXT SEARCH CONFIGURATION simple_unaccent (COPY = simple)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION simple_unaccent "
+        "ALTER MAPPING FOR asciiword, asciihword, hword_asciipart, word, hword, hword_part WITH unaccent, simple"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS simple_unaccent")
@@ -0,0 +1,39 @@
+"""legacy conversation daily counts
+
+Revision ID: 7c41f0b9d2e5
+Revises: bdf300ee8692
+Create Date: 2026-10-19 11:26:05.304117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7c41f0b9d2e5'
+down_revision = 'bdf300ee8692'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('legacy_conversation_daily',
+    sa.Column('day', sa.Date(), nullable=False, comment='Date of legacy created_at'),
+    sa.Column('bot_id', sa.Integer(), nullable=False, comment='Legacy bot id; 0 when the conversation has none'),
+    sa.Column('conversations', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'bot_id')
+    )
+    # Backfill from rows already mirrored; the sync keeps it current afterwards
+    op.execute(
+        """
+        INSERT INTO legacy_conversation_daily (day, bot_id, conversations, updated_at)
+        SELECT CAST(created_at AS DATE), COALESCE(bot_id, 0), COUNT(*), now()
+        FROM legacy_conversations
+        WHERE customer_phone IS NOT NULL AND created_at IS NOT NULL
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('legacy_conversation_daily')
@@ -0,0 +1,73 @@
+"""evaluation filter columns
+
+Revision ID: 9d3b5e7a1c20
+Revises: 4f8a2c6e1b93
+Create Date: 2026-10-19 13:41:09.226471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9d3b5e7a1c20'
+down_revision = '4f8a2c6e1b93'
+branch_labels = None
+depends_on = None
+
+ERROR_TYPES = (
+    'repetition',
+    'ask_after_known',
+    'missing_required',
+    'policy_violation',
+    'kb_mismatch',
+    'tone_issue',
+)
+
+
+def _count_sql(error_type: str) -> str:
+    path = f"'{{summary,counts,{error_type}}}'"
+    return (
+        f"CASE WHEN jsonb_typeof(evaluation_result #> {path}) = 'number' "
+        f"THEN (evaluation_result #>> {path})::numeric::integer END"
+    )
+
+
+def upgrade() -> None:
+    # Adding stored generated columns rewrites the table once (ACCESS EXCLUSIVE);
+    # the indexes below are then built without blocking writes.
+    op.add_column('evaluations', sa.Column('bot_index', sa.Integer(), nullable=True))
+    op.add_column('evaluations', sa.Column('overall', sa.Text(), sa.Computed("evaluation_result #>> '{summary,overall}'", persisted=True), nullable=True))
+    for error_type in ERROR_TYPES:
+        op.add_column('evaluations', sa.Column(f'{error_type}_count', sa.Integer(), sa.Computed(_count_sql(error_type), persisted=True), nullable=True))
+
+    # Backfill the denormalized bot id from the conversation mirror
+    op.execute(
+        """
+        UPDATE evaluations e
+        SET bot_index = lc.bot_id
+        FROM legacy_conversations lc
+        WHERE lc.conversation_id = e.conversation_id AND e.bot_index IS NULL
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index('idx_evaluation_created_at_id', 'evaluations', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_evaluation_overall_created_at_id', 'evaluations', ['overall', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_evaluation_bot_created_at_id', 'evaluations', ['bot_index', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_evaluation_unreviewed_created_at_id', 'evaluations', ['created_at', 'id'], unique=False, postgresql_where=sa.text('reviewed = false'), postgresql_concurrently=True)
+        for error_type in ERROR_TYPES:
+            op.create_index(f'idx_evaluation_has_{error_type}_created_at_id', 'evaluations', ['created_at', 'id'], unique=False, postgresql_where=sa.text(f'{error_type}_count > 0'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for error_type in ERROR_TYPES:
+            op.drop_index(f'idx_evaluation_has_{error_type}_created_at_id', table_name='evaluations', postgresql_concurrently=True)
+        op.drop_index('idx_evaluation_unreviewed_created_at_id', table_name='evaluations', postgresql_concurrently=True)
+        op.drop_index('idx_evaluation_bot_created_at_id', table_name='evaluations', postgresql_concurrently=True)
+        op.drop_index('idx_evaluation_overall_created_at_id', table_name='evaluations', postgresql_concurrently=True)
+        op.drop_index('idx_evaluation_created_at_id', table_name='evaluations', postgresql_concurrently=True)
+    for error_type in reversed(ERROR_TYPES):
+        op.drop_column('evaluations', f'{error_type}_count')
+    op.drop_column('evaluations', 'overall')
+    op.drop_column('evaluations', 'bot_index')
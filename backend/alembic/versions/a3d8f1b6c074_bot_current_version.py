@@ -0,0 +1,37 @@
+"""bot current version
+
+Revision ID: a3d8f1b6c074
+Revises: 5e2f7c9a4b61
+Create Date: 2026-10-19 17:58:40.227915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a3d8f1b6c074'
+down_revision = '5e2f7c9a4b61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('bots', sa.Column('current_version_id', postgresql.UUID(as_uuid=True), nullable=True, comment='bot_versions.id of the latest version'))
+    # Point every bot at its newest version
+    op.execute(
+        """
+        UPDATE bots b
+        SET current_version_id = v.id
+        FROM (
+            SELECT DISTINCT ON (bot_index) id, bot_index
+            FROM bot_versions
+            ORDER BY bot_index, created_at DESC
+        ) v
+        WHERE v.bot_index = b.bot_index
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('bots', 'current_version_id')
@@ -0,0 +1,60 @@
+"""legacy conversation mirror
+
+Revision ID: bdf300ee8692
+Revises: e2d27a59c634
+Create Date: 2026-10-19 10:03:17.552931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'bdf300ee8692'
+down_revision = 'e2d27a59c634'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('legacy_conversations',
+    sa.Column('legacy_id', sa.Integer(), autoincrement=False, nullable=False, comment='Legacy conversation.id'),
+    sa.Column('conversation_id', sa.Text(), nullable=True),
+    sa.Column('customer_phone', sa.String(length=64), nullable=True, comment='Trimmed phone; NULL for chats'),
+    sa.Column('bot_id', sa.Integer(), nullable=True),
+    sa.Column('memory_size', sa.Integer(), nullable=True, comment='Length of legacy bot_memory'),
+    sa.Column('created_at', sa.DateTime(timezone=False), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=False), nullable=True),
+    sa.Column('synced_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('legacy_id')
+    )
+    op.create_index('idx_legacy_conv_bot_created_at', 'legacy_conversations', ['bot_id', 'created_at'], unique=False)
+    op.create_index('idx_legacy_conv_created_at_id', 'legacy_conversations', ['created_at', 'legacy_id'], unique=False)
+    op.create_index('idx_legacy_conv_updated_at_id', 'legacy_conversations', ['updated_at', 'legacy_id'], unique=False)
+    op.create_index(op.f('ix_legacy_conversations_conversation_id'), 'legacy_conversations', ['conversation_id'], unique=False)
+    op.create_table('legacy_bots',
+    sa.Column('legacy_id', sa.Integer(), autoincrement=False, nullable=False, comment='Legacy bot.id'),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=False), nullable=True),
+    sa.Column('synced_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('legacy_id')
+    )
+    op.create_index(op.f('ix_legacy_bots_name'), 'legacy_bots', ['name'], unique=False)
+    op.create_table('legacy_sync_state',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('last_updated_at', sa.DateTime(timezone=False), nullable=True),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.Column('caught_up_at', sa.DateTime(timezone=True), nullable=True, comment='Last time a pass reached the end of the source table'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('legacy_sync_state')
+    op.drop_index(op.f('ix_legacy_bots_name'), table_name='legacy_bots')
+    op.drop_table('legacy_bots')
+    op.drop_index(op.f('ix_legacy_conversations_conversation_id'), table_name='legacy_conversations')
+    op.drop_index('idx_legacy_conv_updated_at_id', table_name='legacy_conversations')
+    op.drop_index('idx_legacy_conv_created_at_id', table_name='legacy_conversations')
+    op.drop_index('idx_legacy_conv_bot_created_at', table_name='legacy_conversations')
+    op.drop_table('legacy_conversations')
@@ -0,0 +1,136 @@
+"""evaluation memories
+
+Revision ID: c8e1a4f7b352
+Revises: 2b6e9f4d8a17
+Create Date: 2026-10-19 15:48:12.508334
+
+"""
+import hashlib
+import logging
+import zlib
+from alembic import op
+import orjson
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c8e1a4f7b352'
+down_revision = '2b6e9f4d8a17'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# Under "alembic" so alembic.ini's INFO level applies
+logger = logging.getLogger("alembic.runtime.migration.evaluation_memories")
+
+
+def _encode(memory):
+    # Must match app.services.evaluation_memory.encode_memory
+    raw = orjson.dumps(memory, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, 6), len(raw)
+
+
+def upgrade() -> None:
+    op.create_table('evaluation_memories',
+    sa.Column('hash', sa.String(length=64), nullable=False, comment='sha256 of the canonical (sorted-key) JSON'),
+    sa.Column('payload', sa.LargeBinary(), nullable=False, comment='zlib-compressed canonical JSON'),
+    sa.Column('raw_size', sa.Integer(), nullable=False, comment='Uncompressed JSON size in bytes'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    # Payloads are already compressed; keep TOAST from trying again
+    op.execute("ALTER TABLE evaluation_memories ALTER COLUMN payload SET STORAGE EXTERNAL")
+    op.add_column('evaluations', sa.Column('memory_hash', sa.String(length=64), nullable=True, comment='evaluation_memories.hash'))
+    op.create_index(op.f('ix_evaluations_memory_hash'), 'evaluations', ['memory_hash'], unique=False)
+    op.alter_column('evaluations', 'memory', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+
+    # Move inline memories out in batches. Each statement commits on its own inside
+    # the autocommit block: memories are inserted (idempotently) before the rows that
+    # point at them are updated, so an interrupted run resumes where it stopped.
+    conn = op.get_bind()
+    size_before = conn.execute(sa.text("SELECT pg_total_relation_size('evaluations')")).scalar()
+    moved = raw_total = stored_total = 0
+    seen = set()
+    with op.get_context().autocommit_block():
+        while True:
+            rows = conn.execute(
+                sa.text(
+                    """
+                    SELECT id, memory FROM evaluations
+                    WHERE memory IS NOT NULL AND memory_hash IS NULL
+                    ORDER BY id
+                    LIMIT :limit
+                    """
+                ),
+                {"limit": BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            memories, updates = {}, []
+            for row_id, memory in rows:
+                mem_hash, payload, raw_size = _encode(memory)
+                updates.append({"id": row_id, "memory_hash": mem_hash})
+                raw_total += raw_size
+                if mem_hash not in seen:
+                    memories[mem_hash] = {"hash": mem_hash, "payload": payload, "raw_size": raw_size}
+                    stored_total += len(payload)
+                    seen.add(mem_hash)
+            if memories:
+                conn.execute(
+                    sa.text(
+                        """
+                        INSERT INTO evaluation_memories (hash, payload, raw_size)
+                        VALUES (:hash, :payload, :raw_size)
+                        ON CONFLICT (hash) DO NOTHING
+                        """
+                    ),
+                    list(memories.values()),
+                )
+            conn.execute(
+                sa.text("UPDATE evaluations SET memory_hash = :memory_hash, memory = NULL WHERE id = :id"),
+                updates,
+            )
+            moved += len(rows)
+    size_after = conn.execute(
+        sa.text("SELECT pg_total_relation_size('evaluations') + pg_total_relation_size('evaluation_memories')")
+    ).scalar()
+    logger.info(
+        "moved %d memories (%d distinct), %.1f MiB JSON -> %.1f MiB compressed; evaluations %.1f MiB before, "
+        "evaluations + evaluation_memories %.1f MiB after (run VACUUM FULL evaluations to return freed pages to the OS)",
+        moved,
+        len(seen),
+        raw_total / 1048576,
+        stored_total / 1048576,
+        size_before / 1048576,
+        size_after / 1048576,
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        while True:
+            rows = conn.execute(
+                sa.text(
+                    """
+                    SELECT e.id, m.payload FROM evaluations e
+                    JOIN evaluation_memories m ON m.hash = e.memory_hash
+                    WHERE e.memory IS NULL
+                    ORDER BY e.id
+                    LIMIT :limit
+                    """
+                ),
+                {"limit": BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                sa.text("UPDATE evaluations SET memory = CAST(:memory AS JSONB) WHERE id = :id"),
+                [{"id": row_id, "memory": zlib.decompress(payload).decode("utf-8")} for row_id, payload in rows],
+            )
+    op.execute("UPDATE evaluations SET memory = '{}'::jsonb WHERE memory IS NULL")
+    op.alter_column('evaluations', 'memory', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=False)
+    op.drop_index(op.f('ix_evaluations_memory_hash'), table_name='evaluations')
+    op.drop_column('evaluations', 'memory_hash')
+    op.drop_table('evaluation_memories')
@@ -0,0 +1,44 @@
+"""conversation phone index
+
+Revision ID: e2d27a59c634
+Revises: ac5b21e0e31f
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2d27a59c634'
+down_revision = 'ac5b21e0e31f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table('conversation_phone_index',
+    sa.Column('legacy_id', sa.Integer(), autoincrement=False, nullable=False, comment='Legacy conversation.id'),
+    sa.Column('conversation_id', sa.Text(), nullable=True),
+    sa.Column('bot_id', sa.Integer(), nullable=True),
+    sa.Column('phone_raw', sa.String(length=64), nullable=False),
+    sa.Column('phone_digits', sa.String(length=32), nullable=False),
+    sa.Column('phone_digits_rev', sa.String(length=32), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=False), nullable=True, comment='Legacy conversation.created_at'),
+    sa.Column('indexed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('legacy_id')
+    )
+    op.create_index(op.f('ix_conversation_phone_index_conversation_id'), 'conversation_phone_index', ['conversation_id'], unique=False)
+    op.create_index('idx_phone_index_created_at', 'conversation_phone_index', ['created_at'], unique=False)
+    op.create_index('idx_phone_index_digits_prefix', 'conversation_phone_index', ['phone_digits'], unique=False, postgresql_ops={'phone_digits': 'text_pattern_ops'})
+    op.create_index('idx_phone_index_digits_rev_prefix', 'conversation_phone_index', ['phone_digits_rev'], unique=False, postgresql_ops={'phone_digits_rev': 'text_pattern_ops'})
+    op.create_index('idx_phone_index_digits_trgm', 'conversation_phone_index', ['phone_digits'], unique=False, postgresql_using='gin', postgresql_ops={'phone_digits': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('idx_phone_index_digits_trgm', table_name='conversation_phone_index')
+    op.drop_index('idx_phone_index_digits_rev_prefix', table_name='conversation_phone_index')
+    op.drop_index('idx_phone_index_digits_prefix', table_name='conversation_phone_index')
+    op.drop_index('idx_phone_index_created_at', table_name='conversation_phone_index')
+    op.drop_index(op.f('ix_conversation_phone_index_conversation_id'), table_name='conversation_phone_index')
+    op.drop_table('conversation_phone_index')
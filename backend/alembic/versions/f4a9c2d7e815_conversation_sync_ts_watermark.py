@@ -0,0 +1,33 @@
+"""conversation sync_ts watermark
+
+Revision ID: f4a9c2d7e815
+Revises: 6b1d4e8f2a95
+Create Date: 2026-10-21 10:02:51.317406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a9c2d7e815'
+down_revision = '6b1d4e8f2a95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The conversation sync now orders by COALESCE(updated_at, created_at): rescan once so
+    # rows that never had updated_at set are mirrored. caught_up_at is kept, so listings
+    # stay on the mirror while the rescan runs; unchanged transcripts are not re-indexed.
+    op.execute(
+        "UPDATE legacy_sync_state SET last_updated_at = '1970-01-01 00:00:00', last_id = 0 "
+        "WHERE name = 'conversation'"
+    )
+    # The phone and transcript indexes are now written by the conversation sync
+    op.execute("DELETE FROM legacy_sync_state WHERE name IN ('phone_index', 'transcript')")
+
+
+def downgrade() -> None:
+    # The separate phone/transcript syncs restart from the epoch on their own
+    pass
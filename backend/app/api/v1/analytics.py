@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.core.db import get_db
+from app.models.base import EVALUATION_ERROR_TYPES, EvaluationDailyRollup
+from app.services.evaluation_rollup import ROLLUP_COLUMNS
+
+
+router = APIRouter()
+
+
+class QAStats(BaseModel):
+    evaluations: int
+    overall: Dict[str, int]
+    errors: Dict[str, int]
+    reviewed: int
+
+
+class QADailyStats(QAStats):
+    day: date
+
+
+def _to_stats(values: Dict[str, int]) -> Dict[str, object]:
+    return {
+        "evaluations": values["evaluations"],
+        "overall": {v: values[f"overall_{v}"] for v in ("good", "average", "poor")},
+        "errors": {t: values[f"{t}_sum"] for t in EVALUATION_ERROR_TYPES},
+        "reviewed": values["reviewed"],
+    }
+
+
+def _rollup_query(bot_index: Optional[int], start_day: Optional[date], end_day: Optional[date]):
+    r = EvaluationDailyRollup
+    columns = [func.coalesce(func.sum(getattr(r, c)), 0).label(c) for c in ROLLUP_COLUMNS]
+    query = select(*columns)
+    if bot_index is not None:
+        query = query.where(r.bot_index == bot_index)
+    if start_day is not None:
+        query = query.where(r.day >= start_day)
+    if end_day is not None:
+        query = query.where(r.day <= end_day)
+    return query
+
+
+def _check_range(start_day: Optional[date], end_day: Optional[date]) -> None:
+    if start_day and end_day and end_day < start_day:
+        raise HTTPException(status_code=400, detail="end_day is before start_day")
+
+
+@router.get(
+    "/overview",
+    response_model=QAStats,
+    summary="QA totals",
+    description="Verdict, error-type and review totals from the daily QA rollups (inclusive UTC day range).",
+)
+async def get_qa_overview(
+    bot_index: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    _check_range(start_day, end_day)
+    result = await db.execute(_rollup_query(bot_index, start_day, end_day))
+    return QAStats(**_to_stats(dict(result.mappings().one())))
+
+
+@router.get(
+    "/daily",
+    response_model=List[QADailyStats],
+    summary="QA per day",
+    description="Per-day verdict, error-type and review counts from the daily QA rollups.",
+)
+async def get_qa_daily(
+    bot_index: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    limit: int = Query(366, ge=1, le=3660, description="Max days, newest first"),
+    db: AsyncSession = Depends(get_db),
+):
+    _check_range(start_day, end_day)
+    r = EvaluationDailyRollup
+    query = (
+        _rollup_query(bot_index, start_day, end_day)
+        .add_columns(r.day)
+        .group_by(r.day)
+        .order_by(r.day.desc())
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return [QADailyStats(day=row["day"], **_to_stats(dict(row))) for row in result.mappings().all()]
@@ -1,19 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel
 from app.core.db import get_db, get_read_db
 from app.models.base import Bot, BotVersion
 from app.services.legacy_queries import fetch_bot_detail
-from app.services.openai_client import openai_service
-from app.utils.prompt_loader import load_prompt
+from app.services.bot_import import import_legacy_bots
+from app.services.bot_versions import invalidate_latest_kb
+from app.services.jobs import get_job, start_job
+from app.services.knowledge_base import extract_knowledge_base_cached, regenerate_knowledge_base
 import uuid
 from datetime import datetime
 import logging
 import json
-import re
-from app.core.redis import get_redis
+from app.core.redis import get_binary_redis, get_redis
+from app.core.cache import bump_generation, cached_response_body, namespaced_key, read_through_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -34,6 +36,46 @@ class BotVersionResponse(BaseModel):
     knowledge_base: dict
     created_at: datetime
 
+class BotImportRequest(BaseModel):
+    indexes: Union[List[int], Literal["all"]]
+
+class JobFailure(BaseModel):
+    item: Any
+    error: str
+    at: Optional[str] = None
+
+class BotImportJobResponse(BaseModel):
+    id: str
+    status: str
+    indexes: Union[List[int], str]
+    total: Optional[int] = None
+    created: Optional[int] = None
+    skipped: Optional[int] = None
+    missing: Optional[int] = None
+    kb_total: Optional[int] = None
+    kb_done: Optional[int] = None
+    kb_failed: Optional[int] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    failures: List[JobFailure] = []
+
+class KnowledgeBaseJobResponse(BaseModel):
+    id: str
+    status: str
+    bot_index: int
+    force: bool = False
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    error: Optional[str] = None
+    # version_id, cached (LLM skipped), new_version
+    result: Optional[Dict[str, Any]] = None
+
 @router.post(
     "/",
     response_model=BotResponse,
@@ -97,21 +139,16 @@ async def create_bot(
     # Build knowledge_base via LLM from the legacy system_prompt
     if legacy_bot and getattr(legacy_bot, "system_prompt", None):
         try:
-            knowledge_prompt = load_prompt("knowledge.md")
-            messages = [
-                {"role": "system", "content": knowledge_prompt},
-                {"role": "user", "content": legacy_bot.system_prompt},
-            ]
-            kb_str = await openai_service.chat_completion(
-                messages=messages,
-                temperature=0.4
-            )
-            initial_version.knowledge_base = json.loads(kb_str)
+            initial_version.knowledge_base, _ = await extract_knowledge_base_cached(db, legacy_bot.system_prompt)
         except Exception:
             # If parsing or LLM fails, keep empty knowledge_base
             initial_version.knowledge_base = {}
 
+    await db.flush()
+    bot.current_version_id = initial_version.id
     await db.commit()
+    await _invalidate_bot_list()
+    await invalidate_latest_kb(bot.bot_index)
 
     return BotResponse(
         id=str(bot.id),
@@ -120,74 +157,83 @@ async def create_bot(
         created_at=bot.created_at,
     )
 
+@router.post(
+    "/import",
+    response_model=BotImportJobResponse,
+    status_code=202,
+    summary="Bulk import bots from legacy indexes",
+    description="Start a background job importing legacy bots (a list of indexes, or \"all\"). "
+    "Already imported bots are skipped; poll GET /bots/import/{job_id} for progress and failures.",
+)
+async def import_bots(body: BotImportRequest):
+    indexes = None if body.indexes == "all" else sorted(set(body.indexes))
+    if indexes is not None and not indexes:
+        raise HTTPException(status_code=400, detail="indexes is empty")
+    job_id = await start_job(
+        "bot_import",
+        lambda job_id: import_legacy_bots(job_id, indexes),
+        indexes=body.indexes if indexes is None else indexes,
+    )
+    return BotImportJobResponse(**await get_job(job_id))
+
+@router.get(
+    "/import/{job_id}",
+    response_model=BotImportJobResponse,
+    summary="Bulk import progress",
+)
+async def get_import_job(job_id: str = Path(..., description="Job id returned by POST /bots/import")):
+    job = await get_job(job_id)
+    if not job or job.get("kind") != "bot_import":
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return BotImportJobResponse(**job)
+
 @router.get(
     "/",
     response_model=List[BotResponse],
     summary="List bots",
     description="Return all bots in the write database."
 )
-async def list_bots(limit: int = Query(100, ge=1, le=1000), db: AsyncSession = Depends(get_db)):
-    """List all bots"""
-    redis = await get_redis()
-    cache_key = f"bots:list:{limit}"
-
-    # Check database first, then cache
-    query = select(Bot).order_by(Bot.created_at.desc()).limit(limit)
-    result = await db.execute(query)
-    bots = result.scalars().all()
-
-    logger.info(f"Database query returned {len(bots)} bots")
+async def list_bots(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """List all bots (read-through cached; bot writes bump the `bots:list` generation)"""
+    cache_key = await namespaced_key("bots:list", limit)
+
+    async def load():
+        query = select(Bot).order_by(Bot.created_at.desc()).limit(limit)
+        result = await db.execute(query)
+        bots = result.scalars().all()
+        logger.info(f"Database query returned {len(bots)} bots")
+        return [
+            BotResponse(
+                id=str(bot.id),
+                index=bot.bot_index,
+                name=bot.name,
+                created_at=bot.created_at,
+            ).dict()
+            for bot in bots
+        ]
 
-    payload = [
-        BotResponse(
-            id=str(bot.id),
-            index=bot.bot_index,
-            name=bot.name,
-            created_at=bot.created_at,
-        )
-        for bot in bots
-    ]
+    # Bots TTL: 24 hours
+    return await read_through_response(cache_key, 86400, load, request)
 
-    # Only cache if we have data
-    if payload:
-        try:
-            await redis.setex(cache_key, 86400, json.dumps([p.dict() for p in payload]))
-            logger.info(f"Cached {len(payload)} bots with key {cache_key}")
-        except Exception as e:
-            logger.warning(f"Failed to cache bots: {e}")
 
-    # Check if there's stale cache data
+async def _invalidate_bot_list() -> None:
     try:
-        cached = await redis.get(cache_key)
-        if cached:
-            try:
-                cached_data = json.loads(cached)
-                if len(cached_data) != len(payload):
-                    logger.warning(f"Cache inconsistency: cached={len(cached_data)}, actual={len(payload)}")
-                    # Delete stale cache
-                    await redis.delete(cache_key)
-                    logger.info(f"Deleted stale cache key: {cache_key}")
-            except Exception as e:
-                logger.warning(f"Cache data corruption for {cache_key}: {e}")
-                await redis.delete(cache_key)
+        await bump_generation("bots:list")
     except Exception as e:
-        logger.warning(f"Cache check failed: {e}")
-
-    return payload
+        logger.warning(f"Failed to invalidate bot list cache: {e}")
 
 @router.delete("/cache", summary="Clear bots cache", description="Clear all cached bot data")
 async def clear_bots_cache():
     """Clear all cached bot data"""
-    redis = await get_redis()
     try:
-        # Get all bot cache keys
-        keys = await redis.keys("bots:list:*")
-        if keys:
-            await redis.delete(*keys)
-            logger.info(f"Cleared {len(keys)} bot cache keys")
-            return {"message": f"Cleared {len(keys)} cache entries", "cleared_keys": keys}
-        else:
-            return {"message": "No cache keys found"}
+        # Older generations become unreachable and expire through their TTL
+        await bump_generation("bots:list")
+        logger.info("Bumped bot list cache generation")
+        return {"message": "Bot list cache invalidated"}
     except Exception as e:
         logger.error(f"Failed to clear cache: {e}")
         raise HTTPException(status_code=500, detail="Failed to clear cache")
@@ -202,15 +248,16 @@ async def debug_bots(db: AsyncSession = Depends(get_db)):
     result = await db.execute(query)
     bots = result.scalars().all()
 
-    # Check cache
-    cache_keys = await redis.keys("bots:list:*")
+    # Check cache (current generation only; SCAN does not block Redis like KEYS)
+    prefix = await namespaced_key("bots:list")
+    cache_keys = [key async for key in redis.scan_iter(match=f"{prefix}:*")]
     cache_info = {}
+    binary_redis = await get_binary_redis()
     for key in cache_keys:
         try:
-            cached = await redis.get(key)
-            if cached:
-                data = json.loads(cached)
-                cache_info[key] = len(data)
+            body = cached_response_body(await binary_redis.get(key))
+            if body:
+                cache_info[key] = len(json.loads(body))
         except Exception:
             cache_info[key] = "corrupted"
 
@@ -297,112 +344,49 @@ async def get_bot_versions(
 
 @router.post(
     "/{bot_index}/knowledge_base/regenerate",
-    response_model=BotVersionResponse,
+    response_model=KnowledgeBaseJobResponse,
+    status_code=202,
     summary="Regenerate knowledge base",
-    description="Regenerate the bot's knowledge base using the latest system prompt, creating a new version."
+    description="Start a background job regenerating the KB from the latest system prompt. "
+    "An extraction cached for the same prompt, knowledge.md and model is reused unless `force` is set; "
+    "a new version is only created when the KB changes. Poll GET /bots/{bot_index}/knowledge_base/jobs/{job_id}."
 )
 async def update_bot_knowledge_base(
     bot_index: int = Path(..., description="Legacy bot index (external id)"),
+    force: bool = Query(False, description="Call the LLM even if a cached extraction exists"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Regenerate knowledge base for the latest bot version and create a new version."""
-    # Resolve bot
+    """Queue KB regeneration for the latest bot version."""
+    # Resolve bot and version up front so unknown bots fail fast
     bot_query = select(Bot).where(Bot.bot_index == bot_index)
     bot_result = await db.execute(bot_query)
     bot = bot_result.scalar_one_or_none()
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
-    # Get latest version for this bot
-    ver_query = (
-        select(BotVersion)
-        .where(BotVersion.bot_index == bot.bot_index)
-        .order_by(BotVersion.created_at.desc())
-        .limit(1)
-    )
+    ver_query = select(BotVersion.id).where(BotVersion.bot_index == bot.bot_index).limit(1)
     ver_result = await db.execute(ver_query)
-    current_version = ver_result.scalar_one_or_none()
-    if not current_version:
+    if ver_result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Bot version not found")
 
-    # Regenerate KB from the current system prompt
-    system_prompt = current_version.system_prompt
-    try:
-        knowledge_prompt = load_prompt("knowledge.md")
-        messages = [
-            {"role": "system", "content": knowledge_prompt},
-            {"role": "user", "content": system_prompt},
-        ]
-        logger.info("Regenerating KB for bot_index=%s using LLM", bot.bot_index)
-        kb_str = await openai_service.chat_completion(
-            model="gpt-4.1",
-            messages=messages,
-            temperature=0.4,
-            response_format={"type": "json_object"}
-        )
-        logger.info("LLM responded for bot_index=%s, length=%d", bot.bot_index, len(kb_str or ""))
-        kb_json = _parse_kb_json_safe(kb_str)
-    except Exception as e:
-        logger.error("KB regeneration failed for bot_index=%s: %s", bot.bot_index, e)
-        kb_json = {}
-
-    # Create new version with regenerated KB
-    new_version = BotVersion(
+    job_id = await start_job(
+        "kb_regenerate",
+        lambda job_id: regenerate_knowledge_base(bot.bot_index, force=force),
         bot_index=bot.bot_index,
-        system_prompt=system_prompt,
-        knowledge_base=kb_json,
+        force=force,
     )
-    db.add(new_version)
-    await db.commit()
-
-    return BotVersionResponse(
-        id=str(new_version.id),
-        bot_index=new_version.bot_index,
-        system_prompt=new_version.system_prompt,
-        knowledge_base=new_version.knowledge_base,
-        created_at=new_version.created_at,
-    )
-
-
-def _parse_kb_json_safe(text: str) -> dict:
-    """Parse JSON content returned by LLM defensively.
+    return KnowledgeBaseJobResponse(**await get_job(job_id))
 
-    - Accepts content wrapped in markdown code fences
-    - Extracts the first top-level JSON object if extra text is present
-    - Falls back to empty dict on failure
-    """
-    if not text:
-        return {}
-
-    # Fast path
-    try:
-        return json.loads(text)
-    except Exception:
-        pass
-
-    content = text.strip()
-
-    # Strip markdown code fences if any
-    if content.startswith("```"):
-        # Remove opening fence with optional language
-        content = re.sub(r"^```[a-zA-Z0-9_-]*\s*", "", content)
-        # Remove closing fence
-        content = re.sub(r"```\s*$", "", content)
-
-    # Try again
-    try:
-        return json.loads(content)
-    except Exception:
-        pass
-
-    # Extract substring between first '{' and last '}'
-    start = content.find("{")
-    end = content.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        candidate = content[start : end + 1]
-        try:
-            return json.loads(candidate)
-        except Exception:
-            logger.warning("Failed to parse KB JSON from candidate substring; returning empty dict")
-
-    return {}
\ No newline at end of file
+@router.get(
+    "/{bot_index}/knowledge_base/jobs/{job_id}",
+    response_model=KnowledgeBaseJobResponse,
+    summary="Knowledge base regeneration status",
+)
+async def get_knowledge_base_job(
+    bot_index: int = Path(..., description="Legacy bot index (external id)"),
+    job_id: str = Path(..., description="Job id returned by the regenerate endpoint"),
+):
+    job = await get_job(job_id)
+    if not job or job.get("kind") != "kb_regenerate" or job.get("bot_index") != bot_index:
+        raise HTTPException(status_code=404, detail="Regeneration job not found")
+    return KnowledgeBaseJobResponse(**job)
@@ -1,39 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
-from typing import List, Optional
-from pydantic import BaseModel
+from sqlalchemy import select, text, bindparam
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
 from app.core.db import get_read_db, get_db
-from app.services.legacy_queries import fetch_conversations_time_range
+from app.api.v1.evaluations import EvaluationResponse
 from app.models.base import Evaluation, Bot
-from datetime import datetime
+from datetime import date, datetime
+import asyncio
 import json
 import logging
-import re
-from app.core.redis import get_redis
+from app.core.redis import get_binary_redis
+from app.core.cache import (
+    cache_response,
+    cached_response_body,
+    get_cached_response,
+    record_cache_hit,
+    record_cache_miss,
+    response_cache_entry,
+)
+from app.services.conversation_cache import conversation_page_tags, conversation_stats_tags
+from app.services.conversation_mirror import (
+    get_conversation_sync_watermark,
+    get_mirror_status,
+    parse_ts,
+    query_mirror_conversations,
+)
+from app.services.conversation_stats import conversation_stats
+from app.services.evaluated_ids import QA_SCAN_MAX_ROWS, scan_by_qa_status
+from app.services.evaluation_memory import load_evaluation_memories
+from app.services.span_extraction import SpanTuple, extract_spans, get_cached_spans_many, load_conversation_spans
+from app.services.phone_index import PHONE_SEARCH_MAX_IDS, search_phone_index
+from app.services.transcript_search import search_transcripts
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
-def normalize_phone_number(phone: str) -> str:
-    """Normalize phone number for consistent search.
-    - Remove all non-digit characters
-    - Handle Vietnamese phone numbers (+84, 0 prefixes)
-    - Support partial matching
-    """
-    if not phone:
-        return phone
-
-    # Remove all non-digit characters
-    normalized = re.sub(r'\D', '', phone)
-
-    # Handle Vietnamese phone numbers
-    if normalized.startswith('84'):
-        normalized = normalized[2:]  # Remove country code
-    elif normalized.startswith('0') and len(normalized) == 10:
-        normalized = normalized[1:]  # Remove leading 0 for Vietnamese numbers
-
-    return normalized
-
 router = APIRouter()
 
 class ConversationResponse(BaseModel):
@@ -54,94 +56,162 @@ class SpanResponse(BaseModel):
     embedding: Optional[List[float]]
     created_at: datetime
 
-@router.get("/", response_model=List[ConversationResponse])
-async def list_conversations(
-    bot_id: Optional[int] = None,
-    start_ts: Optional[str] = None,
-    end_ts: Optional[str] = None,
-    phone_like: Optional[str] = None,
-    conversation_id_like: Optional[str] = None,
-    bot_name_like: Optional[str] = None,
-    qa_status: Optional[str] = None,  # "qa", "notqa", or None
-    limit: int = 50,
-    offset: int = 0,
-    db: AsyncSession = Depends(get_read_db),
-    write_db: AsyncSession = Depends(get_db)
-):
-    """List conversations from read DB with filters. Only returns CALLs (exclude chats).
+class ConversationPage(BaseModel):
+    items: List[ConversationResponse]
+    next_cursor: Optional[str] = None
+    mirror_lag_seconds: Optional[float] = None
 
-    - bot_id: legacy bot id (int)
-    - start_ts, end_ts: ISO timestamps or DB-compatible datetime strings
-    - phone_like: phone number search pattern
-    - conversation_id_like: conversation ID search pattern (partial match)
-    - bot_name_like: bot name search pattern (partial match)
-    - qa_status: "qa" (has evaluation), "notqa" (no evaluation), or None (all)
-    - limit: max rows
-    """
-    # Try cache first
-    cache_key = f"conv:list:{bot_id}:{start_ts}:{end_ts}:{phone_like}:{conversation_id_like}:{bot_name_like}:{qa_status}:{limit}:{offset}"
-    redis = await get_redis()
-    cached = await redis.get(cache_key)
-    if cached:
-        try:
-            data = json.loads(cached)
-            return [ConversationResponse(**x) for x in data]
-        except Exception:
-            pass
-
-    # Base SQL query for conversations (from read DB)
-    # Note: QA status filtering will be handled in Python after joining with evaluations
-    # Build SQL query conditionally based on bot_name_like parameter
-    if bot_name_like:
-        # If bot name filtering is requested, try to join with bot table
-        sql = text(
-            """
-            SELECT
+
+class DayCount(BaseModel):
+    day: date
+    count: int
+
+
+class ConversationStatsResponse(BaseModel):
+    total: int
+    estimated: bool
+    source: str
+    histogram: List[DayCount]
+    mirror_lag_seconds: Optional[float] = None
+
+
+class TranscriptHit(BaseModel):
+    conversation_id: str
+    turn_idx: int
+    role: str
+    text: str
+    highlight: str
+    rank: float
+    bot_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class MirrorStatusResponse(BaseModel):
+    ready: bool
+    lag_seconds: Optional[float] = None
+    last_updated_at: Optional[datetime] = None
+    last_id: Optional[int] = None
+
+
+_CONVERSATION_COLUMNS = """
               c.id,
               c.conversation_id,
               c.customer_phone,
               c.bot_id,
               c.created_at,
               c.updated_at
-            FROM conversation c
-            LEFT JOIN bot b ON c.bot_id = b.bot_index
-            WHERE (c.customer_phone IS NOT NULL AND TRIM(c.customer_phone) <> '')
-              AND (:bot_id IS NULL OR c.bot_id = :bot_id)
-              AND (:start_ts IS NULL OR c.created_at >= :start_ts)
-              AND (:end_ts IS NULL OR c.created_at < :end_ts)
-              AND (:phone_like IS NULL OR TRIM(c.customer_phone) LIKE :phone_like)
-              AND (:conversation_id_like IS NULL OR c.conversation_id LIKE :conversation_id_like)
-              AND (:bot_name_like IS NULL OR b.name LIKE :bot_name_like)
-            ORDER BY c.created_at DESC
-            LIMIT :limit
-            OFFSET :offset
-            """
+"""
+
+_PHONE_FALLBACK_CLAUSE = """(
+                   REPLACE(REPLACE(REPLACE(REPLACE(TRIM(c.customer_phone), '+84', ''), ' ', ''), '-', '') LIKE :phone_like OR
+                   REPLACE(REPLACE(REPLACE(REPLACE(TRIM(c.customer_phone), '+84', '0'), ' ', ''), '-', '') LIKE :phone_like)"""
+
+
+def _build_conversation_list_sql(
+    join_bot: bool,
+    phone_fallback: bool,
+    seek: bool,
+    phone_indexed: bool = False,
+    phone_floor: bool = False,
+):
+    """Build the conversation listing query.
+
+    - join_bot: join legacy `bot` table to filter by bot name
+    - phone_fallback: normalize phone in SQL (used when the bot join failed)
+    - seek: page with a (created_at, id) keyset predicate instead of OFFSET
+    - phone_indexed: match phones via `:phone_ids` resolved from the phone index;
+      only rows at or past the sync watermark `:phone_watermark` (possibly not
+      indexed yet) fall back to LIKE
+    - phone_floor: stop at (`:phone_floor_ts`, `:phone_floor_id`), the oldest of a
+      truncated `:phone_ids` window, so no matching row beyond it is skipped
+    """
+    if phone_indexed:
+        phone_clause = (
+            "(c.id IN :phone_ids OR (COALESCE(c.updated_at, c.created_at) >= :phone_watermark"
+            " AND TRIM(c.customer_phone) LIKE :phone_like))"
         )
+    elif phone_fallback:
+        phone_clause = _PHONE_FALLBACK_CLAUSE
     else:
-        # If no bot name filtering, use the original query without JOIN
-        sql = text(
-            """
+        phone_clause = "TRIM(c.customer_phone) LIKE :phone_like"
+    sql = text(
+        f"""
             SELECT
-              c.id,
-              c.conversation_id,
-              c.customer_phone,
-              c.bot_id,
-              c.created_at,
-              c.updated_at
+{_CONVERSATION_COLUMNS}
             FROM conversation c
+            {"LEFT JOIN bot b ON c.bot_id = b.bot_index" if join_bot else ""}
             WHERE (c.customer_phone IS NOT NULL AND TRIM(c.customer_phone) <> '')
               AND (:bot_id IS NULL OR c.bot_id = :bot_id)
               AND (:start_ts IS NULL OR c.created_at >= :start_ts)
               AND (:end_ts IS NULL OR c.created_at < :end_ts)
-              AND (:phone_like IS NULL OR TRIM(c.customer_phone) LIKE :phone_like)
+              AND (:phone_like IS NULL OR {phone_clause})
               AND (:conversation_id_like IS NULL OR c.conversation_id LIKE :conversation_id_like)
-            ORDER BY c.created_at DESC
+              {"AND (:bot_name_like IS NULL OR b.name LIKE :bot_name_like)" if join_bot else ""}
+              {"AND (c.created_at < :cursor_ts OR (c.created_at = :cursor_ts AND c.id < :cursor_id))" if seek else ""}
+              {"AND (c.created_at > :phone_floor_ts OR (c.created_at = :phone_floor_ts AND c.id >= :phone_floor_id))" if phone_floor else ""}
+            ORDER BY c.created_at DESC, c.id DESC
             LIMIT :limit
-            OFFSET :offset
+            {"" if seek else "OFFSET :offset"}
             """
-        )
-    # Normalize phone number for search (MariaDB compatible)
-    normalized_phone = phone_like  # Keep original for now since we simplified the SQL
+    )
+    if phone_indexed:
+        sql = sql.bindparams(bindparam("phone_ids", expanding=True))
+    return sql
+
+
+def _parse_ts_or_none(value: Optional[str]) -> Optional[datetime]:
+    """`parse_ts`, or None for strings only the legacy DB understands (the SQL filter still applies)."""
+    try:
+        return parse_ts(value)
+    except ValueError:
+        return None
+
+
+async def _fetch_calls_from_read_db(
+    db: AsyncSession,
+    write_db: AsyncSession,
+    bot_id: Optional[int],
+    start_ts: Optional[str],
+    end_ts: Optional[str],
+    phone_like: Optional[str],
+    conversation_id_like: Optional[str],
+    bot_name_like: Optional[str],
+    qa_status: Optional[str],
+    limit: int,
+    offset: int,
+    cursor_ts: Optional[datetime],
+    cursor_id: Optional[int],
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+    """Listing query against the legacy read DB (used until the mirror is backfilled).
+
+    Returns (rows, resume_at); `resume_at` is set when the page may be short
+    while older matches remain (phone index window or QA scan limit reached),
+    and is where the next page resumes.
+    """
+    seek = cursor_ts is not None
+
+    # Resolve phone search through the normalized phone index when it has been built
+    phone_ids: Optional[List[int]] = None
+    phone_watermark: Optional[datetime] = None
+    phone_floor: Optional[Tuple[datetime, int]] = None
+    if phone_like:
+        try:
+            phone_watermark = await get_conversation_sync_watermark(write_db)
+            if phone_watermark is not None:
+                # Offset pages need every match up to offset + limit inside the window
+                window = PHONE_SEARCH_MAX_IDS if seek else max(PHONE_SEARCH_MAX_IDS, offset + limit)
+                phone_ids, phone_floor = await search_phone_index(
+                    write_db, phone_like, limit=window, bot_id=bot_id, cursor_ts=cursor_ts, cursor_id=cursor_id,
+                    start_ts=_parse_ts_or_none(start_ts), end_ts=_parse_ts_or_none(end_ts),
+                )
+        except Exception as e:
+            logger.warning(f"Phone index unavailable, using LIKE search: {e}")
+            await write_db.rollback()
+            phone_ids = phone_floor = None
+    phone_indexed = phone_ids is not None
+
+    # Raw pattern still used for rows the phone index has not caught up with
+    normalized_phone = phone_like
 
     params = {
         "bot_id": bot_id,
@@ -149,57 +219,133 @@ async def list_conversations(
         "end_ts": end_ts,
         "phone_like": (f"%{normalized_phone}%" if normalized_phone else None),
         "conversation_id_like": (f"%{conversation_id_like}%" if conversation_id_like else None),
-        "bot_name_like": (f"%{bot_name_like}%" if bot_name_like else None),
-        "qa_status": qa_status,
-        "limit": limit,
-        "offset": offset,
     }
-    # Execute query with error handling for missing bot table
-    try:
-        result = await db.execute(sql, params)
-        calls = result.mappings().all()
-    except Exception as e:
-        logger.warning(f"Error executing conversations query: {e}")
-        # If bot name filtering is requested but fails, fall back to query without bot filtering
-        if bot_name_like:
-            logger.info("Falling back to query without bot name filtering")
-            fallback_sql = text(
-                """
-                SELECT
-                  c.id,
-                  c.conversation_id,
-                  c.customer_phone,
-                  c.bot_id,
-                  c.created_at,
-                  c.updated_at
-                FROM conversation c
-                WHERE (c.customer_phone IS NOT NULL AND TRIM(c.customer_phone) <> '')
-                  AND (:bot_id IS NULL OR c.bot_id = :bot_id)
-                  AND (:start_ts IS NULL OR c.created_at >= :start_ts)
-                  AND (:end_ts IS NULL OR c.created_at < :end_ts)
-                  AND (:phone_like IS NULL OR
-                       REPLACE(REPLACE(REPLACE(REPLACE(TRIM(c.customer_phone), '+84', ''), ' ', ''), '-', '') LIKE :phone_like OR
-                       REPLACE(REPLACE(REPLACE(REPLACE(TRIM(c.customer_phone), '+84', '0'), ' ', ''), '-', '') LIKE :phone_like)
-                  AND (:conversation_id_like IS NULL OR c.conversation_id LIKE :conversation_id_like)
-                ORDER BY c.created_at DESC
-                LIMIT :limit
-                OFFSET :offset
-                """
+    if phone_indexed:
+        params.update({"phone_ids": phone_ids, "phone_watermark": phone_watermark})
+    if phone_floor:
+        params.update({"phone_floor_ts": phone_floor[0], "phone_floor_id": phone_floor[1]})
+
+    async def fetch(batch_limit: int, batch_offset: int, after: Optional[Tuple[datetime, int]]) -> List[Dict[str, Any]]:
+        batch_params = {**params, "limit": batch_limit}
+        if after is not None:
+            batch_params.update({"cursor_ts": after[0], "cursor_id": after[1]})
+        else:
+            batch_params["offset"] = batch_offset
+        # Execute query with error handling for missing bot table
+        try:
+            sql = _build_conversation_list_sql(
+                join_bot=bool(bot_name_like), phone_fallback=False, seek=after is not None,
+                phone_indexed=phone_indexed, phone_floor=phone_floor is not None,
             )
-            fallback_params = {
-                "bot_id": bot_id,
-                "start_ts": start_ts,
-                "end_ts": end_ts,
-                "phone_like": (f"%{normalized_phone}%" if normalized_phone else None),
-                "conversation_id_like": (f"%{conversation_id_like}%" if conversation_id_like else None),
-                "limit": limit,
-                "offset": offset,
-            }
-            result = await db.execute(fallback_sql, fallback_params)
+            bot_params = {**batch_params, "bot_name_like": (f"%{bot_name_like}%" if bot_name_like else None)}
+            result = await db.execute(sql, bot_params if bot_name_like else batch_params)
             calls = result.mappings().all()
-        else:
-            # Re-raise if it's not a bot name filtering issue
-            raise
+        except Exception as e:
+            logger.warning(f"Error executing conversations query: {e}")
+            # If bot name filtering is requested but fails, fall back to query without bot filtering
+            if bot_name_like:
+                logger.info("Falling back to query without bot name filtering")
+                fallback_sql = _build_conversation_list_sql(
+                    join_bot=False, phone_fallback=True, seek=after is not None,
+                    phone_indexed=phone_indexed, phone_floor=phone_floor is not None,
+                )
+                result = await db.execute(fallback_sql, batch_params)
+                calls = result.mappings().all()
+            else:
+                # Re-raise if it's not a bot name filtering issue
+                raise
+        return [dict(c) for c in calls]
+
+    cursor = (cursor_ts, cursor_id) if seek else None
+    if qa_status not in ("qa", "notqa"):
+        return await fetch(limit, offset, cursor), phone_floor
+
+    # QA status lives in the write DB: scan candidates in listing order and keep the
+    # matching ones, checking only the candidates against the evaluated id set.
+    # Offset pages have no way to hand back a continuation, so they scan until full.
+    calls, resume_at = await scan_by_qa_status(
+        write_db,
+        lambda batch_limit, after: fetch(batch_limit, 0, after),
+        qa_status,
+        limit,
+        offset=0 if seek else offset,
+        after=cursor,
+        max_rows=QA_SCAN_MAX_ROWS if seek else None,
+    )
+    return calls, resume_at or phone_floor
+
+
+async def _get_mirror_status_safe(write_db: AsyncSession) -> Dict[str, Any]:
+    try:
+        return await get_mirror_status(write_db)
+    except Exception as e:
+        logger.warning(f"Conversation mirror status unavailable: {e}")
+        await write_db.rollback()
+        return {"ready": False, "lag_seconds": None}
+
+
+async def _load_conversations(
+    db: AsyncSession,
+    write_db: AsyncSession,
+    bot_id: Optional[int],
+    start_ts: Optional[str],
+    end_ts: Optional[str],
+    phone_like: Optional[str],
+    conversation_id_like: Optional[str],
+    bot_name_like: Optional[str],
+    qa_status: Optional[str],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+) -> Tuple[List[ConversationResponse], Optional[str], Optional[float]]:
+    """Fetch one page of call conversations.
+
+    Returns (items, next_cursor, mirror_lag_seconds); the lag is None when the
+    page was read from the legacy DB directly.
+    """
+    cursor_ts = cursor_id = None
+    if cursor is not None:
+        try:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    mirror = await _get_mirror_status_safe(write_db)
+    mirror_lag = None
+    resume_at = None
+    if mirror["ready"]:
+        try:
+            parsed_start, parsed_end = parse_ts(start_ts), parse_ts(end_ts)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid timestamp: {e}")
+        calls = await query_mirror_conversations(
+            write_db,
+            bot_id=bot_id,
+            start_ts=parsed_start,
+            end_ts=parsed_end,
+            phone_like=phone_like,
+            conversation_id_like=conversation_id_like,
+            bot_name_like=bot_name_like,
+            qa_status=qa_status,
+            limit=limit,
+            offset=offset,
+            cursor_ts=cursor_ts,
+            cursor_id=cursor_id,
+        )
+        mirror_lag = mirror["lag_seconds"]
+    else:
+        calls, resume_at = await _fetch_calls_from_read_db(
+            db, write_db, bot_id, start_ts, end_ts, phone_like, conversation_id_like,
+            bot_name_like, qa_status, limit, offset, cursor_ts, cursor_id,
+        )
+
+    # The cursor is taken from the last raw row so QA filtering below never skips rows
+    next_cursor = None
+    if len(calls) == limit and calls[-1]["created_at"] is not None:
+        next_cursor = encode_cursor(calls[-1]["created_at"], calls[-1]["id"])
+    elif resume_at is not None:
+        # Short page because the phone match window or QA scan ended; older matches follow
+        next_cursor = encode_cursor(*resume_at)
 
     # Get conversation IDs to query evaluations from write DB
     conversation_ids = [call["conversation_id"] for call in calls if call["conversation_id"]]
@@ -226,7 +372,7 @@ async def list_conversations(
         conv_id = r["conversation_id"]
         evaluation = evaluations_map.get(conv_id)
 
-        # Apply QA status filtering
+        # Guard against a lagging evaluated id set; normally a no-op since the scan already filtered
         if qa_status:
             has_evaluation = evaluation is not None
             if qa_status == "qa" and not has_evaluation:
@@ -246,12 +392,296 @@ async def list_conversations(
                 # For now, just include basic data
             )
         )
+    return payload, next_cursor, mirror_lag
+
+
+@router.get("/", response_model=List[ConversationResponse])
+async def list_conversations(
+    request: Request,
+    bot_id: Optional[int] = None,
+    start_ts: Optional[str] = None,
+    end_ts: Optional[str] = None,
+    phone_like: Optional[str] = None,
+    conversation_id_like: Optional[str] = None,
+    bot_name_like: Optional[str] = None,
+    qa_status: Optional[str] = None,  # "qa", "notqa", or None
+    limit: int = 50,
+    offset: int = 0,
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db)
+):
+    """List conversations with filters. Only returns CALLs (exclude chats).
+
+    Served from the local conversation mirror once it is backfilled (lag in the
+    `X-Mirror-Lag-Seconds` header), otherwise from the legacy read DB.
+
+    - bot_id: legacy bot id (int)
+    - start_ts, end_ts: ISO timestamps or DB-compatible datetime strings
+    - phone_like: phone number search pattern
+    - conversation_id_like: conversation ID search pattern (partial match)
+    - bot_name_like: bot name search pattern (partial match)
+    - qa_status: "qa" (has evaluation), "notqa" (no evaluation), or None (all)
+    - limit: max rows
+    - offset: kept for backward compatibility; prefer `/conversations/page` with a cursor
+    """
+    # Try cache first; hits are served as stored bytes (or 304 on a matching ETag)
+    cache_key = f"conv:list:{bot_id}:{start_ts}:{end_ts}:{phone_like}:{conversation_id_like}:{bot_name_like}:{qa_status}:{limit}:{offset}"
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("conv:list")
+        return cached
+    await record_cache_miss("conv:list")
+
+    payload, _, mirror_lag = await _load_conversations(
+        db, write_db, bot_id, start_ts, end_ts, phone_like, conversation_id_like,
+        bot_name_like, qa_status, limit, offset, cursor=None,
+    )
+    headers = {"X-Mirror-Lag-Seconds": f"{mirror_lag:.1f}"} if mirror_lag is not None else None
+    # Conversations TTL: 5 hours; tagged so evaluation writes invalidate only affected pages
+    tags = conversation_page_tags(((p.conversation_id, p.bot_id) for p in payload), bot_id, qa_status)
+    return await cache_response(cache_key, [p.dict() for p in payload], 5 * 60 * 60, request, headers, tags)
+
+
+@router.get("/page", response_model=ConversationPage)
+async def list_conversations_page(
+    request: Request,
+    bot_id: Optional[int] = None,
+    start_ts: Optional[str] = None,
+    end_ts: Optional[str] = None,
+    phone_like: Optional[str] = None,
+    conversation_id_like: Optional[str] = None,
+    bot_name_like: Optional[str] = None,
+    qa_status: Optional[str] = None,  # "qa", "notqa", or None
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db)
+):
+    """Keyset-paginated variant of `list_conversations`.
+
+    Pass the returned `next_cursor` back as `cursor` to get the following page.
+    Each page costs the same regardless of depth because the query seeks on
+    (created_at, id) instead of skipping rows with OFFSET.
+    """
+    cache_key = f"conv:page:{bot_id}:{start_ts}:{end_ts}:{phone_like}:{conversation_id_like}:{bot_name_like}:{qa_status}:{limit}:{cursor}"
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("conv:page")
+        return cached
+    await record_cache_miss("conv:page")
+
+    items, next_cursor, mirror_lag = await _load_conversations(
+        db, write_db, bot_id, start_ts, end_ts, phone_like, conversation_id_like,
+        bot_name_like, qa_status, limit, 0, cursor=cursor,
+    )
+    page = ConversationPage(items=items, next_cursor=next_cursor, mirror_lag_seconds=mirror_lag)
+    # Conversations TTL: 5 hours; tagged so evaluation writes invalidate only affected pages
+    tags = conversation_page_tags(((p.conversation_id, p.bot_id) for p in items), bot_id, qa_status)
+    return await cache_response(cache_key, page.dict(), 5 * 60 * 60, request, tags=tags)
+
+# Short TTL: stats are also dropped when the mirror sync brings in new conversations
+STATS_CACHE_TTL_SEC = 60
+
+
+@router.get("/stats", response_model=ConversationStatsResponse)
+async def get_conversation_stats(
+    request: Request,
+    bot_id: Optional[int] = None,
+    start_ts: Optional[str] = None,
+    end_ts: Optional[str] = None,
+    phone_like: Optional[str] = None,
+    qa_status: Optional[str] = None,  # "qa", "notqa", or None
+    write_db: AsyncSession = Depends(get_db),
+):
+    """Total and per-day call counts for the `list_conversations` filters.
+
+    Counts come from the conversation mirror: exact for selective filters,
+    per-day counters for broad ones, and a planner estimate (`estimated=true`,
+    empty histogram) for phone searches matching too many rows to count.
+    """
+    cache_key = f"conv:stats:{bot_id}:{start_ts}:{end_ts}:{phone_like}:{qa_status}"
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("conv:stats")
+        return cached
+    await record_cache_miss("conv:stats")
+
+    mirror = await _get_mirror_status_safe(write_db)
+    if not mirror["ready"]:
+        raise HTTPException(status_code=503, detail="Conversation mirror is not ready yet")
     try:
-        # Conversations TTL: 5 hours
-        await redis.setex(cache_key, 5 * 60 * 60, json.dumps([p.dict() for p in payload]))
-    except Exception:
-        pass
-    return payload
+        parsed_start, parsed_end = parse_ts(start_ts), parse_ts(end_ts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp: {e}")
+    result = await conversation_stats(
+        write_db,
+        bot_id=bot_id,
+        start_ts=parsed_start,
+        end_ts=parsed_end,
+        phone_like=phone_like,
+        qa_status=qa_status,
+    )
+    stats = ConversationStatsResponse(**result, mirror_lag_seconds=mirror["lag_seconds"])
+    return await cache_response(
+        cache_key, stats.dict(), STATS_CACHE_TTL_SEC, request, tags=conversation_stats_tags(bot_id, qa_status)
+    )
+
+
+@router.get("/search", response_model=List[TranscriptHit])
+async def search_conversation_transcripts(
+    q: str = Query(..., min_length=2, description="Words or a quoted phrase; accents optional"),
+    bot_id: Optional[int] = None,
+    role: Optional[str] = Query(None, description="Only turns of this role, e.g. assistant"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    write_db: AsyncSession = Depends(get_db),
+):
+    """Ranked transcript turns matching `q`, with `<mark>`-highlighted fragments.
+
+    Searches the transcript index built by the legacy sync and by QA runs, so
+    very recent calls may be missing until the next sync pass.
+    """
+    hits = await search_transcripts(write_db, q, bot_id=bot_id, role=role, limit=limit, offset=offset)
+    return [TranscriptHit(**h) for h in hits]
+
+
+BULK_MAX_IDS = 100
+
+
+class BulkConversationRequest(BaseModel):
+    conversation_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_IDS)
+
+
+class BulkConversationItem(BaseModel):
+    conversation_id: str
+    conversation: Optional[ConversationResponse] = None
+    spans: List[SpanResponse] = []
+    evaluation: Optional[EvaluationResponse] = None
+
+
+async def _bulk_read_side(db: AsyncSession, conversation_ids: List[str]) -> Dict[str, Tuple[Dict[str, Any], List[SpanTuple]]]:
+    """Metadata + spans for many conversations: one IN query, blobs fetched only for cold span caches."""
+    head_sql = text(
+        """
+        SELECT id, conversation_id, customer_phone, bot_id, created_at, updated_at,
+               MD5(bot_memory) AS memory_hash
+        FROM conversation
+        WHERE conversation_id IN :cids
+        """
+    ).bindparams(bindparam("cids", expanding=True))
+    result = await db.execute(head_sql, {"cids": conversation_ids})
+    heads = {row["conversation_id"]: dict(row) for row in result.mappings().all()}
+
+    spans_map = await get_cached_spans_many([(cid, h["memory_hash"]) for cid, h in heads.items()])
+    cold = [h["id"] for cid, h in heads.items() if cid not in spans_map and h["memory_hash"]]
+    if cold:
+        memory_sql = text(
+            "SELECT conversation_id, bot_memory FROM conversation WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        result = await db.execute(memory_sql, {"ids": cold})
+        for row in result.mappings().all():
+            cid = row["conversation_id"]
+            spans_map[cid] = await extract_spans(cid, row["bot_memory"], heads[cid]["memory_hash"])
+    return {cid: (head, spans_map.get(cid, [])) for cid, head in heads.items()}
+
+
+async def _bulk_write_side(write_db: AsyncSession, conversation_ids: List[str]) -> Dict[str, EvaluationResponse]:
+    """Evaluations for many conversations: cached `eval:by_id:*` entries first, one IN query for the rest."""
+    evaluations: Dict[str, EvaluationResponse] = {}
+    try:
+        redis = await get_binary_redis()
+        cached = await redis.mget([f"eval:by_id:{cid}" for cid in conversation_ids])
+        for cid, value in zip(conversation_ids, cached):
+            body = cached_response_body(value)
+            if body:
+                try:
+                    evaluations[cid] = EvaluationResponse(**json.loads(body))
+                except Exception:
+                    pass
+    except Exception as e:
+        logger.warning(f"Evaluation cache bulk read failed: {e}")
+
+    missing = [cid for cid in conversation_ids if cid not in evaluations]
+    if missing:
+        result = await write_db.execute(select(Evaluation).where(Evaluation.conversation_id.in_(missing)))
+        rows = result.scalars().all()
+        memories = await load_evaluation_memories(write_db, rows)
+        for row in rows:
+            evaluations[row.conversation_id] = EvaluationResponse(
+                id=str(row.id),
+                conversation_id=row.conversation_id,
+                memory=memories[row.id] or {},
+                evaluation_result=row.evaluation_result or {},
+                reviewed=bool(getattr(row, "reviewed", False)),
+                review_note=getattr(row, "review_note", None),
+            )
+        fetched = [cid for cid in missing if cid in evaluations]
+        if fetched:
+            try:
+                redis = await get_binary_redis()
+                pipe = redis.pipeline(transaction=False)
+                for cid in fetched:
+                    # Same entry and TTL as GET /evaluations/{conversation_id}
+                    pipe.setex(f"eval:by_id:{cid}", 60 * 60, response_cache_entry(evaluations[cid].dict()))
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Evaluation cache bulk write failed: {e}")
+    return evaluations
+
+
+@router.post("/bulk", response_model=List[BulkConversationItem])
+async def get_conversations_bulk(
+    body: BulkConversationRequest,
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db),
+):
+    """Metadata, spans and evaluation for up to BULK_MAX_IDS conversations in one call.
+
+    Replaces per-row calls to `/conversations/{id}`, `/conversations/{id}/spans`
+    and `/evaluations/{id}`. Read DB and write DB are queried concurrently, and
+    warm span/evaluation caches are used when available. Items keep request order;
+    unknown ids come back with empty fields.
+    """
+    conversation_ids = list(dict.fromkeys(body.conversation_ids))
+    read_side, evaluations = await asyncio.gather(
+        _bulk_read_side(db, conversation_ids),
+        _bulk_write_side(write_db, conversation_ids),
+    )
+
+    items: List[BulkConversationItem] = []
+    for cid in conversation_ids:
+        head, spans = read_side.get(cid, (None, []))
+        item = BulkConversationItem(conversation_id=cid, evaluation=evaluations.get(cid))
+        if head:
+            item.conversation = ConversationResponse(
+                id=head["id"],
+                conversation_id=head["conversation_id"],
+                customer_phone=head["customer_phone"],
+                bot_id=head["bot_id"],
+                created_at=head["created_at"],
+                updated_at=head["updated_at"],
+            )
+            item.spans = [
+                SpanResponse(
+                    id=f"{cid}:{idx}",
+                    conversation_id=cid,
+                    turn_idx=idx,
+                    role=role,
+                    text=content,
+                    embedding=None,
+                    created_at=head["created_at"],
+                )
+                for idx, role, content in spans
+            ]
+        items.append(item)
+    return items
+
+
+@router.get("/mirror/status", response_model=MirrorStatusResponse)
+async def get_conversation_mirror_status(write_db: AsyncSession = Depends(get_db)):
+    """Report whether listings are served from the local mirror and how far it lags."""
+    return MirrorStatusResponse(**(await _get_mirror_status_safe(write_db)))
+
 
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(conversation_id: str, db: AsyncSession = Depends(get_read_db)):
@@ -283,51 +713,28 @@ async def get_conversation(conversation_id: str, db: AsyncSession = Depends(get_
 
 @router.get("/{conversation_id}/spans", response_model=List[SpanResponse])
 async def get_conversation_spans(conversation_id: str, db: AsyncSession = Depends(get_read_db)):
-    """Parse spans from legacy conversation.bot_memory (no DB writes)."""
-    sql = text(
-        """
-        SELECT id, conversation_id, bot_memory, created_at
-        FROM conversation
-        WHERE conversation_id = :cid
-        LIMIT 1
-        """
-    )
-    try:
-        result = await db.execute(sql, {"cid": conversation_id})
-        row = result.mappings().first()
-    except Exception:
-        row = None
-    if not row:
-        return []
-
-    spans: List[SpanResponse] = []
-    created_at = row.get("created_at")
-    raw_memory = row.get("bot_memory")
-
-    if not raw_memory:
-        return []
+    """Parse spans from legacy conversation.bot_memory (no DB writes).
 
+    Parsed spans are cached by (conversation_id, memory hash), so repeated calls
+    skip both the blob transfer and the JSON parse.
+    """
     try:
-        memory_obj = json.loads(raw_memory) if isinstance(raw_memory, str) else raw_memory
-        messages = memory_obj.get("messages", []) if isinstance(memory_obj, dict) else []
-        for idx, msg in enumerate(messages):
-            role = msg.get("role") if isinstance(msg, dict) else None
-            content = msg.get("content") if isinstance(msg, dict) else None
-            if not role or content is None:
-                continue
-            spans.append(
-                SpanResponse(
-                    id=f"{conversation_id}:{idx}",
-                    conversation_id=conversation_id,
-                    turn_idx=idx,
-                    role=str(role),
-                    text=str(content),
-                    embedding=None,
-                    created_at=created_at,
-                )
-            )
+        loaded = await load_conversation_spans(db, conversation_id)
     except Exception:
-        # On malformed JSON, fall back to empty spans
+        loaded = None
+    if not loaded:
         return []
 
-    return spans
+    created_at, spans = loaded
+    return [
+        SpanResponse(
+            id=f"{conversation_id}:{idx}",
+            conversation_id=conversation_id,
+            turn_idx=idx,
+            role=role,
+            text=content,
+            embedding=None,
+            created_at=created_at,
+        )
+        for idx, role, content in spans
+    ]
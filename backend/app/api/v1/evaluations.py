@@ -1,12 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Any, Dict, Optional
+from datetime import datetime
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.core.db import get_db
-from app.models.base import Evaluation
-from app.core.redis import get_redis
-import json
+from sqlalchemy import Boolean, Text, cast, column, func, select, or_, and_, update, values
+from sqlalchemy.orm import aliased
+from app.core.db import async_session, get_db
+from app.models.base import EVALUATION_ERROR_TYPES, Evaluation
+from app.core.cache import (
+    bump_generation,
+    cache_response,
+    get_cached_response,
+    invalidate_keys,
+    namespaced_key,
+    record_cache_hit,
+    record_cache_miss,
+)
+from app.services.evaluation_export import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    EXPORT_MEDIA_TYPES,
+    ExportUnavailableError,
+    apply_evaluation_filters,
+    export_evaluations,
+    parse_export_columns,
+)
+from app.services.evaluation_memory import load_evaluation_memories
+from app.services.evaluation_rollup import apply_rollup_changes, evaluation_contribution, review_change
+from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
 
 
 router = APIRouter()
@@ -28,17 +51,16 @@ class EvaluationResponse(BaseModel):
     description="List evaluations with pagination (ordered by created_at desc).",
 )
 async def list_evaluations(
+    request: Request,
     limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
 ):
-    cache_key = f"eval:list:{limit}"
-    redis = await get_redis()
-    cached = await redis.get(cache_key)
-    if cached:
-        try:
-            return [EvaluationResponse(**x) for x in json.loads(cached)]
-        except Exception:
-            pass
+    cache_key = await namespaced_key("eval:list", limit)
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("eval:list")
+        return cached
+    await record_cache_miss("eval:list")
 
     query = (
         select(Evaluation)
@@ -47,23 +69,204 @@ async def list_evaluations(
     )
     result = await db.execute(query)
     rows = result.scalars().all()
+    memories = await load_evaluation_memories(db, rows)
     payload = [
         EvaluationResponse(
             id=str(row.id),
             conversation_id=row.conversation_id,
-            memory=row.memory or {},
+            memory=memories[row.id] or {},
             evaluation_result=row.evaluation_result or {},
             reviewed=bool(getattr(row, "reviewed", False)),
             review_note=getattr(row, "review_note", None),
         )
         for row in rows
     ]
+    # Evaluations list TTL: 1 hour
+    return await cache_response(cache_key, [p.dict() for p in payload], 60 * 60, request)
+
+
+class EvaluationSummaryResponse(BaseModel):
+    id: str
+    conversation_id: str
+    summary: Dict[str, Any]
+    reviewed: bool
+    bot_index: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class EvaluationSummaryPage(BaseModel):
+    items: List[EvaluationSummaryResponse]
+    next_cursor: Optional[str] = None
+
+
+def evaluation_summary_query(
+    limit: int,
+    overall: Optional[str] = None,
+    error_type: Optional[str] = None,
+    bot_index: Optional[int] = None,
+    reviewed: Optional[bool] = None,
+    cursor_ts: Optional[datetime] = None,
+    cursor_id: Optional[UUID] = None,
+):
+    """Newest evaluations without `memory` or the error list: only `evaluation_result->'summary'`.
+
+    Filters use the generated/denormalized columns so each combination is
+    served by an index on (..., created_at, id); `cursor_ts`/`cursor_id` seek
+    past that position.
+    """
+    e = Evaluation
+    query = select(
+        e.id,
+        e.conversation_id,
+        e.evaluation_result["summary"].label("summary"),
+        e.reviewed,
+        e.bot_index,
+        e.created_at,
+        e.updated_at,
+    )
+    query = apply_evaluation_filters(query, overall, error_type, bot_index, reviewed)
+    if cursor_ts is not None and cursor_id is not None:
+        query = query.where(or_(e.created_at < cursor_ts, and_(e.created_at == cursor_ts, e.id < cursor_id)))
+    return query.order_by(e.created_at.desc(), e.id.desc()).limit(limit)
+
+
+def _summary_item(row) -> EvaluationSummaryResponse:
+    return EvaluationSummaryResponse(
+        id=str(row.id),
+        conversation_id=row.conversation_id,
+        summary=row.summary or {},
+        reviewed=bool(row.reviewed),
+        bot_index=row.bot_index,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+@router.get(
+    "/summary",
+    response_model=List[EvaluationSummaryResponse],
+    summary="List evaluation summaries",
+    description="Table view of evaluations: verdict summary only, no transcript. Fetch full bodies via /evaluations/{conversation_id}.",
+)
+async def list_evaluation_summaries(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    cache_key = await namespaced_key("eval:summary", limit)
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("eval:summary")
+        return cached
+    await record_cache_miss("eval:summary")
+
+    result = await db.execute(evaluation_summary_query(limit))
+    payload = [_summary_item(row) for row in result.all()]
+    # Same TTL and invalidation as the full list
+    return await cache_response(cache_key, [p.dict() for p in payload], 60 * 60, request)
+
+
+@router.get(
+    "/page",
+    response_model=EvaluationSummaryPage,
+    summary="Filter evaluation summaries",
+    description="Evaluation summaries filtered by verdict, error type, bot and review state, newest first. "
+    "Pass `next_cursor` back as `cursor` for the following page.",
+)
+async def list_evaluation_summaries_page(
+    request: Request,
+    overall: Optional[str] = Query(None, description="summary.overall: good, average or poor"),
+    error_type: Optional[str] = Query(None, description=f"Only evaluations with errors of this type: {', '.join(EVALUATION_ERROR_TYPES)}"),
+    bot_index: Optional[int] = None,
+    reviewed: Optional[bool] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    if error_type is not None and error_type not in EVALUATION_ERROR_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown error_type: {error_type}")
+    cursor_ts = cursor_id = None
+    if cursor is not None:
+        try:
+            cursor_ts, raw_id = decode_cursor(cursor)
+            cursor_id = UUID(str(raw_id))
+        except (InvalidCursorError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    cache_key = await namespaced_key("eval:summary", "page", overall, error_type, bot_index, reviewed, limit, cursor)
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("eval:summary")
+        return cached
+    await record_cache_miss("eval:summary")
+
+    result = await db.execute(
+        evaluation_summary_query(limit, overall, error_type, bot_index, reviewed, cursor_ts, cursor_id)
+    )
+    items = [_summary_item(row) for row in result.all()]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(items) == limit else None
+    page = EvaluationSummaryPage(items=items, next_cursor=next_cursor)
+    return await cache_response(cache_key, page.dict(), 60 * 60, request)
+
+
+@router.get(
+    "/export",
+    summary="Export evaluations",
+    description="Stream every matching evaluation, oldest first, as NDJSON, CSV or Parquet. "
+    f"`columns` is a comma-separated projection of: {', '.join(EXPORT_COLUMNS)}.",
+    response_class=StreamingResponse,
+)
+async def export_evaluations_endpoint(
+    fmt: str = Query("ndjson", alias="format", description=f"One of: {', '.join(EXPORT_FORMATS)}"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: id, conversation_id, bot_index, created_at, reviewed, review_note, summary)"),
+    overall: Optional[str] = Query(None, description="summary.overall: good, average or poor"),
+    error_type: Optional[str] = Query(None, description=f"Only evaluations with errors of this type: {', '.join(EVALUATION_ERROR_TYPES)}"),
+    bot_index: Optional[int] = None,
+    reviewed: Optional[bool] = None,
+    created_from: Optional[datetime] = Query(None, description="created_at >= (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="created_at < (ISO 8601)"),
+):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {fmt}")
+    if error_type is not None and error_type not in EVALUATION_ERROR_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown error_type: {error_type}")
+    try:
+        selected = parse_export_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filters = dict(
+        overall=overall,
+        error_type=error_type,
+        bot_index=bot_index,
+        reviewed=reviewed,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+    # The stream outlives the request dependencies, so it owns its session
+    db = async_session()
     try:
-        # Evaluations list TTL: 1 hour
-        await redis.setex(cache_key, 60 * 60, json.dumps([p.dict() for p in payload]))
-    except Exception:
-        pass
-    return payload
+        chunks = export_evaluations(db, fmt, selected, **filters)
+    except ExportUnavailableError as e:
+        await db.close()
+        raise HTTPException(status_code=501, detail=str(e))
+
+    async def body():
+        try:
+            async for chunk in chunks:
+                if chunk:
+                    yield chunk
+        finally:
+            await db.close()
+
+    extension = "jsonl" if fmt == "ndjson" else fmt
+    filename = f"evaluations-{datetime.utcnow():%Y%m%dT%H%M%S}.{extension}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get(
@@ -72,37 +275,33 @@ async def list_evaluations(
     summary="Get evaluation by conversation_id",
 )
 async def get_evaluation(
+    request: Request,
     conversation_id: str = Path(..., description="Legacy conversation id"),
     db: AsyncSession = Depends(get_db),
 ):
     cache_key = f"eval:by_id:{conversation_id}"
-    redis = await get_redis()
-    cached = await redis.get(cache_key)
-    if cached:
-        try:
-            return EvaluationResponse(**json.loads(cached))
-        except Exception:
-            pass
+    cached = await get_cached_response(cache_key, request)
+    if cached is not None:
+        await record_cache_hit("eval:by_id")
+        return cached
+    await record_cache_miss("eval:by_id")
 
     query = select(Evaluation).where(Evaluation.conversation_id == conversation_id)
     result = await db.execute(query)
     row = result.scalar_one_or_none()
     if not row:
         raise HTTPException(status_code=404, detail="Evaluation not found")
+    memories = await load_evaluation_memories(db, [row])
     payload = EvaluationResponse(
         id=str(row.id),
         conversation_id=row.conversation_id,
-        memory=row.memory or {},
+        memory=memories[row.id] or {},
         evaluation_result=row.evaluation_result or {},
         reviewed=bool(getattr(row, "reviewed", False)),
         review_note=getattr(row, "review_note", None),
     )
-    try:
-        # Evaluation by id TTL: 1 hour
-        await redis.setex(cache_key, 60 * 60, json.dumps(payload.dict()))
-    except Exception:
-        pass
-    return payload
+    # Evaluation by id TTL: 1 hour
+    return await cache_response(cache_key, payload.dict(), 60 * 60, request)
 
 
 class EvaluationReviewUpdate(BaseModel):
@@ -121,33 +320,128 @@ async def update_evaluation_review(
     db: AsyncSession = Depends(get_db),
 ):
     query = select(Evaluation).where(Evaluation.conversation_id == conversation_id)
+    if body is not None:
+        # Locked so the rollup "before" cannot be taken from a row another writer is changing
+        query = query.with_for_update()
     result = await db.execute(query)
     row = result.scalar_one_or_none()
     if not row:
         raise HTTPException(status_code=404, detail="Evaluation not found")
     if body is not None:
+        before = evaluation_contribution(row)
         if body.reviewed is not None:
             row.reviewed = bool(body.reviewed)
         if body.review_note is not None:
             row.review_note = body.review_note
+        await apply_rollup_changes(db, [(before, evaluation_contribution(row))])
         await db.commit()
         await db.refresh(row)
         # Invalidate caches
         try:
-            redis = await get_redis()
-            await redis.delete(f"eval:by_id:{conversation_id}")
-            # delete list caches
-            async for key in redis.scan_iter("eval:list:*"):
-                await redis.delete(key)
+            await invalidate_keys(f"eval:by_id:{conversation_id}")
+            await bump_generation("eval:list", "eval:summary")
         except Exception:
             pass
+    memories = await load_evaluation_memories(db, [row])
     return EvaluationResponse(
         id=str(row.id),
         conversation_id=row.conversation_id,
-        memory=row.memory or {},
+        memory=memories[row.id] or {},
         evaluation_result=row.evaluation_result or {},
         reviewed=bool(getattr(row, "reviewed", False)),
         review_note=getattr(row, "review_note", None),
     )
 
 
+BULK_REVIEW_MAX_ITEMS = 500
+
+
+class EvaluationReviewItem(EvaluationReviewUpdate):
+    conversation_id: str
+
+
+class EvaluationReviewBulkRequest(BaseModel):
+    items: List[EvaluationReviewItem] = Field(..., min_length=1, max_length=BULK_REVIEW_MAX_ITEMS)
+
+
+class EvaluationReviewResult(BaseModel):
+    id: str
+    conversation_id: str
+    reviewed: bool
+    review_note: Optional[str] = None
+    updated_at: datetime
+
+
+@router.post(
+    "/reviews",
+    response_model=List[EvaluationReviewResult],
+    summary="Bulk update evaluation review status",
+    description="Apply review changes to many evaluations in one statement. Omitted/null fields are left unchanged; "
+    "unknown conversation ids are skipped. Returns the updated rows.",
+)
+async def update_evaluation_reviews(
+    body: EvaluationReviewBulkRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    # Last entry wins for duplicate ids
+    items = {item.conversation_id: item for item in body.items}
+    changes = values(
+        column("conversation_id", Text),
+        column("reviewed", Boolean),
+        column("review_note", Text),
+        name="changes",
+    ).data([(cid, item.reviewed, item.review_note) for cid, item in items.items()])
+
+    e = Evaluation
+    # Lock the rows first: the UPDATE below then reads their latest committed review flags
+    # (its `old` join would otherwise see a stale flag when racing another writer)
+    await db.execute(
+        select(e.id).where(e.conversation_id.in_(list(items))).order_by(e.id).with_for_update()
+    )
+    # Joining the table again exposes each row's pre-update review flag for the rollups
+    old = aliased(Evaluation, name="old")
+    stmt = (
+        update(e)
+        .where(e.conversation_id == changes.c.conversation_id)
+        .where(old.id == e.id)
+        .values(
+            # A column that is NULL in every VALUES row is untyped (text) in Postgres, so cast explicitly
+            reviewed=func.coalesce(cast(changes.c.reviewed, Boolean), e.reviewed),
+            review_note=func.coalesce(cast(changes.c.review_note, Text), e.review_note),
+            updated_at=func.now(),
+        )
+        .returning(
+            e.id, e.conversation_id, e.reviewed, e.review_note, e.updated_at,
+            e.bot_index, e.created_at, old.reviewed.label("was_reviewed"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
+    await apply_rollup_changes(
+        db,
+        [
+            review_change(row.bot_index, row.created_at, row.was_reviewed, row.reviewed)
+            for row in rows
+            if row.was_reviewed != row.reviewed
+        ],
+    )
+    await db.commit()
+
+    # One invalidation for the whole batch
+    if rows:
+        try:
+            await invalidate_keys(*(f"eval:by_id:{row.conversation_id}" for row in rows))
+            await bump_generation("eval:list", "eval:summary")
+        except Exception:
+            pass
+    return [
+        EvaluationReviewResult(
+            id=str(row.id),
+            conversation_id=row.conversation_id,
+            reviewed=bool(row.reviewed),
+            review_note=row.review_note,
+            updated_at=row.updated_at,
+        )
+        for row in rows
+    ]
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.core.redis import get_redis
+from app.core.cache import get_cache_stats, reset_cache_stats
+from app.core.near_cache import near_cache
 
 router = APIRouter()
 
@@ -26,3 +28,16 @@ async def health_check(db: AsyncSession = Depends(get_db)):
             "status": "unhealthy",
             "error": str(e)
         }
+
+
+@router.get("/cache")
+async def cache_stats():
+    """Cache hit/miss/invalidation counters and per-tier hit ratios per namespace, plus this worker's near-cache"""
+    return {"namespaces": await get_cache_stats(), "near_cache": near_cache.snapshot()}
+
+
+@router.delete("/cache")
+async def clear_cache_stats():
+    """Reset cache counters, e.g. before measuring a change"""
+    await reset_cache_stats()
+    return {"message": "Cache stats reset"}
@@ -4,13 +4,23 @@ from typing import List, Optional, Any, Dict, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select
 from app.core.db import get_read_db, get_db
-from app.models.base import Bot, BotVersion, Evaluation
+from app.models.base import Evaluation
 from app.utils.prompt_loader import load_prompt
 from app.services.openai_client import openai_service
-from app.core.redis import get_redis
+from app.core.cache import bump_generation, invalidate_keys
+from app.services.conversation_cache import invalidate_pages_for_evaluations
+from app.services.bot_versions import latest_knowledge_bases
+from app.services.evaluated_ids import add_evaluated_conversation_ids
+from app.services.evaluation_memory import store_memory
+from app.services.evaluation_rollup import apply_rollup_changes, evaluation_contribution
+from app.services.span_extraction import SpanTuple, extract_spans, memory_hash
+from app.services.transcript_search import index_transcripts
 import json
 import asyncio
+import logging
+from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -61,61 +71,16 @@ async def _fetch_conversation_by_id(db: AsyncSession, conversation_id: str) -> O
 async def _get_latest_bot_kb(write_db: AsyncSession, legacy_bot_id: Optional[int]) -> Dict[str, Any]:
     if legacy_bot_id is None:
         return {}
-    # Map legacy bot id -> write DB Bot.bot_index
-    bot_q = select(Bot).where(Bot.bot_index == legacy_bot_id)
-    bot_res = await write_db.execute(bot_q)
-    bot = bot_res.scalar_one_or_none()
-    if not bot:
-        return {}
-    ver_q = (
-        select(BotVersion)
-        .where(BotVersion.bot_index == bot.bot_index)
-        .order_by(BotVersion.created_at.desc())
-        .limit(1)
-    )
-    ver_res = await write_db.execute(ver_q)
-    version = ver_res.scalar_one_or_none()
-    if not version:
-        return {}
-    return version.knowledge_base or {}
+    kbs = await latest_knowledge_bases(write_db, [legacy_bot_id])
+    return kbs.get(legacy_bot_id, {})
 
 
 async def _prefetch_latest_kb_map(write_db: AsyncSession, legacy_bot_ids: Set[int]) -> Dict[int, Dict[str, Any]]:
-    """Fetch latest knowledge_base for a set of legacy bot ids in one query.
+    """Latest knowledge_base for a set of legacy bot ids (cached per bot, one query for misses).
 
     Returns mapping: legacy_bot_id -> knowledge_base dict
     """
-    if not legacy_bot_ids:
-        return {}
-
-    # Map legacy bot ids to write DB bots
-    bot_q = select(Bot).where(Bot.bot_index.in_(list(legacy_bot_ids)))
-    bot_res = await write_db.execute(bot_q)
-    bots = bot_res.scalars().all()
-    if not bots:
-        return {bid: {} for bid in legacy_bot_ids}
-
-    indices = [b.bot_index for b in bots]
-
-    # Fetch latest versions per bot_index by ordering and picking first per group
-    ver_q = (
-        select(BotVersion)
-        .where(BotVersion.bot_index.in_(indices))
-        .order_by(BotVersion.bot_index.asc(), BotVersion.created_at.desc())
-    )
-    ver_res = await write_db.execute(ver_q)
-    versions = ver_res.scalars().all()
-
-    kb_map: Dict[int, Dict[str, Any]] = {}
-    for v in versions:
-        if v.bot_index not in kb_map:
-            kb_map[v.bot_index] = v.knowledge_base or {}
-
-    # Ensure all requested ids have an entry
-    for bid in legacy_bot_ids:
-        kb_map.setdefault(bid, {})
-
-    return kb_map
+    return await latest_knowledge_bases(write_db, legacy_bot_ids)
 
 
 async def _eval_single(
@@ -200,9 +165,15 @@ async def run_qa(
     legacy_ids: Set[int] = {c.get("bot_id") for c in conversations if c.get("bot_id") is not None}
     kb_map = await _prefetch_latest_kb_map(write_db, legacy_ids)
 
+    spans_by_cid: Dict[str, List[SpanTuple]] = {}
+
     async def evaluate(conv: Dict[str, Any]) -> QARunResult:
         async with semaphore:
             kb = kb_map.get(conv.get("bot_id")) or {}
+            # Spans feed the transcript index and warm the spans endpoint's cache;
+            # the evaluator still gets the full bot_memory
+            spans = await extract_spans(conv.get("conversation_id") or "", conv.get("bot_memory"))
+            spans_by_cid[conv.get("conversation_id") or ""] = spans
             return await _eval_single(qa_system_prompt, conv, kb)
 
     tasks = [evaluate(c) for c in conversations]
@@ -220,6 +191,7 @@ async def run_qa(
         return value
 
     # Persist evaluations to write DB (upsert by conversation_id)
+    rollup_changes = []
     for conv, res in zip(conversations, results):
         if not res.ok:
             continue
@@ -245,43 +217,70 @@ async def run_qa(
         memory_json = _sanitize_for_pg(memory_json)
         result_json = _sanitize_for_pg(res.result or {})
 
-        # Upsert Evaluation by conversation_id
-        existing_q = select(Evaluation).where(Evaluation.conversation_id == conversation_id)
+        # Upsert Evaluation by conversation_id; the row lock keeps the rollup "before" current
+        # against concurrent re-runs and review updates
+        existing_q = select(Evaluation).where(Evaluation.conversation_id == conversation_id).with_for_update()
         existing_res = await write_db.execute(existing_q)
         existing = existing_res.scalar_one_or_none()
 
+        # Memory is stored once per distinct content; evaluations keep the hash
+        mem_hash = await store_memory(write_db, memory_json)
+
         if existing:
-            existing.memory = memory_json
+            before = evaluation_contribution(existing)
+            existing.memory = None
+            existing.memory_hash = mem_hash
             existing.evaluation_result = result_json
+            existing.bot_index = conv.get("bot_id")
+            rollup_changes.append((before, evaluation_contribution(existing)))
         else:
             eval_row = Evaluation(
                 conversation_id=conversation_id,
-                memory=memory_json,
+                memory_hash=mem_hash,
                 evaluation_result=result_json,
+                bot_index=conv.get("bot_id"),
+                reviewed=False,
+                created_at=datetime.now(timezone.utc),
             )
             write_db.add(eval_row)
+            rollup_changes.append((None, evaluation_contribution(eval_row)))
 
+    # QA rollups change in the same transaction as the evaluations
+    await apply_rollup_changes(write_db, rollup_changes)
     await write_db.commit()
 
-    # Invalidate evaluations cache after creating new evaluations
-    try:
-        redis = await get_redis()
-        # Delete specific list cache keys
-        eval_list_keys = []
-        async for key in redis.scan_iter("eval:list:*"):
-            eval_list_keys.append(key)
+    evaluated = [
+        (res.conversation_id or (conv.get("conversation_id") or ""), conv.get("bot_id"))
+        for conv, res in zip(conversations, results)
+        if res.ok
+    ]
+    await add_evaluated_conversation_ids(cid for cid, _ in evaluated)
 
-        if eval_list_keys:
-            await redis.delete(*eval_list_keys)
+    # Evaluated calls become searchable right away, ahead of the legacy sync
+    try:
+        await index_transcripts(
+            write_db,
+            [
+                {**conv, "memory_hash": memory_hash(conv.get("bot_memory")), "spans": spans_by_cid.get(conv.get("conversation_id") or "")}
+                for conv, res in zip(conversations, results)
+                if res.ok
+            ],
+        )
+        await write_db.commit()
+    except Exception as e:
+        await write_db.rollback()
+        logger.warning(f"Failed to index evaluated transcripts: {e}")
+    # Conversation list pages that contain or filter on these conversations are now stale
+    await invalidate_pages_for_evaluations(evaluated)
 
+    # Invalidate evaluations cache after creating new evaluations
+    try:
+        await bump_generation("eval:list", "eval:summary")
         # Also clear any individual evaluation caches for the updated conversations
-        for conv, res in zip(conversations, results):
-            if res.ok:
-                conv_id = res.conversation_id or (conv.get("conversation_id") or "")
-                if conv_id:
-                    await redis.delete(f"eval:by_id:{conv_id}")
+        by_id_keys = [f"eval:by_id:{cid}" for cid, _ in evaluated if cid]
+        await invalidate_keys(*by_id_keys)
     except Exception as e:
-        print(f"Failed to invalidate evaluations cache: {e}")
+        logger.warning(f"Failed to invalidate evaluations cache: {e}")
 
     return results
 
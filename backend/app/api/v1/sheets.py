@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
 from app.core.db import get_db, get_read_db
 from sqlalchemy import select
 from app.services.google_sheets_service import google_sheets_service
 from app.models.base import Evaluation
+from app.services.conversation_mirror import get_mirror_status, query_mirror_conversations
+from app.services.evaluated_ids import scan_by_qa_status
 import logging
 import json
 import gspread
@@ -99,37 +102,53 @@ async def get_sheets_list():
 
 async def _get_conversations_from_read_db(
     db: AsyncSession,
+    write_db: AsyncSession,
     qa_filter: Optional[str] = None,
     overall_filter: Optional[str] = None,
     review_filter: Optional[str] = None,
     limit: int = 200,
-    offset: int = 0
+    offset: int = 0,
 ) -> List[Dict[str, Any]]:
     """Get conversations from read database (legacy data)"""
     try:
-        # Build SQL query for conversations from read DB
-        sql = text("""
-            SELECT
-                c.id,
-                c.conversation_id,
-                c.customer_phone,
-                c.bot_id,
-                c.created_at,
-                c.updated_at
-            FROM conversation c
-            WHERE c.customer_phone IS NOT NULL AND TRIM(c.customer_phone) <> ''
-            ORDER BY c.created_at DESC
-            LIMIT :limit OFFSET :offset
-        """)
-
-        result = await db.execute(sql, {"limit": limit, "offset": offset})
-        rows = result.mappings().all()
+        async def fetch(batch_limit: int, batch_offset: int, after: Optional[Tuple[datetime, int]]):
+            params: Dict[str, Any] = {"limit": batch_limit}
+            if after is not None:
+                params.update({"cursor_ts": after[0], "cursor_id": after[1]})
+            else:
+                params["offset"] = batch_offset
+            # Build SQL query for conversations from read DB
+            sql = text(f"""
+                SELECT
+                    c.id,
+                    c.conversation_id,
+                    c.customer_phone,
+                    c.bot_id,
+                    c.created_at,
+                    c.updated_at
+                FROM conversation c
+                WHERE c.customer_phone IS NOT NULL AND TRIM(c.customer_phone) <> ''
+                {"AND (c.created_at < :cursor_ts OR (c.created_at = :cursor_ts AND c.id < :cursor_id))" if after else ""}
+                ORDER BY c.created_at DESC, c.id DESC
+                LIMIT :limit {"" if after else "OFFSET :offset"}
+            """)
+            result = await db.execute(sql, params)
+            return [dict(row) for row in result.mappings().all()]
+
+        # Apply the QA filter before LIMIT/OFFSET by scanning candidates against the evaluated id set
+        if qa_filter in ("qa", "notqa"):
+            rows, _ = await scan_by_qa_status(
+                write_db, lambda batch_limit, after: fetch(batch_limit, 0, after), qa_filter, limit, offset,
+                max_rows=None,
+            )
+        else:
+            rows = await fetch(limit, offset, None)
 
         return [{
-            "conversation_id": row.conversation_id or "",
-            "customer_phone": row.customer_phone or "",
-            "bot_id": str(row.bot_id) if row.bot_id else "",
-            "created_at": row.created_at.isoformat() if row.created_at else "",
+            "conversation_id": row["conversation_id"] or "",
+            "customer_phone": row["customer_phone"] or "",
+            "bot_id": str(row["bot_id"]) if row["bot_id"] else "",
+            "created_at": row["created_at"].isoformat() if row["created_at"] else "",
             "evaluation_result": None,  # Will be filled from write DB
             "reviewed": False,  # Will be filled from write DB
             "review_note": ""  # Will be filled from write DB
@@ -138,6 +157,24 @@ async def _get_conversations_from_read_db(
         logger.error(f"Error getting conversations from read DB: {e}")
         raise
 
+async def _get_conversations_from_mirror(
+    write_db: AsyncSession,
+    qa_filter: Optional[str] = None,
+    limit: int = 200,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """Get conversations from the local mirror of the legacy conversation table"""
+    rows = await query_mirror_conversations(write_db, qa_status=qa_filter, limit=limit, offset=offset)
+    return [{
+        "conversation_id": row["conversation_id"] or "",
+        "customer_phone": row["customer_phone"] or "",
+        "bot_id": str(row["bot_id"]) if row["bot_id"] else "",
+        "created_at": row["created_at"].isoformat() if row["created_at"] else "",
+        "evaluation_result": None,  # Will be filled from write DB
+        "reviewed": False,  # Will be filled from write DB
+        "review_note": ""  # Will be filled from write DB
+    } for row in rows]
+
 async def _get_evaluations_from_write_db(
     write_db: AsyncSession,
     conversation_ids: List[str]
@@ -176,10 +213,15 @@ async def get_conversations_for_sheets(
 ):
     """Get conversations that have been evaluated or reviewed for sheets update"""
     try:
-        # Get conversations from read database
-        conversations = await _get_conversations_from_read_db(
-            read_db, qa_filter, overall_filter, review_filter, limit, offset
-        )
+        mirror = await get_mirror_status(write_db)
+        if mirror["ready"]:
+            # Serve from the local conversation mirror (QA filter joins evaluations directly)
+            conversations = await _get_conversations_from_mirror(write_db, qa_filter, limit, offset)
+        else:
+            # Get conversations from read database
+            conversations = await _get_conversations_from_read_db(
+                read_db, write_db, qa_filter, overall_filter, review_filter, limit, offset
+            )
 
         if not conversations:
             return {"conversations": []}
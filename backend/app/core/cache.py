@@ -0,0 +1,389 @@
+"""
+Shared Redis cache helpers: hit/miss instrumentation, tag-based invalidation
+and a response cache.
+
+Tags let a write invalidate only the cached entries that depend on the changed
+data: every cached entry is added to one Redis set per tag it depends on
+(`cache:tag:{tag}`), and invalidating a tag deletes every member key.
+
+Namespaces whose keys cannot be enumerated cheaply (`eval:list`, `bots:list`)
+embed a generation counter instead (`{namespace}:g{gen}:...`): bumping the
+counter is a single INCR that makes every older key unreachable, and the
+orphaned keys expire through their TTL. No SCAN/KEYS is needed.
+
+The response cache stores the final encoded JSON body together with its ETag
+and extra headers, so a hit is written out as-is (or answered with 304 when
+the client's `If-None-Match` matches) without parsing or re-validating rows.
+`read_through_response` builds and caches an entry on a miss, letting a
+single caller per key do the work while the others wait for its result.
+Entries are binary (`app.core.cache_codec`: format byte, zstd above 1 KiB)
+and are read through the bytes client; text entries written before that are
+still served until they expire.
+
+Response entries of NEAR_CACHE_NAMESPACES and generation counters are also
+kept in the per-worker near-cache (`app.core.near_cache`). Every invalidation
+here is published so all workers drop their copies. While the near-cache is
+active, hit/miss counters are buffered in memory and flushed periodically
+instead of costing a Redis write per lookup.
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from fastapi import Request, Response
+from app.core.cache_codec import decode_cache_value, encode_cache_value
+from app.core.near_cache import CACHE_INVALIDATION_CHANNEL, near_cache
+from app.core.redis import get_binary_redis, get_redis
+from app.core.serialization import json_dumps_bytes, json_loads
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATS_KEY = "cache:stats"
+_TAG_PREFIX = "cache:tag:"
+_GENERATION_PREFIX = "cache:gen:"
+_LOCK_PREFIX = "cache:lock:"
+
+# Longest a cache miss waits for another worker to fill the same key
+READ_THROUGH_LOCK_TTL_SEC = 10
+_LOCK_POLL_SEC = 0.05
+
+# Response cache namespaces served from the near-cache when it is active
+NEAR_CACHE_NAMESPACES = frozenset({"eval:by_id", "eval:list", "eval:summary", "bots:list"})
+
+_pending_stats: Counter = Counter()
+
+
+async def _count(field: str) -> None:
+    if near_cache.active:
+        _pending_stats[field] += 1
+        return
+    try:
+        redis = await get_redis()
+        await redis.hincrby(CACHE_STATS_KEY, field, 1)
+    except Exception:
+        pass
+
+
+async def record_cache_hit(namespace: str) -> None:
+    await _count(f"{namespace}:hit")
+
+
+async def record_cache_miss(namespace: str) -> None:
+    await _count(f"{namespace}:miss")
+
+
+async def flush_cache_stats() -> None:
+    """Write counters buffered by this worker to CACHE_STATS_KEY."""
+    if not _pending_stats:
+        return
+    pending = dict(_pending_stats)
+    _pending_stats.clear()
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    for field, count in pending.items():
+        pipe.hincrby(CACHE_STATS_KEY, field, count)
+    await pipe.execute()
+
+
+async def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Per-namespace counters with the derived hit ratios.
+
+    `hit_ratio` covers both tiers. Near-cached namespaces also report
+    `near_hit_ratio` (lookups answered in-process) and `redis_hit_ratio`
+    (near-cache misses answered by Redis).
+    """
+    try:
+        await flush_cache_stats()
+    except Exception as e:
+        logger.warning(f"Cache stats flush failed: {e}")
+    redis = await get_redis()
+    raw = await redis.hgetall(CACHE_STATS_KEY)
+    stats: Dict[str, Dict[str, float]] = {}
+    for field, value in raw.items():
+        namespace, _, counter = field.rpartition(":")
+        stats.setdefault(namespace, {"hit": 0, "miss": 0, "invalidated": 0})[counter] = int(value)
+    for counters in stats.values():
+        lookups = counters["hit"] + counters["miss"]
+        counters["hit_ratio"] = round(counters["hit"] / lookups, 4) if lookups else 0.0
+        near_hits, near_misses = counters.get("near_hit", 0), counters.get("near_miss", 0)
+        if near_hits or near_misses:
+            counters["near_hit_ratio"] = round(near_hits / (near_hits + near_misses), 4)
+            redis_hits = max(counters["hit"] - near_hits, 0)
+            counters["redis_hit_ratio"] = round(redis_hits / near_misses, 4) if near_misses else 0.0
+    return stats
+
+
+async def publish_invalidation(keys: Iterable[str]) -> None:
+    """Drop `keys` from this worker's near-cache and tell every other worker to do the same."""
+    keys = list(keys)
+    if not keys:
+        return
+    near_cache.invalidate(keys)
+    try:
+        redis = await get_redis()
+        await redis.publish(CACHE_INVALIDATION_CHANNEL, json_dumps_bytes(keys))
+    except Exception as e:
+        logger.warning(f"Near-cache invalidation publish failed: {e}")
+
+
+async def invalidate_keys(*keys: str) -> None:
+    """Delete cache keys in Redis and in every worker's near-cache."""
+    if not keys:
+        return
+    redis = await get_redis()
+    await redis.delete(*keys)
+    await publish_invalidation(keys)
+
+
+async def reset_cache_stats() -> None:
+    _pending_stats.clear()
+    redis = await get_redis()
+    await redis.delete(CACHE_STATS_KEY)
+
+
+async def _current_generation(namespace: str) -> str:
+    key = f"{_GENERATION_PREFIX}{namespace}"
+    gen = near_cache.get(key)
+    if gen is not None:
+        return gen
+    epoch = near_cache.epoch
+    redis = await get_redis()
+    gen = await redis.get(key)
+    if gen is None:
+        # Seed from the clock so a lost counter never reuses a generation whose keys may still be alive
+        await redis.set(key, int(time.time() * 1000), nx=True)
+        gen = await redis.get(key)
+    near_cache.set(key, gen, len(gen), epoch)
+    return gen
+
+
+async def namespaced_key(namespace: str, *parts: Any) -> str:
+    """Cache key under the namespace's current generation, e.g. "eval:list:g42:50"."""
+    gen = await _current_generation(namespace)
+    return ":".join([namespace, f"g{gen}", *(str(p) for p in parts)])
+
+
+async def bump_generation(*namespaces: str) -> None:
+    """Invalidate every key of the given namespaces (one INCR each)."""
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    seed = int(time.time() * 1000)
+    for namespace in namespaces:
+        pipe.set(f"{_GENERATION_PREFIX}{namespace}", seed, nx=True)
+        pipe.incr(f"{_GENERATION_PREFIX}{namespace}")
+    await pipe.execute()
+    await publish_invalidation(f"{_GENERATION_PREFIX}{namespace}" for namespace in namespaces)
+
+
+async def set_with_tags(key: str, value: Union[str, bytes], ttl: int, tags: Iterable[str]) -> None:
+    """SETEX `key` and register it under each tag; tag sets outlive members by one TTL at most.
+
+    A tag's TTL is only ever extended (Redis 7 EXPIRE NX/GT): tags are shared
+    by entries with different TTLs, and a short-lived entry must not expire a
+    tag set whose longer-lived members still need invalidating.
+    """
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    pipe.setex(key, ttl, value)
+    for tag in set(tags):
+        pipe.sadd(f"{_TAG_PREFIX}{tag}", key)
+        # NX covers a set just created by SADD (GT treats "no TTL" as infinite)
+        pipe.expire(f"{_TAG_PREFIX}{tag}", ttl, nx=True)
+        pipe.expire(f"{_TAG_PREFIX}{tag}", ttl, gt=True)
+    await pipe.execute()
+
+
+def key_namespace(key: str) -> str:
+    """Namespace of a cache key, e.g. "conv:list" for "conv:list:..."."""
+    return ":".join(key.split(":")[:2])
+
+
+async def invalidate_tags(tags: Iterable[str]) -> int:
+    """Delete every cached key registered under any of `tags`; returns the number of keys dropped."""
+    tag_keys = [f"{_TAG_PREFIX}{tag}" for tag in set(tags)]
+    if not tag_keys:
+        return 0
+    redis = await get_redis()
+    keys: List[str] = list(await redis.sunion(tag_keys))
+    pipe = redis.pipeline(transaction=False)
+    if keys:
+        pipe.delete(*keys)
+    pipe.delete(*tag_keys)
+    per_namespace: Dict[str, int] = {}
+    for key in keys:
+        per_namespace[key_namespace(key)] = per_namespace.get(key_namespace(key), 0) + 1
+    for namespace, count in per_namespace.items():
+        pipe.hincrby(CACHE_STATS_KEY, f"{namespace}:invalidated", count)
+    await pipe.execute()
+    await publish_invalidation(keys)
+    return len(keys)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(request: Optional[Request], etag: str) -> bool:
+    header = request.headers.get("if-none-match") if request is not None else None
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+
+
+def _build_response(request: Optional[Request], etag: str, body: bytes, headers: Dict[str, str]) -> Response:
+    headers = {**headers, "ETag": etag}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _split_entry(entry: Optional[bytes]) -> Optional[Tuple[str, Dict[str, str], bytes]]:
+    """(etag, headers, body) of a response cache entry; None for other or unreadable values."""
+    try:
+        data = decode_cache_value(entry)
+    except Exception as e:
+        logger.warning(f"Unreadable response cache entry: {e}")
+        return None
+    # Entries start with the quoted ETag; orjson never emits raw newlines
+    if not data or not data.startswith(b'"'):
+        return None
+    parts = data.split(b"\n", 2)
+    if len(parts) != 3:
+        return None
+    etag, headers, body = parts
+    return etag.decode("utf-8"), json_loads(headers), body
+
+
+def _make_entry(etag: str, headers: Dict[str, str], body: bytes) -> bytes:
+    return encode_cache_value(b"\n".join((etag.encode("utf-8"), json_dumps_bytes(headers), body)))
+
+
+def response_cache_entry(content: Any, headers: Optional[Dict[str, str]] = None) -> bytes:
+    """Response cache entry for `content`, for callers writing entries in bulk."""
+    body = json_dumps_bytes(content)
+    return _make_entry(_etag(body), headers or {}, body)
+
+
+def cached_response_body(entry: Optional[bytes]) -> Optional[bytes]:
+    """JSON body of a response cache entry, for callers reading entries with the bytes client."""
+    parts = _split_entry(entry)
+    return parts[2] if parts else None
+
+
+async def _redis_response(key: str, request: Optional[Request], near: bool) -> Optional[Response]:
+    epoch = near_cache.epoch
+    redis = await get_binary_redis()
+    parts = _split_entry(await redis.get(key))
+    if parts is None:
+        return None
+    etag, headers, body = parts
+    if near:
+        near_cache.set(key, (etag, body, headers), len(body), epoch)
+    return _build_response(request, etag, body, headers)
+
+
+async def get_cached_response(key: str, request: Optional[Request] = None) -> Optional[Response]:
+    """Cached response for `key` (200 with stored bytes, or 304), or None on a miss."""
+    namespace = key_namespace(key)
+    near = near_cache.active and namespace in NEAR_CACHE_NAMESPACES
+    if near:
+        parts = near_cache.get(key)
+        if parts is not None:
+            await _count(f"{namespace}:near_hit")
+            return _build_response(request, *parts)
+        await _count(f"{namespace}:near_miss")
+    return await _redis_response(key, request, near)
+
+
+async def cache_response(
+    key: str,
+    content: Any,
+    ttl: int,
+    request: Optional[Request] = None,
+    headers: Optional[Dict[str, str]] = None,
+    tags: Optional[Iterable[str]] = None,
+) -> Response:
+    """Encode `content` once, store body + ETag + headers under `key`, and return the response."""
+    body = json_dumps_bytes(content)
+    etag = _etag(body)
+    headers = headers or {}
+    entry = _make_entry(etag, headers, body)
+    try:
+        if tags is None:
+            redis = await get_binary_redis()
+            await redis.setex(key, ttl, entry)
+        else:
+            await set_with_tags(key, entry, ttl, tags)
+    except Exception as e:
+        logger.warning(f"Response cache write failed for {key}: {e}")
+    return _build_response(request, etag, body, headers)
+
+
+async def _release_lock(lock_key: str, token: str) -> None:
+    try:
+        redis = await get_redis()
+        if await redis.get(lock_key) == token:
+            await redis.delete(lock_key)
+    except Exception as e:
+        logger.warning(f"Failed to release {lock_key}: {e}")
+
+
+async def read_through_response(
+    key: str,
+    ttl: int,
+    load: Callable[[], Awaitable[Any]],
+    request: Optional[Request] = None,
+    lock_ttl: int = READ_THROUGH_LOCK_TTL_SEC,
+) -> Response:
+    """Cached response for `key`, built from `await load()` and cached on a miss.
+
+    Stampede protection: on a miss only the caller holding `cache:lock:{key}`
+    runs `load()`; concurrent callers poll the key and load themselves only if
+    the holder releases the lock without filling it or `lock_ttl` runs out.
+    Without Redis every caller loads.
+    """
+    namespace = key_namespace(key)
+    try:
+        cached = await get_cached_response(key, request)
+    except Exception as e:
+        logger.warning(f"Response cache read failed for {key}: {e}")
+        cached = None
+    if cached is not None:
+        await record_cache_hit(namespace)
+        return cached
+    await record_cache_miss(namespace)
+
+    lock_key = f"{_LOCK_PREFIX}{key}"
+    token = uuid.uuid4().hex
+    try:
+        redis = await get_redis()
+        locked = bool(await redis.set(lock_key, token, nx=True, ex=lock_ttl))
+    except Exception as e:
+        logger.warning(f"Read-through lock failed for {key}: {e}")
+        locked = False
+    else:
+        if not locked:
+            near = near_cache.active and namespace in NEAR_CACHE_NAMESPACES
+            deadline = time.monotonic() + lock_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_SEC)
+                try:
+                    cached = await _redis_response(key, request, near)
+                    if cached is None and not await redis.exists(lock_key):
+                        # The holder gave up without filling the key
+                        break
+                except Exception:
+                    break
+                if cached is not None:
+                    return cached
+    try:
+        return await cache_response(key, await load(), ttl, request)
+    finally:
+        if locked:
+            await _release_lock(lock_key, token)
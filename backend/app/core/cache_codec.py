@@ -0,0 +1,71 @@
+"""
+Binary envelope for Redis cache values.
+
+A value is one format byte followed by the payload:
+
+- 0x01: payload stored as-is
+- 0x02: zstd-compressed payload
+- 0x03: zlib-compressed payload (writers without zstandard installed)
+
+Payloads of at least COMPRESS_MIN_BYTES are compressed; smaller ones gain
+too little to pay for the compression call.
+
+Values written before the envelope existed are UTF-8 text and always start
+with a printable byte, so they are returned unchanged and old and new entries
+coexist until the old ones expire. Unknown format bytes (a newer writer) read
+as a miss instead of garbage.
+"""
+
+import zlib
+from typing import Optional
+
+try:  # optional, faster and smaller than zlib
+    import zstandard
+except ImportError:  # pragma: no cover - zlib fallback when zstandard is not installed
+    zstandard = None
+
+FORMAT_RAW = 0x01
+FORMAT_ZSTD = 0x02
+FORMAT_ZLIB = 0x03
+
+COMPRESS_MIN_BYTES = 1024
+
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+_zstd_compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL) if zstandard is not None else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+
+class CacheFormatError(ValueError):
+    """The cached value uses a format this process cannot read."""
+
+
+def encode_cache_value(payload: bytes, compress_min_bytes: int = COMPRESS_MIN_BYTES) -> bytes:
+    """Envelope `payload`, compressing it when it is large enough to be worth it."""
+    if len(payload) >= compress_min_bytes:
+        if _zstd_compressor is not None:
+            return bytes((FORMAT_ZSTD,)) + _zstd_compressor.compress(payload)
+        return bytes((FORMAT_ZLIB,)) + zlib.compress(payload, _ZLIB_LEVEL)
+    return bytes((FORMAT_RAW,)) + payload
+
+
+def decode_cache_value(value: Optional[bytes]) -> Optional[bytes]:
+    """Payload of a cached value; legacy text values are returned as-is.
+
+    Raises CacheFormatError for unknown format bytes, or zstd values without zstandard.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    fmt = value[0]
+    if fmt >= 0x20:
+        return value
+    if fmt == FORMAT_RAW:
+        return value[1:]
+    if fmt == FORMAT_ZLIB:
+        return zlib.decompress(value[1:])
+    if fmt == FORMAT_ZSTD and _zstd_decompressor is not None:
+        return _zstd_decompressor.decompress(value[1:])
+    raise CacheFormatError(f"Unsupported cache value format: {fmt:#04x}")
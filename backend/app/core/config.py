@@ -52,6 +52,30 @@ class Settings(BaseSettings):
     REDIS_HEALTHCHECK_SEC: int = 30
     REDIS_SOCKET_TIMEOUT_SEC: int = 5
 
+    # In-process near-cache in front of Redis (per API worker, pub/sub invalidated)
+    NEAR_CACHE_ENABLED: bool = True
+    NEAR_CACHE_MAX_ENTRIES: int = 2000
+    NEAR_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    NEAR_CACHE_TTL_SEC: int = 30
+    CACHE_STATS_FLUSH_SEC: int = 5
+
+    # Legacy DB sync (phone search index, conversation/bot mirror)
+    LEGACY_SYNC_ENABLED: bool = True
+    LEGACY_SYNC_INTERVAL_SEC: int = 30
+    LEGACY_SYNC_BATCH_SIZE: int = 1000
+    CONVERSATION_MIRROR_READS: bool = True  # serve listings from the mirror once backfilled
+
+    # Bulk bot import: concurrent knowledge base extractions (LLM calls)
+    BOT_IMPORT_KB_CONCURRENCY: int = 5
+
+    # KB extraction: longer prompts are extracted per section chunk, in parallel
+    KB_CHUNK_MAX_CHARS: int = 8000
+    KB_CHUNK_MIN_CHARS: int = 400
+    KB_CHUNK_CONCURRENCY: int = 4
+
+    # Responses larger than this are gzip/brotli compressed
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+
     # Google Sheet
     GOOGLE_SHEET_CREDENTIALS_PATH: str
     GOOGLE_SHEET_SPREADSHEET_ID: str
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.engine import make_url
 from app.core.config import settings
+from app.core.serialization import json_dumps, json_loads
 
 
 def normalize_db_url(url: str) -> str:
@@ -43,6 +44,8 @@ engine = create_async_engine(
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_recycle=settings.DB_POOL_RECYCLE_SEC,
     pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    json_serializer=json_dumps,
+    json_deserializer=json_loads,
 )
 
 read_engine = create_async_engine(
@@ -53,6 +56,8 @@ read_engine = create_async_engine(
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_recycle=settings.DB_POOL_RECYCLE_SEC,
     pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    json_serializer=json_dumps,
+    json_deserializer=json_loads,
 )
 
 # Create async session factory
@@ -68,6 +73,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+_CREATE_SIMPLE_UNACCENT_SQL = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'simple_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION simple_unaccent (COPY = simple);
+        ALTER TEXT SEARCH CONFIGURATION simple_unaccent
+            ALTER MAPPING FOR asciiword, asciihword, hword_asciipart, word, hword, hword_part WITH unaccent, simple;
+    END IF;
+END
+$$
+"""
+
+
 async def create_tables():
     """Create all tables defined in models"""
     # Ensure models are imported so metadata is populated
@@ -76,6 +94,12 @@ async def create_tables():
         if write_backend == 'postgresql':
             # Set a statement timeout to protect from long-running DDL
             await conn.exec_driver_sql(f"SET statement_timeout = {settings.PG_STATEMENT_TIMEOUT_MS}")
+            # Trigram operator classes used by search indexes
+            await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            # Accent folding for transcript full-text search
+            await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS unaccent")
+            # Headline config of transcript search (also created by migration 6b1d4e8f2a95)
+            await conn.exec_driver_sql(_CREATE_SIMPLE_UNACCENT_SQL)
         await conn.run_sync(Base.metadata.create_all)
 
 async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
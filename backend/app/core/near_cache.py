@@ -0,0 +1,86 @@
+"""
+In-process near-cache in front of Redis for the hottest cache keys.
+
+Each API worker keeps a bounded LRU (entry count and bytes) of values it read
+from Redis, each with a short TTL. Writers publish the keys they invalidate on
+CACHE_INVALIDATION_CHANNEL and every worker's listener drops them, so workers
+converge within milliseconds of a write; the TTL only bounds staleness if a
+message is lost.
+
+The tier is only `active` while this worker's listener is subscribed. It is
+cleared whenever the subscription (re)starts, since messages may have been
+missed, so processes without a listener (scripts, Celery) always go to Redis.
+
+A fill that raced with an invalidation is dropped: callers take `epoch`
+before reading Redis and pass it to `set`, which ignores the value if any
+invalidation happened in between.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.core.config import settings
+
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class NearCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl_sec: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self.active = False
+        self.epoch = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.active:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int, epoch: int) -> None:
+        """Store `value` (accounted as `size` bytes) unless invalidated since `epoch` was taken."""
+        if not self.active or epoch != self.epoch or size > self.max_bytes // 16:
+            return
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl_sec, value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        self.epoch += 1
+        for key in keys:
+            self._drop(key)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl_sec,
+        }
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+near_cache = NearCache(settings.NEAR_CACHE_MAX_ENTRIES, settings.NEAR_CACHE_MAX_BYTES, settings.NEAR_CACHE_TTL_SEC)
@@ -9,5 +9,17 @@ redis_client = redis.from_url(
     socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SEC,
 )
 
+# Returns raw bytes, for binary cache values (see app.core.cache_codec)
+redis_binary_client = redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=False,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    health_check_interval=settings.REDIS_HEALTHCHECK_SEC,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SEC,
+)
+
 async def get_redis():
     return redis_client
+
+async def get_binary_redis():
+    return redis_binary_client
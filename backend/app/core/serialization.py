@@ -0,0 +1,26 @@
+"""
+Fast JSON codec (orjson) shared by API responses, Redis payloads and JSONB columns.
+
+orjson emits compact UTF-8 (no ASCII escaping) and handles datetime, date and
+UUID natively; other unknown types fall back to `str()`, like the previous
+`json.dumps(..., default=str)` calls.
+"""
+
+from typing import Any
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=_OPTIONS)
+
+
+def json_dumps(value: Any) -> str:
+    """Serialize to a JSON string (SQLAlchemy `json_serializer`, Redis values)."""
+    return json_dumps_bytes(value).decode("utf-8")
+
+
+def json_loads(value: Any) -> Any:
+    """Parse JSON from str/bytes (SQLAlchemy `json_deserializer`, Redis values)."""
+    return orjson.loads(value)
@@ -1,18 +1,36 @@
+import asyncio
 from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
 from app.core.db import create_tables
 from app.api.v1 import api_router
 from app.workers.celery_app import celery_app
+from app.services.jobs import cancel_jobs
+from app.workers.cache_invalidation import invalidation_loop
+from app.workers.legacy_sync import sync_loop
+
+try:  # optional brotli encoder; falls back to gzip for clients without `br`
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # pragma: no cover - gzip only when brotli-asgi is not installed
+    BrotliMiddleware = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await create_tables()
+    sync_task = asyncio.create_task(sync_loop()) if settings.LEGACY_SYNC_ENABLED else None
+    cache_task = asyncio.create_task(invalidation_loop()) if settings.NEAR_CACHE_ENABLED else None
     yield
     # Shutdown
-    # Add graceful shutdown hooks here if needed
+    await cancel_jobs()
+    for task in (sync_task, cache_task):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,6 +39,7 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS using settings
@@ -42,8 +61,15 @@ app.add_middleware(
     allow_credentials=True,  # Always allow credentials for auth
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Mirror-Lag-Seconds", "ETag"],
 )
 
+# Compress large responses (evaluation lists, transcripts); small ones are sent as-is
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,4 +1,7 @@
 # Models package
-from .base import Base, Bot, BotVersion, Evaluation
+from .base import Base, Bot, BotVersion, KnowledgeBaseExtraction, Evaluation, EvaluationMemory, EvaluationDailyRollup, ConversationPhoneIndex, ConversationTranscriptIndex, LegacyConversation, LegacyConversationDaily, LegacyBot, LegacySyncState
 
-__all__ = ["Base", "Bot", "BotVersion", "Evaluation"]
+__all__ = [
+    "Base", "Bot", "BotVersion", "KnowledgeBaseExtraction", "Evaluation", "EvaluationMemory", "EvaluationDailyRollup", "ConversationPhoneIndex", "ConversationTranscriptIndex",
+    "LegacyConversation", "LegacyConversationDaily", "LegacyBot", "LegacySyncState",
+]
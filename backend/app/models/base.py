@@ -1,6 +1,6 @@
 from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Index
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, validates
 from uuid import uuid4
@@ -17,6 +17,8 @@ class Bot(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     bot_index = Column(Integer, nullable=False, unique=True, index=True, comment="External bot ID managed by user")
     name = Column(String(255), nullable=False)
+    # Latest BotVersion; kept in step by every writer of versions (no FK, to keep the bots <-> versions join unambiguous)
+    current_version_id = Column(UUID(as_uuid=True), nullable=True, comment="bot_versions.id of the latest version")
     created_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
 
@@ -66,22 +68,77 @@ class BotVersion(Base):
         return f"<BotVersion(id={self.id}, bot_index={self.bot_index})>"
 
 
+# Keys of evaluation_result.summary.counts (see prompts/qa.md)
+EVALUATION_ERROR_TYPES = (
+    "repetition",
+    "ask_after_known",
+    "missing_required",
+    "policy_violation",
+    "kb_mismatch",
+    "tone_issue",
+)
+
+
+def _summary_count_sql(error_type: str) -> str:
+    """Generated-column expression for summary.counts.<error_type>; NULL unless it is a JSON number."""
+    path = f"'{{summary,counts,{error_type}}}'"
+    return (
+        f"CASE WHEN jsonb_typeof(evaluation_result #> {path}) = 'number' "
+        f"THEN (evaluation_result #>> {path})::numeric::integer END"
+    )
+
+
+class KnowledgeBaseExtraction(Base):
+    """LLM knowledge base extractions, shared by every bot with the same prompt."""
+    __tablename__ = "kb_extractions"
+
+    cache_key = Column(String(64), primary_key=True, comment="sha256 of (system prompt, knowledge.md, model, params)")
+    model = Column(String(64), nullable=False)
+    knowledge_base = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<KnowledgeBaseExtraction(cache_key={self.cache_key}, model={self.model})>"
+
+
 class Evaluation(Base):
     __tablename__ = "evaluations"
     __table_args__ = (
         Index('idx_evaluation_conversation_id', 'conversation_id'),
         Index('idx_evaluation_created_at', 'created_at'),
+        # Keyset paging over (created_at, id), optionally narrowed by the filters below
+        Index('idx_evaluation_created_at_id', 'created_at', 'id'),
+        Index('idx_evaluation_overall_created_at_id', 'overall', 'created_at', 'id'),
+        Index('idx_evaluation_bot_created_at_id', 'bot_index', 'created_at', 'id'),
+        Index('idx_evaluation_unreviewed_created_at_id', 'created_at', 'id', postgresql_where=sa.text('reviewed = false')),
+        *(
+            Index(f'idx_evaluation_has_{t}_created_at_id', 'created_at', 'id', postgresql_where=sa.text(f'{t}_count > 0'))
+            for t in EVALUATION_ERROR_TYPES
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     conversation_id = Column(Text, nullable=False, unique=True, index=True)
-    memory = Column(JSONB, nullable=False, default=lambda: {})
+    # Legacy inline copy of the conversation memory; NULL once moved to evaluation_memories
+    memory = Column(JSONB, nullable=True)
+    memory_hash = Column(String(64), nullable=True, index=True, comment="evaluation_memories.hash")
     evaluation_result = Column(JSONB, nullable=False, default=lambda: {})
     # Review metadata
     reviewed = Column(sa.Boolean, nullable=False, server_default=sa.text("false"))
     review_note = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+    # Denormalized legacy bot id of the conversation, for filtering
+    bot_index = Column(Integer, nullable=True)
+    # Generated from evaluation_result for indexed filtering
+    overall = Column(Text, sa.Computed("evaluation_result #>> '{summary,overall}'", persisted=True))
+    repetition_count = Column(Integer, sa.Computed(_summary_count_sql("repetition"), persisted=True))
+    ask_after_known_count = Column(Integer, sa.Computed(_summary_count_sql("ask_after_known"), persisted=True))
+    missing_required_count = Column(Integer, sa.Computed(_summary_count_sql("missing_required"), persisted=True))
+    policy_violation_count = Column(Integer, sa.Computed(_summary_count_sql("policy_violation"), persisted=True))
+    kb_mismatch_count = Column(Integer, sa.Computed(_summary_count_sql("kb_mismatch"), persisted=True))
+    tone_issue_count = Column(Integer, sa.Computed(_summary_count_sql("tone_issue"), persisted=True))
 
     @validates('evaluation_result')
     def validate_evaluation_result(self, key, result):
@@ -89,16 +146,158 @@ class Evaluation(Base):
             raise ValueError("Evaluation result cannot be empty")
         return result
 
-    @validates('memory')
-    def validate_memory(self, key, memory):
-        if not memory:
-            raise ValueError("Memory cannot be empty")
-        return memory
-
     def __repr__(self):
         return f"<Evaluation(id={self.id}, conversation_id={self.conversation_id}, evaluation_result={self.evaluation_result})>"
 
 
+class EvaluationMemory(Base):
+    """Conversation memory evaluated by QA, stored once per distinct content."""
+    __tablename__ = "evaluation_memories"
+
+    hash = Column(String(64), primary_key=True, comment="sha256 of the canonical (sorted-key) JSON")
+    payload = Column(sa.LargeBinary, nullable=False, comment="zlib-compressed canonical JSON")
+    raw_size = Column(Integer, nullable=False, comment="Uncompressed JSON size in bytes")
+    created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+    def __repr__(self):
+        return f"<EvaluationMemory(hash={self.hash}, raw_size={self.raw_size})>"
+
+
+class EvaluationDailyRollup(Base):
+    """Per-bot, per-day QA aggregates, updated in the same transaction as evaluation writes."""
+    __tablename__ = "evaluation_daily_rollups"
+
+    bot_index = Column(Integer, primary_key=True, comment="Legacy bot id; 0 when unknown")
+    day = Column(sa.Date, primary_key=True, comment="UTC date of evaluation created_at")
+    evaluations = Column(Integer, nullable=False, default=0)
+    overall_good = Column(Integer, nullable=False, default=0)
+    overall_average = Column(Integer, nullable=False, default=0)
+    overall_poor = Column(Integer, nullable=False, default=0)
+    reviewed = Column(Integer, nullable=False, default=0)
+    repetition_sum = Column(Integer, nullable=False, default=0)
+    ask_after_known_sum = Column(Integer, nullable=False, default=0)
+    missing_required_sum = Column(Integer, nullable=False, default=0)
+    policy_violation_sum = Column(Integer, nullable=False, default=0)
+    kb_mismatch_sum = Column(Integer, nullable=False, default=0)
+    tone_issue_sum = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<EvaluationDailyRollup(bot_index={self.bot_index}, day={self.day}, evaluations={self.evaluations})>"
+
+
+class ConversationPhoneIndex(Base):
+    """Normalized phone numbers of legacy call conversations, for indexed search.
+
+    `phone_digits` backs prefix (text_pattern_ops) and infix (trigram) LIKE searches,
+    `phone_digits_rev` turns suffix searches into prefix searches.
+    """
+    __tablename__ = "conversation_phone_index"
+    __table_args__ = (
+        Index('idx_phone_index_digits_prefix', 'phone_digits', postgresql_ops={'phone_digits': 'text_pattern_ops'}),
+        Index('idx_phone_index_digits_rev_prefix', 'phone_digits_rev', postgresql_ops={'phone_digits_rev': 'text_pattern_ops'}),
+        Index('idx_phone_index_digits_trgm', 'phone_digits', postgresql_using='gin', postgresql_ops={'phone_digits': 'gin_trgm_ops'}),
+        Index('idx_phone_index_created_at', 'created_at'),
+    )
+
+    legacy_id = Column(Integer, primary_key=True, autoincrement=False, comment="Legacy conversation.id")
+    conversation_id = Column(Text, nullable=True, index=True)
+    bot_id = Column(Integer, nullable=True)
+    phone_raw = Column(String(64), nullable=False)
+    phone_digits = Column(String(32), nullable=False)
+    phone_digits_rev = Column(String(32), nullable=False)
+    created_at = Column(DateTime(timezone=False), nullable=True, comment="Legacy conversation.created_at")
+    indexed_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<ConversationPhoneIndex(legacy_id={self.legacy_id}, phone_digits='{self.phone_digits}')>"
+
+
+class ConversationTranscriptIndex(Base):
+    """One row per transcript turn, with an accent-insensitive full-text vector."""
+    __tablename__ = "conversation_transcript_index"
+    __table_args__ = (
+        Index('idx_transcript_tsv', 'tsv', postgresql_using='gin'),
+        Index('idx_transcript_bot_created_at', 'bot_id', 'created_at'),
+    )
+
+    conversation_id = Column(Text, primary_key=True)
+    turn_idx = Column(Integer, primary_key=True, comment="Position in bot_memory.messages")
+    legacy_id = Column(Integer, nullable=True, comment="Legacy conversation.id")
+    bot_id = Column(Integer, nullable=True)
+    role = Column(String(32), nullable=False)
+    text = Column(Text, nullable=False)
+    tsv = Column(TSVECTOR, nullable=False, comment="to_tsvector('simple', unaccent(text))")
+    memory_hash = Column(String(32), nullable=True, comment="MD5 of the bot_memory the turn was parsed from")
+    created_at = Column(DateTime(timezone=False), nullable=True, comment="Legacy conversation.created_at")
+    indexed_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+    def __repr__(self):
+        return f"<ConversationTranscriptIndex(conversation_id={self.conversation_id}, turn_idx={self.turn_idx})>"
+
+
+class LegacyConversation(Base):
+    """Metadata mirror of legacy `conversation` rows (no bot_memory), synced incrementally."""
+    __tablename__ = "legacy_conversations"
+    __table_args__ = (
+        Index('idx_legacy_conv_created_at_id', 'created_at', 'legacy_id'),
+        Index('idx_legacy_conv_bot_created_at', 'bot_id', 'created_at'),
+        Index('idx_legacy_conv_updated_at_id', 'updated_at', 'legacy_id'),
+    )
+
+    legacy_id = Column(Integer, primary_key=True, autoincrement=False, comment="Legacy conversation.id")
+    conversation_id = Column(Text, nullable=True, index=True)
+    customer_phone = Column(String(64), nullable=True, comment="Trimmed phone; NULL for chats")
+    bot_id = Column(Integer, nullable=True)
+    memory_size = Column(Integer, nullable=True, comment="Length of legacy bot_memory")
+    created_at = Column(DateTime(timezone=False), nullable=True)
+    updated_at = Column(DateTime(timezone=False), nullable=True)
+    synced_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<LegacyConversation(legacy_id={self.legacy_id}, conversation_id={self.conversation_id})>"
+
+
+class LegacyConversationDaily(Base):
+    """Per-day, per-bot call counts over `legacy_conversations`, kept in step by the mirror sync."""
+    __tablename__ = "legacy_conversation_daily"
+
+    day = Column(sa.Date, primary_key=True, comment="Date of legacy created_at")
+    bot_id = Column(Integer, primary_key=True, comment="Legacy bot id; 0 when the conversation has none")
+    conversations = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<LegacyConversationDaily(day={self.day}, bot_id={self.bot_id}, conversations={self.conversations})>"
+
+
+class LegacyBot(Base):
+    """Name mirror of legacy `bot` rows."""
+    __tablename__ = "legacy_bots"
+
+    legacy_id = Column(Integer, primary_key=True, autoincrement=False, comment="Legacy bot.id")
+    name = Column(String(255), nullable=True, index=True)
+    updated_at = Column(DateTime(timezone=False), nullable=True)
+    synced_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<LegacyBot(legacy_id={self.legacy_id}, name='{self.name}')>"
+
+
+class LegacySyncState(Base):
+    """Per-table (updated_at, id) watermark of the legacy mirror sync."""
+    __tablename__ = "legacy_sync_state"
+
+    name = Column(String(64), primary_key=True)
+    last_updated_at = Column(DateTime(timezone=False), nullable=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    caught_up_at = Column(DateTime(timezone=True), nullable=True, comment="Last time a pass reached the end of the source table")
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<LegacySyncState(name='{self.name}', last_id={self.last_id})>"
+
+
 class User(Base):
     __tablename__ = "users"
 
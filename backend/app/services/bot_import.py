@@ -0,0 +1,130 @@
+"""
+Bulk import of legacy bots.
+
+The legacy `bot` rows are read in one query, missing `Bot` rows and their
+seed `BotVersion` rows are inserted in two statements, and the knowledge base
+of every imported bot is then extracted from its system prompt with at most
+BOT_IMPORT_KB_CONCURRENCY LLM calls in flight, once per distinct prompt and
+through the KB extraction cache. Each KB is written as soon as it is ready,
+so a failure only loses that bot's KB (the version keeps `{}`, like
+`create_bot`) and shows up in the job's failures.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.cache import bump_generation
+from app.core.config import settings
+from app.core.db import async_read_session, async_session
+from app.models.base import Bot, BotVersion
+from app.services.bot_versions import invalidate_latest_kb, point_to_versions
+from app.services.jobs import increment_job, record_job_failure, update_job
+from app.services.knowledge_base import extract_knowledge_base_cached
+from app.services.legacy_queries import fetch_bot_details
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same fallback as create_bot for legacy bots without a system prompt
+_DEFAULT_SYSTEM_PROMPT = "Imported from legacy bot"
+
+
+async def _insert_bots(legacy_bots) -> List[Dict[str, Any]]:
+    """Insert bots not imported yet with their seed versions; returns the new versions."""
+    async with async_session() as db:
+        result = await db.execute(select(Bot.bot_index).where(Bot.bot_index.in_([b.id for b in legacy_bots])))
+        existing = set(result.scalars().all())
+        new_bots = [b for b in legacy_bots if b.id not in existing and b.id > 0]
+        if not new_bots:
+            return []
+        # Core inserts skip the ORM validators; apply the same normalization here
+        result = await db.execute(
+            pg_insert(Bot)
+            .values([{"bot_index": b.id, "name": (b.name or "").strip() or f"Bot {b.id}"} for b in new_bots])
+            .on_conflict_do_nothing(index_elements=[Bot.bot_index])
+            .returning(Bot.bot_index)
+        )
+        inserted = set(result.scalars().all())
+        version_ids: Dict[int, Any] = {}
+        versions = [
+            {"bot_index": b.id, "system_prompt": (b.system_prompt or "").strip() or _DEFAULT_SYSTEM_PROMPT}
+            for b in new_bots
+            if b.id in inserted
+        ]
+        if versions:
+            result = await db.execute(
+                pg_insert(BotVersion)
+                .values([{**v, "knowledge_base": {}} for v in versions])
+                .returning(BotVersion.id, BotVersion.bot_index)
+            )
+            version_ids = {bot_index: version_id for version_id, bot_index in result.all()}
+            await point_to_versions(db, version_ids.values())
+        await db.commit()
+    # Lookups made before the import cached these bots as having no KB
+    await invalidate_latest_kb(*inserted)
+    legacy_prompts = {b.id: b.system_prompt for b in new_bots}
+    return [
+        {"version_id": version_ids[v["bot_index"]], "bot_index": v["bot_index"], "system_prompt": legacy_prompts[v["bot_index"]]}
+        for v in versions
+    ]
+
+
+async def _extract_and_store(job_id: str, semaphore: asyncio.Semaphore, versions: List[Dict[str, Any]]) -> None:
+    """One extraction for versions sharing a system prompt."""
+    async with semaphore:
+        try:
+            async with async_session() as db:
+                kb, _ = await extract_knowledge_base_cached(db, versions[0]["system_prompt"])
+                if not kb:
+                    await db.commit()  # keep the chunks that were extracted
+                    raise ValueError("LLM returned no parsable knowledge base")
+                await db.execute(
+                    update(BotVersion)
+                    .where(BotVersion.id.in_([v["version_id"] for v in versions]))
+                    .values(knowledge_base=kb)
+                )
+                await db.commit()
+            await invalidate_latest_kb(*(v["bot_index"] for v in versions))
+        except Exception as e:
+            for version in versions:
+                logger.warning("KB extraction failed for bot_index=%s: %s", version["bot_index"], e)
+                await record_job_failure(job_id, version["bot_index"], str(e), counter="kb_failed")
+            return
+        await increment_job(job_id, kb_done=len(versions))
+
+
+async def import_legacy_bots(job_id: str, bot_indexes: Optional[List[int]]) -> Dict[str, Any]:
+    """Import the given legacy bots (all when None); job body for `start_job`."""
+    async with async_read_session() as read_db:
+        legacy_bots = await fetch_bot_details(read_db, bot_indexes)
+    found = {b.id for b in legacy_bots}
+    missing = sorted(set(bot_indexes or []) - found)
+
+    versions = await _insert_bots(legacy_bots) if legacy_bots else []
+    if versions:
+        try:
+            await bump_generation("bots:list")
+        except Exception as e:
+            logger.warning(f"Failed to invalidate bot list cache: {e}")
+    with_prompt = [v for v in versions if v["system_prompt"] and v["system_prompt"].strip()]
+    await update_job(
+        job_id,
+        total=len(found),
+        created=len(versions),
+        skipped=len(found) - len(versions),
+        missing=0,
+        kb_total=len(with_prompt),
+        kb_done=0,
+        kb_failed=0,
+    )
+    for bot_index in missing:
+        await record_job_failure(job_id, bot_index, "Legacy bot not found", counter="missing")
+
+    # Bots with identical prompts share one extraction (and the KB cache across jobs)
+    by_prompt: Dict[str, List[Dict[str, Any]]] = {}
+    for version in with_prompt:
+        by_prompt.setdefault(version["system_prompt"].strip(), []).append(version)
+    semaphore = asyncio.Semaphore(max(settings.BOT_IMPORT_KB_CONCURRENCY, 1))
+    await asyncio.gather(*(_extract_and_store(job_id, semaphore, group) for group in by_prompt.values()))
+    return {"created": [v["bot_index"] for v in versions], "missing": missing}
@@ -0,0 +1,126 @@
+"""
+Latest version of each bot.
+
+`Bot.current_version_id` points at the newest `BotVersion`; every writer of
+versions moves it in the same transaction (`point_to_versions`). Readers that
+only need the knowledge base use `latest_knowledge_bases`, which reads a
+per-bot Redis cache (`bot:kb:{bot_index}`) and, for misses, joins through
+the pointer selecting `knowledge_base` only. Bots whose pointer is not set
+fall back to a DISTINCT ON over their versions.
+
+Call `invalidate_latest_kb` after committing a new version or a KB change.
+It bumps a per-bot generation (`bot:kb:gen:{bot_index}`); entries store the
+generation read before their DB load and are ignored once it moved on, so a
+reader that loaded a KB just before a writer committed cannot cache it as
+current (the same idea as the near-cache epoch).
+"""
+
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache_codec import decode_cache_value, encode_cache_value
+from app.core.redis import get_binary_redis
+from app.core.serialization import json_dumps_bytes, json_loads
+from app.models.base import Bot, BotVersion
+import logging
+
+logger = logging.getLogger(__name__)
+
+LATEST_KB_CACHE_TTL_SEC = 60 * 60
+
+
+def _kb_cache_key(bot_index: int) -> str:
+    return f"bot:kb:{bot_index}"
+
+
+def _kb_generation_key(bot_index: int) -> str:
+    return f"bot:kb:gen:{bot_index}"
+
+
+async def point_to_versions(db: AsyncSession, version_ids: Iterable[Any]) -> None:
+    """Make each given version the current one of its bot; the caller commits."""
+    version_ids = list(version_ids)
+    if not version_ids:
+        return
+    await db.execute(
+        update(Bot)
+        .where(Bot.bot_index == BotVersion.bot_index, BotVersion.id.in_(version_ids))
+        .values(current_version_id=BotVersion.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def invalidate_latest_kb(*bot_indexes: int) -> None:
+    if not bot_indexes:
+        return
+    try:
+        redis = await get_binary_redis()
+        pipe = redis.pipeline(transaction=False)
+        for bot_index in bot_indexes:
+            pipe.incr(_kb_generation_key(bot_index))
+            pipe.delete(_kb_cache_key(bot_index))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to invalidate latest KB cache: {e}")
+
+
+async def _load_latest_kbs(db: AsyncSession, bot_indexes: List[int]) -> Dict[int, Dict[str, Any]]:
+    result = await db.execute(
+        select(Bot.bot_index, BotVersion.knowledge_base)
+        .join(BotVersion, BotVersion.id == Bot.current_version_id)
+        .where(Bot.bot_index.in_(bot_indexes))
+    )
+    kbs = {bot_index: kb or {} for bot_index, kb in result.all()}
+    unpointed = [b for b in bot_indexes if b not in kbs]
+    if unpointed:
+        result = await db.execute(
+            select(BotVersion.bot_index, BotVersion.knowledge_base)
+            .where(BotVersion.bot_index.in_(unpointed))
+            .distinct(BotVersion.bot_index)
+            .order_by(BotVersion.bot_index, BotVersion.created_at.desc())
+        )
+        kbs.update({bot_index: kb or {} for bot_index, kb in result.all()})
+    return kbs
+
+
+async def latest_knowledge_bases(db: AsyncSession, bot_indexes: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Knowledge base of the latest version per bot index; {} for bots without versions."""
+    wanted = sorted({b for b in bot_indexes if b is not None})
+    if not wanted:
+        return {}
+    kbs: Dict[int, Dict[str, Any]] = {}
+    generations: Dict[int, int] = {}
+    try:
+        redis = await get_binary_redis()
+        values = await redis.mget([_kb_cache_key(b) for b in wanted] + [_kb_generation_key(b) for b in wanted])
+        for bot_index, value, generation in zip(wanted, values[: len(wanted)], values[len(wanted):]):
+            generations[bot_index] = int(generation or 0)
+            payload = decode_cache_value(value)
+            entry = json_loads(payload) if payload is not None else None
+            # [generation, kb]; anything else (older entry format) is a miss
+            if isinstance(entry, list) and len(entry) == 2 and entry[0] == generations[bot_index]:
+                kbs[bot_index] = entry[1]
+    except Exception as e:
+        logger.warning(f"Latest KB cache read failed: {e}")
+
+    missing = [b for b in wanted if b not in kbs]
+    if missing:
+        loaded = await _load_latest_kbs(db, missing)
+        for bot_index in missing:
+            kbs[bot_index] = loaded.get(bot_index, {})
+        # Without the generation read before the load, the entry could not be checked
+        fillable = [b for b in missing if b in generations]
+        try:
+            if fillable:
+                redis = await get_binary_redis()
+                pipe = redis.pipeline(transaction=False)
+                for bot_index in fillable:
+                    pipe.setex(
+                        _kb_cache_key(bot_index),
+                        LATEST_KB_CACHE_TTL_SEC,
+                        encode_cache_value(json_dumps_bytes([generations[bot_index], kbs[bot_index]])),
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Latest KB cache write failed: {e}")
+    return kbs
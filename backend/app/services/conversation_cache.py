@@ -0,0 +1,75 @@
+"""
+Cache dependencies of conversation list pages (`conv:list:*`, `conv:page:*`).
+
+Each cached page is tagged with the conversation ids it contains, and
+QA-filtered pages additionally with the bot scope of their filter. Evaluation
+writes then invalidate only the pages they can change:
+
+- any page containing the evaluated conversation (`conv:cid:{id}`)
+- qa / notqa pages covering the conversation's bot, or all bots (`conv:qa:bot:{id|all}`),
+  since those gain or lose a row
+
+Conversation stats (`conv:stats:*`) are tagged with their bot scope
+(`conv:stats:bot:{id|all}`) and dropped whenever the mirror sync brings in
+conversations for that bot; QA-filtered stats also carry the qa tag above.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.core.cache import invalidate_tags
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def conversation_page_tags(
+    rows: Iterable[Tuple[Optional[str], Optional[int]]],
+    bot_id: Optional[int],
+    qa_status: Optional[str],
+) -> Set[str]:
+    """Tags for a cached page given its (conversation_id, bot_id) rows and filters."""
+    tags: Set[str] = set()
+    for conversation_id, _ in rows:
+        if conversation_id:
+            tags.add(f"conv:cid:{conversation_id}")
+    if qa_status:
+        tags.add(f"conv:qa:bot:{bot_id if bot_id is not None else 'all'}")
+    return tags
+
+
+async def invalidate_pages_for_evaluations(evaluated: Iterable[Tuple[str, Optional[int]]]) -> int:
+    """Drop cached conversation pages affected by new/updated evaluations of (conversation_id, bot_id)."""
+    tags: List[str] = []
+    bots: Set[Optional[int]] = set()
+    for conversation_id, bot_id in evaluated:
+        if conversation_id:
+            tags.append(f"conv:cid:{conversation_id}")
+        bots.add(bot_id)
+    if not tags:
+        return 0
+    tags.append("conv:qa:bot:all")
+    tags.extend(f"conv:qa:bot:{b}" for b in bots if b is not None)
+    try:
+        return await invalidate_tags(tags)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate conversation list cache: {e}")
+        return 0
+
+
+def conversation_stats_tags(bot_id: Optional[int], qa_status: Optional[str]) -> Set[str]:
+    """Tags for cached stats of one filter combination."""
+    tags = {f"conv:stats:bot:{bot_id if bot_id is not None else 'all'}"}
+    return tags | conversation_page_tags((), bot_id, qa_status)
+
+
+async def invalidate_stats_for_conversations(rows: Iterable[Dict[str, Any]]) -> int:
+    """Drop cached stats covering the bots of newly synced legacy conversation rows."""
+    bots = {r.get("bot_id") for r in rows}
+    if not bots:
+        return 0
+    tags = ["conv:stats:bot:all"]
+    tags.extend(f"conv:stats:bot:{b}" for b in bots if b is not None)
+    try:
+        return await invalidate_tags(tags)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate conversation stats cache: {e}")
+        return 0
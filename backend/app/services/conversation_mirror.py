@@ -0,0 +1,338 @@
+"""
+Local mirror of legacy conversation metadata and bot names.
+
+The legacy read DB is outside our control (no indexes we can add, flaky `bot`
+joins), so listings are served from indexed copies in the write DB instead:
+
+- `legacy_conversations`: id, conversation_id, phone, bot_id, memory size, timestamps
+- `legacy_bots`: id and name
+- `legacy_conversation_daily`: per-day, per-bot call counts, recomputed for the
+  days touched by each synced batch
+
+Both source tables are polled incrementally in (sync_ts, id) order and upserted
+in batches; `sync_ts` is `updated_at`, or `created_at` for conversations that
+never had `updated_at` set. Each conversation batch also feeds the phone index
+and the transcript index in the same transaction, so the legacy table is
+scanned once per pass and all three stay at the same watermark.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Date, cast, select, text, func, exists, or_, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.base import (
+    ConversationPhoneIndex,
+    Evaluation,
+    LegacyBot,
+    LegacyConversation,
+    LegacyConversationDaily,
+    LegacySyncState,
+)
+from app.services.phone_index import phone_match_condition, upsert_phone_index_rows
+from app.services.transcript_search import index_source_rows
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIRROR_CONVERSATIONS = "conversation"
+MIRROR_BOTS = "bot"
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Legacy rows may have a NULL updated_at (never edited): they sync on created_at
+_CONVERSATION_SYNC_TS = "COALESCE(updated_at, created_at, TIMESTAMP '1970-01-01 00:00:00')"
+
+_CONVERSATION_SOURCE_SQL = text(
+    f"""
+    SELECT id, conversation_id, customer_phone, bot_id,
+           LENGTH(bot_memory) AS memory_size, MD5(bot_memory) AS memory_hash,
+           created_at, updated_at, {_CONVERSATION_SYNC_TS} AS sync_ts
+    FROM conversation
+    WHERE {_CONVERSATION_SYNC_TS} > :last_updated_at
+       OR ({_CONVERSATION_SYNC_TS} = :last_updated_at AND id > :last_id)
+    ORDER BY sync_ts ASC, id ASC
+    LIMIT :limit
+    """
+)
+
+_BOT_SOURCE_SQL = text(
+    """
+    SELECT id, name, updated_at, updated_at AS sync_ts
+    FROM bot
+    WHERE updated_at > :last_updated_at
+       OR (updated_at = :last_updated_at AND id > :last_id)
+    ORDER BY updated_at ASC, id ASC
+    LIMIT :limit
+    """
+)
+
+
+def parse_ts(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp filter into the naive datetime the mirror stores.
+
+    Raises ValueError on malformed input.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    return parsed.replace(tzinfo=None)
+
+
+async def _get_state(write_db: AsyncSession, name: str) -> LegacySyncState:
+    state = await write_db.get(LegacySyncState, name)
+    if state is None:
+        state = LegacySyncState(name=name, last_updated_at=_EPOCH, last_id=0)
+        write_db.add(state)
+    return state
+
+
+async def _upsert_conversations(write_db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    values = [
+        {
+            "legacy_id": r["id"],
+            "conversation_id": r.get("conversation_id"),
+            "customer_phone": ((r.get("customer_phone") or "").strip()[:64] or None),
+            "bot_id": r.get("bot_id"),
+            "memory_size": r.get("memory_size"),
+            "created_at": r.get("created_at"),
+            "updated_at": r.get("updated_at"),
+        }
+        for r in rows
+    ]
+    # (day, bot) the rows counted towards before this sync, recounted below as well
+    previous = await write_db.execute(
+        select(LegacyConversation.created_at, LegacyConversation.bot_id).where(
+            LegacyConversation.legacy_id.in_([v["legacy_id"] for v in values])
+        )
+    )
+    previous_rows = [{"created_at": created_at, "bot_id": bot_id} for created_at, bot_id in previous.all()]
+    stmt = pg_insert(LegacyConversation).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LegacyConversation.legacy_id],
+        set_={
+            "conversation_id": stmt.excluded.conversation_id,
+            "customer_phone": stmt.excluded.customer_phone,
+            "bot_id": stmt.excluded.bot_id,
+            "memory_size": stmt.excluded.memory_size,
+            "created_at": stmt.excluded.created_at,
+            "updated_at": stmt.excluded.updated_at,
+            "synced_at": func.now(),
+        },
+    )
+    await write_db.execute(stmt)
+    await _refresh_daily_counts(write_db, rows + previous_rows)
+
+
+async def _refresh_daily_counts(write_db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Recount calls for every (day, bot) in `rows`, in the batch's transaction.
+
+    Called with both the synced rows and their previous mirror values, so the
+    pair a row moved away from is recounted too.
+    """
+    touched = {(r["created_at"].date(), r.get("bot_id") or 0) for r in rows if r.get("created_at")}
+    if not touched:
+        return
+    c = LegacyConversation
+    day = cast(c.created_at, Date)
+    bot = func.coalesce(c.bot_id, 0)
+    day_ranges = []
+    for d in {d for d, _ in touched}:
+        start = datetime.combine(d, datetime.min.time())
+        day_ranges.append(and_(c.created_at >= start, c.created_at < start + timedelta(days=1)))
+    query = (
+        select(day.label("day"), bot.label("bot_id"), func.count().label("conversations"))
+        .where(c.customer_phone.isnot(None))
+        .where(or_(*day_ranges))
+        .where(bot.in_({b for _, b in touched}))
+        .group_by(day, bot)
+    )
+    counts = {(r.day, r.bot_id): r.conversations for r in (await write_db.execute(query)).all()}
+    # Pairs left without calls are written as 0 so moved/converted rows do not linger
+    values = [{"day": d, "bot_id": b, "conversations": counts.get((d, b), 0)} for d, b in touched]
+    stmt = pg_insert(LegacyConversationDaily).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LegacyConversationDaily.day, LegacyConversationDaily.bot_id],
+        set_={"conversations": stmt.excluded.conversations, "updated_at": func.now()},
+    )
+    await write_db.execute(stmt)
+
+
+async def _upsert_bots(write_db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    values = [{"legacy_id": r["id"], "name": r.get("name"), "updated_at": r.get("updated_at")} for r in rows]
+    stmt = pg_insert(LegacyBot).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LegacyBot.legacy_id],
+        set_={"name": stmt.excluded.name, "updated_at": stmt.excluded.updated_at, "synced_at": func.now()},
+    )
+    await write_db.execute(stmt)
+
+
+async def sync_legacy_table(
+    read_db: AsyncSession,
+    write_db: AsyncSession,
+    name: str,
+    source_sql,
+    upsert,
+    batch_size: int,
+    max_batches: int,
+) -> List[Dict[str, Any]]:
+    """Copy source rows past the (sync_ts, id) watermark; each batch commits together with its watermark."""
+    state = await _get_state(write_db, name)
+    synced: List[Dict[str, Any]] = []
+    for _ in range(max_batches):
+        result = await read_db.execute(
+            source_sql,
+            {"last_updated_at": state.last_updated_at or _EPOCH, "last_id": state.last_id or 0, "limit": batch_size},
+        )
+        rows = [dict(r) for r in result.mappings().all()]
+        if rows:
+            await upsert(write_db, rows)
+            state.last_updated_at = rows[-1]["sync_ts"]
+            state.last_id = rows[-1]["id"]
+            synced.extend(rows)
+        if len(rows) < batch_size:
+            state.caught_up_at = datetime.now(timezone.utc)
+        await write_db.commit()
+        if len(rows) < batch_size:
+            break
+    return synced
+
+
+async def sync_conversation_mirror(
+    read_db: AsyncSession,
+    write_db: AsyncSession,
+    batch_size: int = 1000,
+    max_batches: int = 50,
+) -> List[Dict[str, Any]]:
+    """Mirror new/updated legacy conversations and index them; returns the synced source rows."""
+
+    async def upsert(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        await _upsert_conversations(session, rows)
+        await upsert_phone_index_rows(session, rows)
+        # Transcripts are only searched for calls
+        await index_source_rows(read_db, session, [r for r in rows if (r.get("customer_phone") or "").strip()])
+
+    rows = await sync_legacy_table(
+        read_db, write_db, MIRROR_CONVERSATIONS, _CONVERSATION_SOURCE_SQL, upsert, batch_size, max_batches
+    )
+    if rows:
+        logger.info("Conversation mirror synced %d rows", len(rows))
+    return rows
+
+
+async def get_conversation_sync_watermark(write_db: AsyncSession) -> Optional[datetime]:
+    """Legacy `sync_ts` the mirror, phone index and transcript index are synced up to, or None if never synced."""
+    state = await write_db.get(LegacySyncState, MIRROR_CONVERSATIONS)
+    return state.last_updated_at if state is not None else None
+
+
+async def sync_bot_mirror(
+    read_db: AsyncSession,
+    write_db: AsyncSession,
+    batch_size: int = 1000,
+    max_batches: int = 10,
+) -> List[Dict[str, Any]]:
+    """Mirror new/updated legacy bot names; returns the synced source rows."""
+    return await sync_legacy_table(read_db, write_db, MIRROR_BOTS, _BOT_SOURCE_SQL, _upsert_bots, batch_size, max_batches)
+
+
+async def get_mirror_status(write_db: AsyncSession) -> Dict[str, Any]:
+    """Readiness and lag of the conversation mirror.
+
+    `ready` turns true once the initial backfill has reached the end of the
+    legacy table; `lag_seconds` is the time since the sync last caught up.
+    """
+    state = await write_db.get(LegacySyncState, MIRROR_CONVERSATIONS)
+    if state is None or state.caught_up_at is None:
+        return {"ready": False, "lag_seconds": None, "last_updated_at": None, "last_id": None}
+    lag = (datetime.now(timezone.utc) - state.caught_up_at).total_seconds()
+    return {
+        "ready": settings.CONVERSATION_MIRROR_READS,
+        "lag_seconds": max(lag, 0.0),
+        "last_updated_at": state.last_updated_at,
+        "last_id": state.last_id,
+    }
+
+
+def build_mirror_conversation_query(
+    bot_id: Optional[int] = None,
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+    phone_like: Optional[str] = None,
+    conversation_id_like: Optional[str] = None,
+    bot_name_like: Optional[str] = None,
+    qa_status: Optional[str] = None,
+):
+    """Filtered (unordered, unpaginated) select of mirrored call conversations.
+
+    Columns match the legacy listing query, with `legacy_id` exposed as `id`.
+    """
+    c = LegacyConversation
+    query = select(
+        c.legacy_id.label("id"),
+        c.conversation_id,
+        c.customer_phone,
+        c.bot_id,
+        c.created_at,
+        c.updated_at,
+    ).where(c.customer_phone.isnot(None))
+
+    if bot_id is not None:
+        query = query.where(c.bot_id == bot_id)
+    if start_ts is not None:
+        query = query.where(c.created_at >= start_ts)
+    if end_ts is not None:
+        query = query.where(c.created_at < end_ts)
+    if conversation_id_like:
+        query = query.where(c.conversation_id.like(f"%{conversation_id_like}%"))
+    if bot_name_like:
+        query = query.join(LegacyBot, LegacyBot.legacy_id == c.bot_id).where(
+            LegacyBot.name.like(f"%{bot_name_like}%")
+        )
+    if phone_like:
+        condition = phone_match_condition(phone_like)
+        if condition is None:
+            query = query.where(c.customer_phone.like(f"%{phone_like}%"))
+        else:
+            # The phone index is written in the same batches as the mirror, so it covers every mirrored row
+            query = query.where(c.legacy_id.in_(select(ConversationPhoneIndex.legacy_id).where(condition)))
+    if qa_status in ("qa", "notqa"):
+        evaluated = exists().where(Evaluation.conversation_id == c.conversation_id)
+        query = query.where(evaluated if qa_status == "qa" else ~evaluated)
+    return query
+
+
+async def query_mirror_conversations(
+    write_db: AsyncSession,
+    bot_id: Optional[int] = None,
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+    phone_like: Optional[str] = None,
+    conversation_id_like: Optional[str] = None,
+    bot_name_like: Optional[str] = None,
+    qa_status: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor_ts: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """One page of mirrored call conversations, newest first.
+
+    With `cursor_ts`/`cursor_id` the page seeks past that (created_at, id)
+    position and `offset` is ignored.
+    """
+    c = LegacyConversation
+    query = build_mirror_conversation_query(
+        bot_id, start_ts, end_ts, phone_like, conversation_id_like, bot_name_like, qa_status
+    )
+    if cursor_ts is not None and cursor_id is not None:
+        query = query.where(
+            or_(c.created_at < cursor_ts, and_(c.created_at == cursor_ts, c.legacy_id < cursor_id))
+        )
+    else:
+        query = query.offset(offset)
+    query = query.order_by(c.created_at.desc(), c.legacy_id.desc()).limit(limit)
+    result = await write_db.execute(query)
+    return [dict(r) for r in result.mappings().all()]
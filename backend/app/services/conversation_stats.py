@@ -0,0 +1,138 @@
+"""
+Totals and per-day histograms of mirrored call conversations.
+
+Counting is picked per filter so broad ranges never scan the mirror:
+
+- bot / time range only: summed from `legacy_conversation_daily`; partial days
+  at the range edges are counted exactly from `legacy_conversations`
+- qa: exact count (bounded by the number of evaluations)
+- notqa: daily counters minus the exact qa count
+- phone: exact count when the planner expects at most STATS_EXACT_LIMIT rows,
+  otherwise the planner estimate (no histogram)
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import Date, cast, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.base import LegacyConversationDaily
+from app.services.conversation_mirror import build_mirror_conversation_query
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATS_EXACT_LIMIT = 200_000
+
+_ONE_DAY = timedelta(days=1)
+
+
+def _day_floor(ts: datetime) -> datetime:
+    return datetime.combine(ts.date(), datetime.min.time())
+
+
+def _merge(into: Dict[date, int], other: Dict[date, int], sign: int = 1) -> None:
+    for day, count in other.items():
+        into[day] = into.get(day, 0) + sign * count
+
+
+async def _exact_histogram(
+    write_db: AsyncSession,
+    bot_id: Optional[int],
+    start_ts: Optional[datetime],
+    end_ts: Optional[datetime],
+    phone_like: Optional[str] = None,
+    qa_status: Optional[str] = None,
+) -> Dict[date, int]:
+    rows = build_mirror_conversation_query(
+        bot_id, start_ts, end_ts, phone_like=phone_like, qa_status=qa_status
+    ).subquery()
+    day = cast(rows.c.created_at, Date)
+    result = await write_db.execute(select(day.label("day"), func.count().label("n")).group_by(day))
+    return {r.day: r.n for r in result.all() if r.day is not None}
+
+
+async def _counter_histogram(
+    write_db: AsyncSession,
+    bot_id: Optional[int],
+    start_ts: Optional[datetime],
+    end_ts: Optional[datetime],
+) -> Dict[date, int]:
+    """Daily counters for whole days in range, exact counts for partial edge days."""
+    if start_ts is not None and end_ts is not None and end_ts - start_ts <= _ONE_DAY:
+        return await _exact_histogram(write_db, bot_id, start_ts, end_ts)
+
+    d = LegacyConversationDaily
+    query = select(d.day, func.sum(d.conversations).label("n")).group_by(d.day)
+    if bot_id is not None:
+        query = query.where(d.bot_id == bot_id)
+    histogram: Dict[date, int] = {}
+    if start_ts is not None:
+        first_full = _day_floor(start_ts)
+        if first_full != start_ts:
+            first_full += _ONE_DAY
+            _merge(histogram, await _exact_histogram(write_db, bot_id, start_ts, first_full))
+        query = query.where(d.day >= first_full.date())
+    if end_ts is not None:
+        last_full = _day_floor(end_ts)
+        if last_full != end_ts:
+            _merge(histogram, await _exact_histogram(write_db, bot_id, last_full, end_ts))
+        query = query.where(d.day < last_full.date())
+    result = await write_db.execute(query)
+    _merge(histogram, {r.day: int(r.n or 0) for r in result.all()})
+    return histogram
+
+
+async def _planner_estimate(write_db: AsyncSession, query) -> Optional[int]:
+    """Row estimate of the Postgres planner for `query`, or None if EXPLAIN fails."""
+    try:
+        sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        result = await write_db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Planner estimate failed: {e}")
+        await write_db.rollback()
+        return None
+
+
+async def conversation_stats(
+    write_db: AsyncSession,
+    bot_id: Optional[int] = None,
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+    phone_like: Optional[str] = None,
+    qa_status: Optional[str] = None,
+) -> Dict[str, Any]:
+    """{total, estimated, source, histogram: [{day, count}]} for the given filters."""
+    if start_ts is not None and end_ts is not None and end_ts <= start_ts:
+        return {"total": 0, "estimated": False, "source": "exact", "histogram": []}
+
+    if phone_like:
+        query = build_mirror_conversation_query(
+            bot_id, start_ts, end_ts, phone_like=phone_like, qa_status=qa_status
+        )
+        estimate = await _planner_estimate(write_db, query)
+        if estimate is not None and estimate > STATS_EXACT_LIMIT:
+            return {"total": estimate, "estimated": True, "source": "planner", "histogram": []}
+        histogram = await _exact_histogram(write_db, bot_id, start_ts, end_ts, phone_like, qa_status)
+        source = "exact"
+    elif qa_status == "qa":
+        histogram = await _exact_histogram(write_db, bot_id, start_ts, end_ts, qa_status="qa")
+        source = "exact"
+    else:
+        histogram = await _counter_histogram(write_db, bot_id, start_ts, end_ts)
+        if qa_status == "notqa":
+            _merge(histogram, await _exact_histogram(write_db, bot_id, start_ts, end_ts, qa_status="qa"), sign=-1)
+        source = "counters"
+
+    days = sorted(day for day, count in histogram.items() if count > 0)
+    return {
+        "total": sum(histogram[day] for day in days),
+        "estimated": False,
+        "source": source,
+        "histogram": [{"day": day, "count": histogram[day]} for day in days],
+    }
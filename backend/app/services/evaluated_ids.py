@@ -0,0 +1,120 @@
+"""
+Compact set of evaluated conversation ids, kept in Redis.
+
+The legacy read DB and the write DB are separate databases, so a listing query
+on `conversation` cannot join `evaluations`. Listings filtered on `qa_status`
+instead scan candidate rows in listing order and keep those whose membership
+in this set matches (`SMISMEMBER` on the candidates only), so the cost of a
+page does not grow with the number of evaluations.
+"""
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.redis import get_redis
+from app.models.base import Evaluation
+import logging
+
+logger = logging.getLogger(__name__)
+
+EVALUATED_IDS_KEY = "eval:conversation_ids"
+# Rebuilt from the write DB at least this often, so drift self-heals
+EVALUATED_IDS_TTL_SEC = 60 * 60
+# Keeps the set present in Redis even when no evaluation exists yet
+_SENTINEL = ""
+
+# Candidate rows fetched per scan step, and at most per cursor page
+QA_SCAN_BATCH_SIZE = 500
+QA_SCAN_MAX_ROWS = 20000
+
+ScanPosition = Tuple[datetime, int]
+
+
+async def _rebuild(write_db: AsyncSession) -> Set[str]:
+    result = await write_db.execute(select(Evaluation.conversation_id))
+    ids = {cid for cid in result.scalars().all() if cid}
+    redis = await get_redis()
+    tmp_key = f"{EVALUATED_IDS_KEY}:rebuild"
+    pipe = redis.pipeline(transaction=True)
+    pipe.delete(tmp_key)
+    pipe.sadd(tmp_key, _SENTINEL, *ids)
+    pipe.expire(tmp_key, EVALUATED_IDS_TTL_SEC)
+    pipe.rename(tmp_key, EVALUATED_IDS_KEY)
+    await pipe.execute()
+    logger.info("Rebuilt evaluated conversation id set (%d ids)", len(ids))
+    return ids
+
+
+async def evaluated_flags(write_db: AsyncSession, conversation_ids: List[Optional[str]]) -> List[bool]:
+    """Whether each given conversation has an evaluation, in input order."""
+    if not any(conversation_ids):
+        return [False] * len(conversation_ids)
+    try:
+        redis = await get_redis()
+        flags = await redis.smismember(EVALUATED_IDS_KEY, [_SENTINEL, *(cid or _SENTINEL for cid in conversation_ids)])
+        # Without the sentinel the set was (re)created by a bare SADD and is partial
+        if flags[0]:
+            return [bool(cid) and bool(flag) for cid, flag in zip(conversation_ids, flags[1:])]
+        evaluated = await _rebuild(write_db)
+    except Exception as e:
+        logger.warning(f"Evaluated id set unavailable, reading write DB directly: {e}")
+        result = await write_db.execute(
+            select(Evaluation.conversation_id).where(Evaluation.conversation_id.in_({c for c in conversation_ids if c}))
+        )
+        evaluated = set(result.scalars().all())
+    return [bool(cid) and cid in evaluated for cid in conversation_ids]
+
+
+async def scan_by_qa_status(
+    write_db: AsyncSession,
+    fetch: Callable[[int, Optional[ScanPosition]], Awaitable[List[Dict[str, Any]]]],
+    qa_status: str,
+    limit: int,
+    offset: int = 0,
+    after: Optional[ScanPosition] = None,
+    max_rows: Optional[int] = QA_SCAN_MAX_ROWS,
+) -> Tuple[List[Dict[str, Any]], Optional[ScanPosition]]:
+    """One page of rows whose evaluated state matches `qa_status` ("qa" / "notqa").
+
+    `fetch(batch_size, after)` returns candidate rows (with `id`, `conversation_id`,
+    `created_at`) in listing order, past the `after` (created_at, id) position when
+    given. Returns (rows, resume_at): `resume_at` is set when the page is short
+    because the scan hit `max_rows` candidates, and is where the next page
+    continues. Callers that cannot hand a continuation back (offset listings)
+    pass `max_rows=None` to scan until the page is full or the rows run out.
+    """
+    want_evaluated = qa_status == "qa"
+    rows: List[Dict[str, Any]] = []
+    scanned = 0
+    while True:
+        candidates = await fetch(QA_SCAN_BATCH_SIZE, after)
+        flags = await evaluated_flags(write_db, [c["conversation_id"] for c in candidates])
+        for candidate, evaluated in zip(candidates, flags):
+            if evaluated != want_evaluated:
+                continue
+            if offset:
+                offset -= 1
+                continue
+            rows.append(candidate)
+            if len(rows) == limit:
+                return rows, None
+        scanned += len(candidates)
+        if len(candidates) < QA_SCAN_BATCH_SIZE or candidates[-1]["created_at"] is None:
+            return rows, None
+        after = (candidates[-1]["created_at"], candidates[-1]["id"])
+        if max_rows is not None and scanned >= max_rows:
+            return rows, after
+
+
+async def add_evaluated_conversation_ids(conversation_ids: Iterable[str]) -> None:
+    """Record newly evaluated conversations; a missing set is left for lazy rebuild."""
+    ids = [cid for cid in conversation_ids if cid]
+    if not ids:
+        return
+    try:
+        redis = await get_redis()
+        if await redis.exists(EVALUATED_IDS_KEY):
+            await redis.sadd(EVALUATED_IDS_KEY, *ids)
+    except Exception as e:
+        logger.warning(f"Failed to update evaluated id set: {e}")
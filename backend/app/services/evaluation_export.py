@@ -0,0 +1,287 @@
+"""
+Streaming export of evaluations to NDJSON, CSV and Parquet.
+
+Rows are read through a server-side cursor (`yield_per`) and each partition is
+encoded and handed to the caller before the next one is fetched, so memory
+stays bounded by EXPORT_BATCH_SIZE whatever the number of rows exported.
+
+Columns are projected in SQL: unrequested JSON documents are never read.
+`memory` is joined from `evaluation_memories` and decompressed per row.
+CSV has no nesting, so `summary` is written as its flattened parts (verdict
+and per-type error counts, taken from the generated columns) and other JSON
+columns as JSON text. Parquet is written one row group per partition and
+needs pyarrow.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.serialization import json_dumps, json_dumps_bytes
+from app.models.base import EVALUATION_ERROR_TYPES, Evaluation, EvaluationMemory
+from app.services.evaluation_memory import decode_memory
+
+try:  # optional Parquet writer
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet export unavailable without pyarrow
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows per server-side fetch, CSV/NDJSON chunk and Parquet row group
+EXPORT_BATCH_SIZE = 1000
+
+_COUNT_COLUMNS = tuple(f"{t}_count" for t in EVALUATION_ERROR_TYPES)
+
+EXPORT_COLUMNS = (
+    "id",
+    "conversation_id",
+    "bot_index",
+    "created_at",
+    "updated_at",
+    "reviewed",
+    "review_note",
+    "overall",
+    *_COUNT_COLUMNS,
+    "summary",
+    "evaluation_result",
+    "memory_hash",
+    "memory",
+)
+
+DEFAULT_EXPORT_COLUMNS = (
+    "id",
+    "conversation_id",
+    "bot_index",
+    "created_at",
+    "reviewed",
+    "review_note",
+    "summary",
+)
+
+_JSON_COLUMNS = ("summary", "evaluation_result", "memory")
+
+# CSV header of the `summary` column
+_SUMMARY_CSV_COLUMNS = ("summary.overall", *(f"summary.counts.{t}" for t in EVALUATION_ERROR_TYPES))
+
+
+class ExportUnavailableError(RuntimeError):
+    """The requested export format cannot be produced in this environment."""
+
+
+def parse_export_columns(columns: Optional[str]) -> List[str]:
+    """Comma-separated projection -> column list; raises ValueError on unknown names."""
+    if not columns:
+        return list(DEFAULT_EXPORT_COLUMNS)
+    names = list(dict.fromkeys(c.strip() for c in columns.split(",") if c.strip()))
+    unknown = [c for c in names if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+    if not names:
+        raise ValueError("No export columns given")
+    return names
+
+
+def apply_evaluation_filters(
+    query,
+    overall: Optional[str] = None,
+    error_type: Optional[str] = None,
+    bot_index: Optional[int] = None,
+    reviewed: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """Evaluation filters on the generated/denormalized columns, so each one is index-backed."""
+    e = Evaluation
+    if overall is not None:
+        query = query.where(e.overall == overall)
+    if error_type is not None:
+        query = query.where(getattr(e, f"{error_type}_count") > 0)
+    if bot_index is not None:
+        query = query.where(e.bot_index == bot_index)
+    if reviewed is False:
+        # Literal predicate so the partial index on `reviewed = false` applies
+        query = query.where(e.reviewed.is_(False))
+    elif reviewed is True:
+        query = query.where(e.reviewed.is_(True))
+    if created_from is not None:
+        query = query.where(e.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(e.created_at < created_to)
+    return query
+
+
+def evaluation_export_query(columns: Sequence[str], **filters):
+    """Oldest-first select of the projected columns; the summary's CSV parts are always included."""
+    e = Evaluation
+    selected = {}
+    for name in columns:
+        if name == "summary":
+            selected["summary"] = e.evaluation_result["summary"]
+            selected["overall"] = e.overall
+            selected.update({c: getattr(e, c) for c in _COUNT_COLUMNS})
+        elif name == "memory":
+            selected["memory"] = e.memory
+            selected["memory_payload"] = EvaluationMemory.payload
+        else:
+            selected[name] = getattr(e, name)
+    query = select(*(expr.label(name) for name, expr in selected.items()))
+    if "memory" in columns:
+        query = query.outerjoin(EvaluationMemory, EvaluationMemory.hash == e.memory_hash)
+    query = apply_evaluation_filters(query, **filters)
+    return query.order_by(e.created_at, e.id)
+
+
+async def iter_export_rows(
+    write_db: AsyncSession,
+    columns: Sequence[str],
+    batch_size: int = EXPORT_BATCH_SIZE,
+    **filters,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Batches of exported rows as dicts, fetched through a server-side cursor."""
+    query = evaluation_export_query(columns, **filters).execution_options(yield_per=batch_size)
+    result = await write_db.stream(query)
+    async for partition in result.mappings().partitions():
+        rows = []
+        for row in partition:
+            row = dict(row)
+            if "memory" in columns:
+                payload = row.pop("memory_payload")
+                if row["memory"] is None and payload is not None:
+                    row["memory"] = decode_memory(payload)
+            if "id" in row:
+                row["id"] = str(row["id"])
+            rows.append(row)
+        yield rows
+
+
+def _csv_header(columns: Sequence[str]) -> List[str]:
+    header: List[str] = []
+    for name in columns:
+        header.extend(_SUMMARY_CSV_COLUMNS if name == "summary" else (name,))
+    return header
+
+
+def _csv_values(row: Dict[str, Any], columns: Sequence[str]) -> List[Any]:
+    values: List[Any] = []
+    for name in columns:
+        if name == "summary":
+            values.append(row["overall"])
+            values.extend(row[c] for c in _COUNT_COLUMNS)
+        elif name in _JSON_COLUMNS:
+            values.append(json_dumps(row[name]) if row[name] is not None else None)
+        elif isinstance(row[name], datetime):
+            values.append(row[name].isoformat())
+        else:
+            values.append(row[name])
+    return values
+
+
+async def _encode_ndjson(batches: AsyncIterator[List[Dict[str, Any]]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(json_dumps_bytes({c: row[c] for c in columns}) + b"\n" for row in rows)
+
+
+async def _encode_csv(batches: AsyncIterator[List[Dict[str, Any]]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_csv_header(columns))
+    async for rows in batches:
+        writer.writerows(_csv_values(row, columns) for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file for pyarrow whose contents are handed out and dropped after each row group."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_schema(columns: Sequence[str]):
+    types = {
+        "id": pa.string(),
+        "conversation_id": pa.string(),
+        "bot_index": pa.int64(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+        "updated_at": pa.timestamp("us", tz="UTC"),
+        "reviewed": pa.bool_(),
+        "review_note": pa.string(),
+        "overall": pa.string(),
+        "memory_hash": pa.string(),
+        **{c: pa.int64() for c in _COUNT_COLUMNS},
+    }
+    # Parquet has no JSON type; nested documents are stored as JSON text
+    return pa.schema([(c, types.get(c, pa.string())) for c in columns])
+
+
+async def _encode_parquet(batches: AsyncIterator[List[Dict[str, Any]]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    schema = _parquet_schema(columns)
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for rows in batches:
+            data = {
+                c: [json_dumps(r[c]) if c in _JSON_COLUMNS and r[c] is not None else r[c] for r in rows]
+                for c in columns
+            }
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_evaluations(
+    write_db: AsyncSession,
+    fmt: str,
+    columns: Sequence[str],
+    batch_size: int = EXPORT_BATCH_SIZE,
+    **filters,
+) -> AsyncIterator[bytes]:
+    """Encoded export as an async stream of byte chunks, one per fetched batch.
+
+    Raises ExportUnavailableError for Parquet when pyarrow is not installed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet" and pq is None:
+        raise ExportUnavailableError("Parquet export requires pyarrow")
+    batches = iter_export_rows(write_db, columns, batch_size, **filters)
+    if fmt == "ndjson":
+        return _encode_ndjson(batches, columns)
+    if fmt == "csv":
+        return _encode_csv(batches, columns)
+    return _encode_parquet(batches, columns)
@@ -0,0 +1,60 @@
+"""
+Content-addressed storage of evaluated conversation memory.
+
+Evaluations used to carry a full `bot_memory` copy inline. Memories now live
+once per distinct content in `evaluation_memories` (sha256 of the canonical
+JSON, zlib-compressed payload) and evaluations keep only `memory_hash`, so
+re-evaluating a conversation stores nothing new and list scans over
+`evaluations` stay small. Payloads are loaded on demand for detail views.
+"""
+
+import hashlib
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+import orjson
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.base import Evaluation, EvaluationMemory
+
+_COMPRESS_LEVEL = 6
+
+
+def encode_memory(memory: Dict[str, Any]) -> Tuple[str, bytes, int]:
+    """(hash, compressed payload, raw size) for a memory dict; keys are sorted so equal content hashes equally."""
+    raw = orjson.dumps(memory, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, _COMPRESS_LEVEL), len(raw)
+
+
+def decode_memory(payload: bytes) -> Dict[str, Any]:
+    return orjson.loads(zlib.decompress(payload))
+
+
+async def store_memory(write_db: AsyncSession, memory: Dict[str, Any]) -> str:
+    """Store `memory` unless identical content exists; returns its hash. The caller commits."""
+    mem_hash, payload, raw_size = encode_memory(memory)
+    stmt = (
+        pg_insert(EvaluationMemory)
+        .values(hash=mem_hash, payload=payload, raw_size=raw_size)
+        .on_conflict_do_nothing(index_elements=[EvaluationMemory.hash])
+    )
+    await write_db.execute(stmt)
+    return mem_hash
+
+
+async def load_memories(write_db: AsyncSession, hashes: Iterable[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+    """Decoded memories for the given hashes, in one query."""
+    wanted = {h for h in hashes if h}
+    if not wanted:
+        return {}
+    result = await write_db.execute(
+        select(EvaluationMemory.hash, EvaluationMemory.payload).where(EvaluationMemory.hash.in_(wanted))
+    )
+    return {mem_hash: decode_memory(payload) for mem_hash, payload in result.all()}
+
+
+async def load_evaluation_memories(write_db: AsyncSession, rows: Iterable[Evaluation]) -> Dict[Any, Dict[str, Any]]:
+    """Memory per evaluation id; rows not yet moved out still carry it inline."""
+    rows = list(rows)
+    stored = await load_memories(write_db, (r.memory_hash for r in rows if r.memory is None))
+    return {r.id: r.memory if r.memory is not None else stored.get(r.memory_hash, {}) for r in rows}
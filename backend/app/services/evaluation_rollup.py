@@ -0,0 +1,143 @@
+"""
+QA rollups: per (bot_index, day) aggregates of evaluations.
+
+Every evaluation contributes one row's worth of counters to the rollup of its
+bot and UTC creation day. Writers pass the contribution before and after a
+change (None for inserts), and the difference is applied with an additive
+upsert in the writer's own transaction, so re-runs and review toggles never
+double count.
+"""
+
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.base import EVALUATION_ERROR_TYPES, Evaluation, EvaluationDailyRollup
+
+RollupKey = Tuple[int, date]
+Contribution = Tuple[RollupKey, Dict[str, int]]
+
+_OVERALL_COLUMNS = {"good": "overall_good", "average": "overall_average", "poor": "overall_poor"}
+
+ROLLUP_COLUMNS = (
+    "evaluations",
+    *_OVERALL_COLUMNS.values(),
+    "reviewed",
+    *(f"{t}_sum" for t in EVALUATION_ERROR_TYPES),
+)
+
+
+def _utc_day(ts: Optional[datetime]) -> date:
+    if ts is None:
+        ts = datetime.now(timezone.utc)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.date()
+
+
+def _round_like_postgres(value: float) -> int:
+    # numeric::integer rounds half away from zero (2.5 -> 3); round() would give 2
+    return int(Decimal(str(value)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def rollup_contribution(
+    bot_index: Optional[int],
+    created_at: Optional[datetime],
+    evaluation_result: Optional[Dict[str, Any]],
+    reviewed: bool,
+) -> Contribution:
+    """Counters one evaluation adds to its (bot_index, day) rollup."""
+    summary = (evaluation_result or {}).get("summary") or {}
+    counts = summary.get("counts") or {}
+    values = {"evaluations": 1, "reviewed": int(bool(reviewed))}
+    overall_column = _OVERALL_COLUMNS.get(summary.get("overall"))
+    if overall_column:
+        values[overall_column] = 1
+    for error_type in EVALUATION_ERROR_TYPES:
+        count = counts.get(error_type)
+        # Same rule as the generated *_count columns: only JSON numbers count
+        if isinstance(count, (int, float)) and not isinstance(count, bool):
+            values[f"{error_type}_sum"] = _round_like_postgres(count)
+    return (bot_index or 0, _utc_day(created_at)), values
+
+
+def evaluation_contribution(row: Evaluation) -> Contribution:
+    return rollup_contribution(row.bot_index, row.created_at, row.evaluation_result, row.reviewed)
+
+
+def review_change(
+    bot_index: Optional[int],
+    created_at: Optional[datetime],
+    was_reviewed: bool,
+    reviewed: bool,
+) -> Tuple[Contribution, Contribution]:
+    """(before, after) pair for a change of the review flag only."""
+    key = (bot_index or 0, _utc_day(created_at))
+    return (key, {"reviewed": int(bool(was_reviewed))}), (key, {"reviewed": int(bool(reviewed))})
+
+
+async def apply_rollup_changes(
+    write_db: AsyncSession,
+    changes: Iterable[Tuple[Optional[Contribution], Optional[Contribution]]],
+) -> None:
+    """Apply (before, after) contribution pairs as one additive upsert; the caller commits."""
+    deltas: Dict[RollupKey, Dict[str, int]] = {}
+    for before, after in changes:
+        for contribution, sign in ((before, -1), (after, 1)):
+            if contribution is None:
+                continue
+            key, values = contribution
+            row = deltas.setdefault(key, dict.fromkeys(ROLLUP_COLUMNS, 0))
+            for column, value in values.items():
+                row[column] += sign * value
+    # Rows are upserted (and locked) in key order, so concurrent writers cannot deadlock
+    rows = [
+        {"bot_index": bot_index, "day": day, **values}
+        for (bot_index, day), values in sorted(deltas.items())
+        if any(values.values())
+    ]
+    if not rows:
+        return
+    table = EvaluationDailyRollup.__table__
+    stmt = pg_insert(EvaluationDailyRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EvaluationDailyRollup.bot_index, EvaluationDailyRollup.day],
+        set_={
+            **{column: table.c[column] + stmt.excluded[column] for column in ROLLUP_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+    await write_db.execute(stmt)
+
+
+_REBUILD_SQL = text(
+    f"""
+    INSERT INTO evaluation_daily_rollups (bot_index, day, {", ".join(ROLLUP_COLUMNS)}, updated_at)
+    SELECT COALESCE(bot_index, 0),
+           CAST(created_at AT TIME ZONE 'UTC' AS DATE),
+           COUNT(*),
+           COUNT(*) FILTER (WHERE overall = 'good'),
+           COUNT(*) FILTER (WHERE overall = 'average'),
+           COUNT(*) FILTER (WHERE overall = 'poor'),
+           COUNT(*) FILTER (WHERE reviewed),
+           {", ".join(f"COALESCE(SUM({t}_count), 0)" for t in EVALUATION_ERROR_TYPES)},
+           now()
+    FROM evaluations
+    GROUP BY 1, 2
+    """
+)
+
+
+async def rebuild_rollups(write_db: AsyncSession) -> int:
+    """Recompute every rollup row from `evaluations`; returns the number of rollup rows.
+
+    TRUNCATE locks the rollup table first, so concurrent evaluation writes wait
+    and apply their deltas on top of the rebuilt totals.
+    """
+    await write_db.execute(text("TRUNCATE evaluation_daily_rollups"))
+    await write_db.execute(_REBUILD_SQL)
+    result = await write_db.execute(text("SELECT COUNT(*) FROM evaluation_daily_rollups"))
+    await write_db.commit()
+    return int(result.scalar_one())
@@ -0,0 +1,133 @@
+"""
+Background jobs run inside the API process, with their state in Redis.
+
+A job is started with `start_job`, which records it under `job:{id}` and runs
+the coroutine as an asyncio task in the worker that accepted the request.
+Progress counters and failures live in Redis, so `get_job` answers from any
+API worker. A job whose process dies keeps its last state; `updated_at` shows
+when it last made progress.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from app.core.redis import get_redis
+from app.core.serialization import json_dumps, json_loads
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL_SEC = 7 * 24 * 60 * 60
+
+# Failures kept per job; counters still count every failure
+JOB_MAX_FAILURES = 1000
+
+# Strong references: the event loop only keeps weak ones to running tasks
+_running: Set[asyncio.Task] = set()
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _failures_key(job_id: str) -> str:
+    return f"job:{job_id}:failures"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _touch(pipe, job_id: str) -> None:
+    pipe.hset(_job_key(job_id), "updated_at", _now())
+    pipe.expire(_job_key(job_id), JOB_TTL_SEC)
+    pipe.expire(_failures_key(job_id), JOB_TTL_SEC)
+
+
+async def update_job(job_id: str, **fields: Any) -> None:
+    """Set job fields (status, counters, result...); values are stored as JSON."""
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    pipe.hset(_job_key(job_id), mapping={k: json_dumps(v) for k, v in fields.items()})
+    _touch(pipe, job_id)
+    await pipe.execute()
+
+
+async def increment_job(job_id: str, **counters: int) -> None:
+    """Add to job progress counters, e.g. `increment_job(job_id, done=1)`."""
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    for field, amount in counters.items():
+        pipe.hincrby(_job_key(job_id), field, amount)
+    _touch(pipe, job_id)
+    await pipe.execute()
+
+
+async def record_job_failure(job_id: str, item: Any, error: str, counter: str = "failed") -> None:
+    """Count a failed item and keep its error for `get_job`."""
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    pipe.hincrby(_job_key(job_id), counter, 1)
+    pipe.rpush(_failures_key(job_id), json_dumps({"item": item, "error": error[:500], "at": _now()}))
+    pipe.ltrim(_failures_key(job_id), 0, JOB_MAX_FAILURES - 1)
+    _touch(pipe, job_id)
+    await pipe.execute()
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job state with its recorded failures, or None for unknown/expired jobs."""
+    redis = await get_redis()
+    pipe = redis.pipeline(transaction=False)
+    pipe.hgetall(_job_key(job_id))
+    pipe.lrange(_failures_key(job_id), 0, -1)
+    raw, failures = await pipe.execute()
+    if not raw:
+        return None
+    job: Dict[str, Any] = {}
+    for field, value in raw.items():
+        try:
+            job[field] = json_loads(value)
+        except Exception:
+            job[field] = value
+    job["failures"] = [json_loads(f) for f in failures]
+    return job
+
+
+async def start_job(
+    kind: str,
+    run: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    **fields: Any,
+) -> str:
+    """Register a job and run `run(job_id)` in the background; returns the job id.
+
+    The job ends `completed` (with the returned dict as `result`) or `failed`
+    (with `error`) when `run` raises.
+    """
+    job_id = uuid.uuid4().hex
+    await update_job(job_id, id=job_id, kind=kind, status="queued", created_at=_now(), **fields)
+
+    async def runner() -> None:
+        try:
+            await update_job(job_id, status="running", started_at=_now())
+            result = await run(job_id)
+            await update_job(job_id, status="completed", finished_at=_now(), result=result or {})
+        except asyncio.CancelledError:
+            await update_job(job_id, status="cancelled", finished_at=_now())
+            raise
+        except Exception as e:
+            logger.exception(f"Job {kind} {job_id} failed")
+            await update_job(job_id, status="failed", finished_at=_now(), error=str(e))
+
+    task = asyncio.create_task(runner(), name=f"job:{kind}:{job_id}")
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return job_id
+
+
+async def cancel_jobs() -> None:
+    """Cancel jobs of this process (application shutdown); they end `cancelled`."""
+    tasks = list(_running)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,146 @@
+"""
+Chunked knowledge base extraction: splitting long system prompts and merging
+the partial KBs extracted from each chunk.
+
+Prompts are split on section boundaries (markdown, bold or roman-numbered
+headings). Each section is its own chunk, so editing one section changes only
+that chunk's text and, with chunk-level caching, only that chunk is extracted
+again. Short sections share a chunk with their neighbour and oversized
+sections are split on blank lines, so an edit reaches at most the chunks
+next to it.
+
+Partial KBs are merged deterministically in chunk order, following the
+`knowledge.md` schema: the first non-null scalar wins, objects merge key by
+key, string lists are concatenated without duplicates, and object lists
+(hotlines, FAQs, specialties...) are deduplicated by their identifying field,
+with duplicates merged into the first occurrence.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+from app.core.serialization import json_dumps
+
+# Lines that open a new section: "## Title", "**Title**", "II. Title"
+# (numbered lines are left alone: they are usually list items, not headings)
+_SECTION_HEADING = re.compile(
+    r"^(?:#{1,6}\s+\S|\*\*[^*\n]+\*\*:?\s*$|[IVX]+[.)]\s+\S)",
+    re.MULTILINE,
+)
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+# Identifying field of the items of each object list in the KB schema
+KB_LIST_ITEM_KEYS = {
+    "hotlines": "number",
+    "faq": "q",
+    "specialties": "name",
+    "procedures_or_packages": "name",
+    "imaging_and_tests": "modality",
+}
+
+
+def _sections(text: str) -> List[str]:
+    starts = [m.start() for m in _SECTION_HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(text)]
+    return [text[a:b].strip() for a, b in zip(bounds, bounds[1:]) if text[a:b].strip()]
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    parts: List[str] = []
+    current = ""
+    for paragraph in _PARAGRAPH_BREAK.split(section):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            parts.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_system_prompt(system_prompt: str, max_chars: int, min_chars: int) -> List[str]:
+    """Chunks of `system_prompt` along section boundaries; one chunk when it fits in `max_chars`."""
+    text = system_prompt.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    chunks: List[str] = []
+    for section in _sections(text):
+        if len(section) > max_chars:
+            chunks.extend(_split_oversized(section, max_chars))
+        elif (
+            chunks
+            and min(len(section), len(chunks[-1])) < min_chars
+            and len(chunks[-1]) + len(section) <= max_chars
+        ):
+            chunks[-1] = f"{chunks[-1]}\n\n{section}"
+        else:
+            chunks.append(section)
+    return chunks
+
+
+def _identity(value: Any, field: str) -> Optional[str]:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    if field == "number":
+        digits = re.sub(r"\D", "", value)
+        return digits or None
+    return " ".join(value.split()).casefold()
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == [] or value == {} or value == ""
+
+
+def _merge_list(items: List[Any], more: List[Any], item_key: Optional[str]) -> List[Any]:
+    merged = list(items)
+    index: Dict[str, int] = {}
+    for i, item in enumerate(merged):
+        key = _item_identity(item, item_key)
+        index.setdefault(key, i)
+    for item in more:
+        key = _item_identity(item, item_key)
+        if key in index:
+            existing = merged[index[key]]
+            if isinstance(existing, dict) and isinstance(item, dict):
+                merged[index[key]] = merge_value(existing, item)
+            continue
+        index[key] = len(merged)
+        merged.append(item)
+    return merged
+
+
+def _item_identity(item: Any, item_key: Optional[str]) -> str:
+    if item_key and isinstance(item, dict):
+        identity = _identity(item.get(item_key), item_key)
+        if identity is not None:
+            return f"{item_key}:{identity}"
+    if isinstance(item, str):
+        return "str:" + " ".join(item.split()).casefold()
+    return "json:" + json_dumps(item)
+
+
+def merge_value(base: Any, other: Any, field: Optional[str] = None) -> Any:
+    """Merge `other` into `base` (the earlier chunk wins scalar conflicts)."""
+    if isinstance(other, dict) and (base is None or isinstance(base, dict)):
+        merged = dict(base or {})
+        for key, value in other.items():
+            merged[key] = merge_value(merged.get(key), value, key)
+        return merged
+    if isinstance(other, list) and (base is None or isinstance(base, list)):
+        return _merge_list(base or [], other, KB_LIST_ITEM_KEYS.get(field))
+    if _is_empty(base):
+        return other if not _is_empty(other) else base
+    return base
+
+
+def merge_knowledge_bases(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Single KB from per-chunk KBs, merged in chunk order."""
+    merged: Dict[str, Any] = {}
+    for partial in partials:
+        merged = merge_value(merged, partial)
+    return merged
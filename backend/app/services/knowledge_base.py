@@ -0,0 +1,205 @@
+"""
+Knowledge base extraction: the LLM turns a bot's system prompt into a
+structured KB (prompt `knowledge.md`).
+
+Extractions are cached in `kb_extractions` under a hash of everything that
+determines the output (system prompt, `knowledge.md`, model, call params),
+shared across bots, so an unchanged prompt never pays for a second LLM call.
+Editing `knowledge.md` or switching models changes the key.
+
+Prompts longer than KB_CHUNK_MAX_CHARS are split into section chunks
+(`kb_chunking`), extracted in parallel and merged; the cache then holds one
+entry per chunk, so editing one section only re-extracts that section.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.core.serialization import json_dumps_bytes
+from app.core.db import async_session
+from app.models.base import BotVersion, KnowledgeBaseExtraction
+from app.services.bot_versions import invalidate_latest_kb, point_to_versions
+from app.services.kb_chunking import merge_knowledge_bases, split_system_prompt
+from app.services.openai_client import openai_service
+from app.utils.prompt_loader import load_prompt
+
+logger = logging.getLogger(__name__)
+
+# Model and params of explicit regenerations (imports use the defaults)
+KB_REGENERATE_MODEL = "gpt-4.1"
+KB_REGENERATE_PARAMS = {"response_format": {"type": "json_object"}}
+
+
+async def extract_knowledge_base(system_prompt: str, model: str = "gpt-4.1-mini", **params) -> dict:
+    """KB for `system_prompt`; raises if the LLM call fails, {} if its output is not JSON."""
+    messages = [
+        {"role": "system", "content": load_prompt("knowledge.md")},
+        {"role": "user", "content": system_prompt},
+    ]
+    kb_str = await openai_service.chat_completion(model=model, messages=messages, temperature=0.4, **params)
+    return parse_kb_json(kb_str)
+
+
+def kb_cache_key(system_prompt: str, model: str, **params) -> str:
+    material = [system_prompt.strip(), load_prompt("knowledge.md"), model, params]
+    return hashlib.sha256(json_dumps_bytes(material)).hexdigest()
+
+
+async def _cached_extractions(db: AsyncSession, keys: Iterable[str]) -> Dict[str, dict]:
+    result = await db.execute(
+        select(KnowledgeBaseExtraction.cache_key, KnowledgeBaseExtraction.knowledge_base).where(
+            KnowledgeBaseExtraction.cache_key.in_(list(keys))
+        )
+    )
+    return dict(result.all())
+
+
+async def _store_extraction(db: AsyncSession, key: str, model: str, kb: dict) -> None:
+    stmt = pg_insert(KnowledgeBaseExtraction).values(cache_key=key, model=model, knowledge_base=kb)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[KnowledgeBaseExtraction.cache_key],
+        set_={"knowledge_base": stmt.excluded.knowledge_base, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+async def _extract_chunks(chunks: Dict[str, str], model: str, **params) -> Dict[str, dict]:
+    """KB per chunk (keyed like `chunks`); a failed call yields {} instead of raising."""
+    semaphore = asyncio.Semaphore(settings.KB_CHUNK_CONCURRENCY)
+
+    async def extract(chunk: str) -> dict:
+        async with semaphore:
+            return await extract_knowledge_base(chunk, model=model, **params)
+
+    results = await asyncio.gather(*(extract(c) for c in chunks.values()), return_exceptions=True)
+    kbs: Dict[str, dict] = {}
+    for key, kb in zip(chunks, results):
+        if isinstance(kb, Exception):
+            logger.warning("KB extraction failed for chunk %s: %s", key[:12], kb)
+            kb = {}
+        kbs[key] = kb
+    return kbs
+
+
+async def extract_knowledge_base_cached(
+    db: AsyncSession,
+    system_prompt: str,
+    model: str = "gpt-4.1-mini",
+    force: bool = False,
+    **params,
+) -> Tuple[dict, bool]:
+    """(KB, cache hit) for `system_prompt`; `force` skips the lookup and refreshes the entries.
+
+    Empty (unparsable) extractions are returned but not cached; a long prompt with any
+    failed chunk returns {} while its other chunks are still stored. The caller commits.
+    """
+    chunks = split_system_prompt(system_prompt, settings.KB_CHUNK_MAX_CHARS, settings.KB_CHUNK_MIN_CHARS)
+    if len(chunks) <= 1:
+        key = kb_cache_key(system_prompt, model, **params)
+        if not force:
+            cached = (await _cached_extractions(db, [key])).get(key)
+            if cached is not None:
+                return cached, True
+        kb = await extract_knowledge_base(system_prompt, model=model, **params)
+        if kb:
+            await _store_extraction(db, key, model, kb)
+        return kb, False
+
+    keys: List[str] = [kb_cache_key(c, model, **params) for c in chunks]
+    kbs = {} if force else await _cached_extractions(db, set(keys))
+    missing = {key: chunk for key, chunk in zip(keys, chunks) if key not in kbs}
+    if missing:
+        logger.info("Extracting KB for %d of %d prompt chunks", len(missing), len(chunks))
+        for key, kb in (await _extract_chunks(missing, model, **params)).items():
+            if kb:
+                await _store_extraction(db, key, model, kb)
+            kbs[key] = kb
+    if not all(kbs[key] for key in keys):
+        return {}, False
+    return merge_knowledge_bases([kbs[key] for key in keys]), not missing
+
+
+async def regenerate_knowledge_base(bot_index: int, force: bool = False) -> Dict[str, Any]:
+    """Job body: KB for the latest version's prompt; adds a BotVersion only if the KB changed.
+
+    Raises when no usable KB comes back, so the job fails and no empty version is created.
+    """
+    async with async_session() as db:
+        result = await db.execute(
+            select(BotVersion)
+            .where(BotVersion.bot_index == bot_index)
+            .order_by(BotVersion.created_at.desc())
+            .limit(1)
+        )
+        current = result.scalar_one_or_none()
+        if current is None:
+            raise ValueError(f"Bot version not found for bot_index={bot_index}")
+        logger.info("Regenerating KB for bot_index=%s (force=%s)", bot_index, force)
+        kb, cached = await extract_knowledge_base_cached(
+            db, current.system_prompt, model=KB_REGENERATE_MODEL, force=force, **KB_REGENERATE_PARAMS
+        )
+        if not kb:
+            await db.commit()  # keep the chunks that were extracted
+            raise ValueError("LLM returned no parsable knowledge base")
+        if kb == current.knowledge_base:
+            await db.commit()
+            return {"version_id": str(current.id), "cached": cached, "new_version": False}
+        new_version = BotVersion(bot_index=bot_index, system_prompt=current.system_prompt, knowledge_base=kb)
+        db.add(new_version)
+        await db.flush()
+        await point_to_versions(db, [new_version.id])
+        await db.commit()
+        await invalidate_latest_kb(bot_index)
+        return {"version_id": str(new_version.id), "cached": cached, "new_version": True}
+
+
+def parse_kb_json(text: str) -> dict:
+    """Parse JSON content returned by LLM defensively.
+
+    - Accepts content wrapped in markdown code fences
+    - Extracts the first top-level JSON object if extra text is present
+    - Falls back to empty dict on failure
+    """
+    if not text:
+        return {}
+
+    # Fast path
+    try:
+        return json.loads(text)
+    except Exception:
+        pass
+
+    content = text.strip()
+
+    # Strip markdown code fences if any
+    if content.startswith("```"):
+        # Remove opening fence with optional language
+        content = re.sub(r"^```[a-zA-Z0-9_-]*\s*", "", content)
+        # Remove closing fence
+        content = re.sub(r"```\s*$", "", content)
+
+    # Try again
+    try:
+        return json.loads(content)
+    except Exception:
+        pass
+
+    # Extract substring between first '{' and last '}'
+    start = content.find("{")
+    end = content.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        candidate = content[start : end + 1]
+        try:
+            return json.loads(candidate)
+        except Exception:
+            logger.warning("Failed to parse KB JSON from candidate substring; returning empty dict")
+
+    return {}
\ No newline at end of file
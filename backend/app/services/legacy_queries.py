@@ -1,6 +1,7 @@
 from typing import Any, Dict, List, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from app.schemas.legacy import (
     UserRow,
     BotRow,
@@ -106,6 +107,37 @@ async def fetch_bot_detail(db: AsyncSession, bot_id: int) -> List[BotDetailRow]:
     return [BotDetailRow(**dict(row)) for row in rows]
 
 
+async def fetch_bot_details(db: AsyncSession, bot_ids: Optional[List[int]] = None) -> List[BotDetailRow]:
+    """Legacy bots with their system prompts in one query; all bots when `bot_ids` is None."""
+    where = "WHERE id IN :bot_ids" if bot_ids is not None else ""
+    sql = text(
+        f"""
+        SELECT
+          id,
+          name,
+          user_id,
+          bot_type,
+          bot_url,
+          system_prompt,
+          version,
+          created_at,
+          updated_at
+        FROM bot
+        {where}
+        ORDER BY id
+        """
+    )
+    params: Dict[str, Any] = {}
+    if bot_ids is not None:
+        if not bot_ids:
+            return []
+        sql = sql.bindparams(bindparam("bot_ids", expanding=True))
+        params["bot_ids"] = list(bot_ids)
+    result = await db.execute(sql, params)
+    rows = result.mappings().all()
+    return [BotDetailRow(**dict(row)) for row in rows]
+
+
 async def fetch_optimization_sessions(db: AsyncSession, limit: int = 100) -> List[OptimizationSessionRow]:
     sql = text(
         """
@@ -264,9 +296,24 @@ async def fetch_conversations_time_range(
     end_ts: Optional[str] = None,
     limit: int = 500,
     offset: int = 0,
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
 ) -> List[ConversationRow]:
+    """Fetch conversations newest first.
+
+    When `before_created_at`/`before_id` are given (keyset paging), rows strictly
+    after that position in (created_at DESC, id DESC) order are returned and
+    `offset` is ignored; the seek predicate lets the DB walk the created_at index
+    instead of counting past skipped rows.
+    """
+    seek = before_created_at is not None and before_id is not None
+    seek_clause = (
+        "AND (c.created_at < :before_created_at OR (c.created_at = :before_created_at AND c.id < :before_id))"
+        if seek
+        else ""
+    )
     sql = text(
-        """
+        f"""
         SELECT
           c.id,
           c.conversation_id,
@@ -278,12 +325,17 @@ async def fetch_conversations_time_range(
         WHERE (:bot_id IS NULL OR c.bot_id = :bot_id)
           AND (:start_ts IS NULL OR c.created_at >= :start_ts)
           AND (:end_ts IS NULL OR c.created_at < :end_ts)
-        ORDER BY c.created_at DESC
+          {seek_clause}
+        ORDER BY c.created_at DESC, c.id DESC
         LIMIT :limit
-        OFFSET :offset
+        {"" if seek else "OFFSET :offset"}
         """
     )
-    params = {"bot_id": bot_id, "start_ts": start_ts, "end_ts": end_ts, "limit": limit, "offset": offset}
+    params = {"bot_id": bot_id, "start_ts": start_ts, "end_ts": end_ts, "limit": limit}
+    if seek:
+        params.update({"before_created_at": before_created_at, "before_id": before_id})
+    else:
+        params["offset"] = offset
     try:
         result = await db.execute(sql, params)
         rows = result.mappings().all()
@@ -0,0 +1,165 @@
+"""
+Phone search index over legacy call conversations.
+
+Legacy `conversation.customer_phone` is free text ("+84 912-345-678",
+"0912345678", ...) and can only be searched with unindexable LIKE/REPLACE
+expressions. This module keeps a normalized copy in the write DB
+(`conversation_phone_index`) and answers prefix, suffix and infix searches
+against it.
+
+The index is written by the conversation mirror sync, from the same batches
+and in the same transactions, so phones filled in or changed after a
+conversation was first seen are re-indexed (and cleared phones removed). Rows
+past the mirror watermark are not reflected yet; searches against the legacy
+DB fall back to LIKE for those.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, delete, select, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.base import ConversationPhoneIndex
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Max legacy ids a phone search resolves to per listing page window
+PHONE_SEARCH_MAX_IDS = 5000
+
+
+def normalize_phone_number(phone: str) -> str:
+    """Normalize phone number for consistent search.
+    - Remove all non-digit characters
+    - Rewrite the Vietnamese country code to the national 0 prefix
+      ("+84 912-345-678", "84912345678" -> "0912345678")
+    - Partial input is normalized the same way, so "+84912" searches "0912"
+    """
+    if not phone:
+        return phone
+
+    # Remove all non-digit characters
+    normalized = re.sub(r'\D', '', phone)
+
+    # Country code: explicit "+84", or "84" in front of a full-length number
+    if normalized.startswith('84') and (phone.strip().startswith('+') or len(normalized) >= 11):
+        normalized = '0' + normalized[2:]
+
+    return normalized
+
+
+def phone_match_condition(phone_query: str, match: str = "infix"):
+    """SQL condition on ConversationPhoneIndex for a user phone query, or None if it has no digits.
+
+    The query is normalized like the indexed numbers and matched as one pattern,
+    so an infix search finds the same rows as a LIKE on the normalized phone.
+
+    - match: "prefix", "suffix" or "infix" (default)
+    """
+    digits = normalize_phone_number(phone_query or "")
+    if not digits:
+        return None
+
+    p = ConversationPhoneIndex
+    if match == "prefix":
+        return p.phone_digits.like(f"{digits}%")
+    if match == "suffix":
+        return p.phone_digits_rev.like(f"{digits[::-1]}%")
+    return p.phone_digits.like(f"%{digits}%")
+
+
+async def search_phone_index(
+    write_db: AsyncSession,
+    phone_query: str,
+    match: str = "infix",
+    limit: int = PHONE_SEARCH_MAX_IDS,
+    bot_id: Optional[int] = None,
+    cursor_ts: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+) -> Tuple[List[int], Optional[Tuple[datetime, int]]]:
+    """Legacy conversation ids whose phone matches, newest first, past the listing cursor.
+
+    `bot_id` and the [start_ts, end_ts) created_at bounds narrow the match like
+    the listing filters do, so the `limit` window is spent on listable rows.
+
+    Returns (ids, floor): when more than `limit` rows match, `floor` is the
+    (created_at, id) of the last id returned and the listing must stop there;
+    the next page resumes from it as its cursor. `floor` is None when complete.
+    """
+    condition = phone_match_condition(phone_query, match)
+    if condition is None:
+        return [], None
+
+    p = ConversationPhoneIndex
+    query = select(p.legacy_id, p.created_at).where(condition)
+    if bot_id is not None:
+        query = query.where(p.bot_id == bot_id)
+    if start_ts is not None:
+        query = query.where(p.created_at >= start_ts)
+    if end_ts is not None:
+        query = query.where(p.created_at < end_ts)
+    if cursor_ts is not None and cursor_id is not None:
+        query = query.where(or_(p.created_at < cursor_ts, and_(p.created_at == cursor_ts, p.legacy_id < cursor_id)))
+    query = query.order_by(p.created_at.desc(), p.legacy_id.desc()).limit(limit + 1)
+    rows = (await write_db.execute(query)).all()
+    if len(rows) <= limit:
+        return [r.legacy_id for r in rows], None
+    rows = rows[:limit]
+    last = rows[-1]
+    if last.created_at is None:
+        # Rows without created_at sort first in DESC order; no usable floor
+        return [r.legacy_id for r in rows], None
+    return [r.legacy_id for r in rows], (last.created_at, last.legacy_id)
+
+
+def _index_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    values = []
+    for row in rows:
+        phone_raw = (row.get("customer_phone") or "").strip()
+        digits = normalize_phone_number(phone_raw)
+        if not digits:
+            continue
+        values.append(
+            {
+                "legacy_id": row["id"],
+                "conversation_id": row.get("conversation_id"),
+                "bot_id": row.get("bot_id"),
+                "phone_raw": phone_raw[:64],
+                "phone_digits": digits[:32],
+                "phone_digits_rev": digits[::-1][:32],
+                "created_at": row.get("created_at"),
+            }
+        )
+    return values
+
+
+async def upsert_phone_index_rows(write_db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """Upsert legacy conversation rows (id, conversation_id, customer_phone, bot_id, created_at).
+
+    Rows whose phone is now empty are removed from the index.
+    """
+    values = _index_rows(rows)
+    indexed = {v["legacy_id"] for v in values}
+    cleared = [r["id"] for r in rows if r["id"] not in indexed]
+    if cleared:
+        await write_db.execute(delete(ConversationPhoneIndex).where(ConversationPhoneIndex.legacy_id.in_(cleared)))
+    if not values:
+        return 0
+    stmt = pg_insert(ConversationPhoneIndex).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ConversationPhoneIndex.legacy_id],
+        set_={
+            "conversation_id": stmt.excluded.conversation_id,
+            "bot_id": stmt.excluded.bot_id,
+            "phone_raw": stmt.excluded.phone_raw,
+            "phone_digits": stmt.excluded.phone_digits,
+            "phone_digits_rev": stmt.excluded.phone_digits_rev,
+            "created_at": stmt.excluded.created_at,
+            "indexed_at": func.now(),
+        },
+    )
+    await write_db.execute(stmt)
+    return len(values)
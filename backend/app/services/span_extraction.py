@@ -0,0 +1,184 @@
+"""
+Span extraction from legacy `conversation.bot_memory`.
+
+`bot_memory` is a large JSON blob that never changes once a call has ended, so
+spans are parsed once and cached in Redis under (conversation_id, memory hash),
+in the binary cache envelope (`app.core.cache_codec`). This is a data cache
+shared by the spans endpoint, bulk lookups and transcript indexing, not a
+response cache: its keys follow memory content, so entries never go stale.
+Parsing streams over the `messages` array (with ijson when installed), so other
+large keys of the blob are skipped instead of being materialized.
+
+Spans are compact `(turn_idx, role, text)` tuples.
+"""
+
+import hashlib
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache_codec import decode_cache_value, encode_cache_value
+from app.core.redis import get_binary_redis
+from app.core.serialization import json_dumps_bytes, json_loads
+import logging
+
+try:  # optional streaming JSON parser
+    import ijson
+except ImportError:  # pragma: no cover - fallback when ijson is not installed
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+SpanTuple = Tuple[int, str, str]
+
+# Memory of a finished call is immutable; the hash in the key covers edits anyway
+SPAN_CACHE_TTL_SEC = 7 * 24 * 60 * 60
+
+
+def memory_hash(raw_memory: Any) -> Optional[str]:
+    """MD5 hex digest of the stored memory text (matches SQL `MD5(bot_memory)`)."""
+    if raw_memory is None:
+        return None
+    if not isinstance(raw_memory, (str, bytes)):
+        raw_memory = json.dumps(raw_memory, ensure_ascii=False)
+    data = raw_memory.encode("utf-8") if isinstance(raw_memory, str) else raw_memory
+    return hashlib.md5(data).hexdigest()
+
+
+def _span_cache_key(conversation_id: str, mem_hash: str) -> str:
+    return f"spans:{conversation_id}:{mem_hash}"
+
+
+def _decode_spans(value: Optional[bytes]) -> Optional[List[SpanTuple]]:
+    """Spans of a cached value (binary envelope or pre-envelope text); None when unreadable."""
+    try:
+        payload = decode_cache_value(value)
+        return [tuple(s) for s in json_loads(payload)] if payload else None
+    except Exception as e:
+        logger.warning(f"Unreadable span cache entry: {e}")
+        return None
+
+
+def _iter_messages(raw_memory: Any) -> Iterator[Any]:
+    if isinstance(raw_memory, dict):
+        yield from raw_memory.get("messages", []) or []
+        return
+    if isinstance(raw_memory, str):
+        raw_memory = raw_memory.encode("utf-8")
+    if ijson is not None:
+        yield from ijson.items(io.BytesIO(raw_memory), "messages.item", use_float=True)
+        return
+    memory_obj = json.loads(raw_memory)
+    if isinstance(memory_obj, dict):
+        yield from memory_obj.get("messages", []) or []
+
+
+def iter_message_spans(raw_memory: Any) -> Iterator[SpanTuple]:
+    """Yield (turn_idx, role, text) for each message with a role and content.
+
+    turn_idx is the message position in `messages`, so skipped entries leave gaps.
+    Raises on malformed JSON.
+    """
+    if not raw_memory:
+        return
+    for idx, msg in enumerate(_iter_messages(raw_memory)):
+        role = msg.get("role") if isinstance(msg, dict) else None
+        content = msg.get("content") if isinstance(msg, dict) else None
+        if not role or content is None:
+            continue
+        yield idx, str(role), str(content)
+
+
+async def get_cached_spans(conversation_id: str, mem_hash: Optional[str]) -> Optional[List[SpanTuple]]:
+    if not mem_hash:
+        return None
+    try:
+        redis = await get_binary_redis()
+        return _decode_spans(await redis.get(_span_cache_key(conversation_id, mem_hash)))
+    except Exception as e:
+        logger.warning(f"Span cache read failed for {conversation_id}: {e}")
+    return None
+
+
+async def get_cached_spans_many(keys: List[Tuple[str, Optional[str]]]) -> Dict[str, List[SpanTuple]]:
+    """Cached spans for many (conversation_id, memory hash) pairs in one MGET."""
+    keyed = [(cid, h) for cid, h in keys if h]
+    if not keyed:
+        return {}
+    try:
+        redis = await get_binary_redis()
+        values = await redis.mget([_span_cache_key(cid, h) for cid, h in keyed])
+    except Exception as e:
+        logger.warning(f"Span cache bulk read failed: {e}")
+        return {}
+    spans = {}
+    for (cid, _), value in zip(keyed, values):
+        decoded = _decode_spans(value) if value else None
+        if decoded is not None:
+            spans[cid] = decoded
+    return spans
+
+
+async def extract_spans(
+    conversation_id: str,
+    raw_memory: Any,
+    mem_hash: Optional[str] = None,
+) -> List[SpanTuple]:
+    """Spans for a memory blob, from cache when possible; malformed memory yields []."""
+    mem_hash = mem_hash or memory_hash(raw_memory)
+    cached = await get_cached_spans(conversation_id, mem_hash)
+    if cached is not None:
+        return cached
+    try:
+        spans = list(iter_message_spans(raw_memory))
+    except Exception as e:
+        logger.warning(f"Malformed bot_memory for {conversation_id}: {e}")
+        return []
+    if mem_hash:
+        try:
+            redis = await get_binary_redis()
+            await redis.setex(
+                _span_cache_key(conversation_id, mem_hash),
+                SPAN_CACHE_TTL_SEC,
+                encode_cache_value(json_dumps_bytes(spans)),
+            )
+        except Exception as e:
+            logger.warning(f"Span cache write failed for {conversation_id}: {e}")
+    return spans
+
+
+async def load_conversation_spans(
+    read_db: AsyncSession,
+    conversation_id: str,
+) -> Optional[Tuple[Optional[datetime], List[SpanTuple]]]:
+    """(created_at, spans) for a legacy conversation, or None if it does not exist.
+
+    Only the memory hash is read first; the blob itself is fetched on a cache miss.
+    """
+    head_sql = text(
+        """
+        SELECT id, created_at, MD5(bot_memory) AS memory_hash
+        FROM conversation
+        WHERE conversation_id = :cid
+        LIMIT 1
+        """
+    )
+    result = await read_db.execute(head_sql, {"cid": conversation_id})
+    head = result.mappings().first()
+    if not head:
+        return None
+    created_at = head["created_at"]
+    if not head["memory_hash"]:
+        return created_at, []
+
+    cached = await get_cached_spans(conversation_id, head["memory_hash"])
+    if cached is not None:
+        return created_at, cached
+
+    memory_sql = text("SELECT bot_memory FROM conversation WHERE id = :id")
+    result = await read_db.execute(memory_sql, {"id": head["id"]})
+    raw_memory = result.scalar_one_or_none()
+    return created_at, await extract_spans(conversation_id, raw_memory, head["memory_hash"])
+
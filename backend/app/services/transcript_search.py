@@ -0,0 +1,178 @@
+"""
+Full-text search over call transcripts.
+
+Every turn of `bot_memory.messages` is stored in `conversation_transcript_index`
+with a `to_tsvector('simple', unaccent(text))` vector, so Vietnamese text
+matches with or without diacritics ("gia ve" finds "giá vé"). The 'simple'
+configuration is used because Postgres ships no Vietnamese stemmer.
+
+Rows are (re)built per conversation whenever its memory hash changes: by the
+conversation mirror sync for each batch of calls it copies, and by QA runs for
+evaluated ones.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import bindparam, delete, func, insert, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.base import ConversationTranscriptIndex
+from app.services.span_extraction import SpanTuple, get_cached_spans_many, iter_message_spans
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Memory blobs are large; read them from the legacy DB in small groups
+_MEMORY_READ_CHUNK = 100
+
+# Rows per INSERT, well under the Postgres bind parameter limit
+_INSERT_CHUNK = 500
+
+_TS_CONFIG = literal_column("'simple'::regconfig")
+# 'simple' behind the unaccent dictionary: headlines the original text, diacritics kept,
+# while matching words against the accent-folded query
+_HEADLINE_TS_CONFIG = literal_column("'simple_unaccent'::regconfig")
+
+_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=8, MaxFragments=2"
+
+_MEMORY_SQL = text(
+    "SELECT conversation_id, bot_memory FROM conversation WHERE id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+
+def _search_vector(value):
+    return func.to_tsvector(_TS_CONFIG, func.unaccent(value))
+
+
+def _search_query(q: str):
+    """websearch syntax: quoted phrases, OR, -exclusions."""
+    return func.websearch_to_tsquery(_TS_CONFIG, func.unaccent(q))
+
+
+async def _indexed_hashes(write_db: AsyncSession, conversation_ids: List[str]) -> Dict[str, Optional[str]]:
+    t = ConversationTranscriptIndex
+    result = await write_db.execute(
+        select(t.conversation_id, func.max(t.memory_hash))
+        .where(t.conversation_id.in_(conversation_ids))
+        .group_by(t.conversation_id)
+    )
+    return {cid: mem_hash for cid, mem_hash in result.all()}
+
+
+async def index_transcripts(write_db: AsyncSession, conversations: Iterable[Dict[str, Any]]) -> int:
+    """Replace the indexed turns of each conversation whose memory hash changed.
+
+    Each item carries `conversation_id`, `spans` and optionally `id` (legacy id),
+    `bot_id`, `created_at` and `memory_hash`. Returns the number of turns written;
+    the caller commits.
+    """
+    by_cid = {c["conversation_id"]: c for c in conversations if c.get("conversation_id")}
+    if not by_cid:
+        return 0
+    indexed = await _indexed_hashes(write_db, list(by_cid))
+    changed = [
+        c for cid, c in by_cid.items()
+        if not (c.get("memory_hash") and indexed.get(cid) == c["memory_hash"])
+    ]
+    if not changed:
+        return 0
+
+    t = ConversationTranscriptIndex
+    await write_db.execute(delete(t).where(t.conversation_id.in_([c["conversation_id"] for c in changed])))
+    values = []
+    for c in changed:
+        for turn_idx, role, span_text in c.get("spans") or []:
+            span_text = span_text.replace("\x00", "")
+            if not span_text.strip():
+                continue
+            values.append(
+                {
+                    "conversation_id": c["conversation_id"],
+                    "turn_idx": turn_idx,
+                    "legacy_id": c.get("id"),
+                    "bot_id": c.get("bot_id"),
+                    "role": role[:32],
+                    "text": span_text,
+                    "tsv": _search_vector(span_text),
+                    "memory_hash": c.get("memory_hash"),
+                    "created_at": c.get("created_at"),
+                }
+            )
+    for i in range(0, len(values), _INSERT_CHUNK):
+        await write_db.execute(insert(t).values(values[i:i + _INSERT_CHUNK]))
+    return len(values)
+
+
+async def index_source_rows(read_db: AsyncSession, write_db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Index one batch of legacy rows (`id`, `conversation_id`, `bot_id`, `created_at`, `memory_hash`).
+
+    Memory blobs are only read for conversations whose hash changed; the caller commits.
+    """
+    rows = [r for r in rows if r.get("conversation_id") and r.get("memory_hash")]
+    if not rows:
+        return
+    indexed = await _indexed_hashes(write_db, [r["conversation_id"] for r in rows])
+    rows = [r for r in rows if indexed.get(r["conversation_id"]) != r["memory_hash"]]
+    if not rows:
+        return
+
+    spans: Dict[str, List[SpanTuple]] = await get_cached_spans_many(
+        [(r["conversation_id"], r["memory_hash"]) for r in rows]
+    )
+    cold = [r["id"] for r in rows if r["conversation_id"] not in spans]
+    for i in range(0, len(cold), _MEMORY_READ_CHUNK):
+        result = await read_db.execute(_MEMORY_SQL, {"ids": cold[i:i + _MEMORY_READ_CHUNK]})
+        for row in result.mappings().all():
+            try:
+                spans[row["conversation_id"]] = list(iter_message_spans(row["bot_memory"]))
+            except Exception as e:
+                logger.warning(f"Malformed bot_memory for {row['conversation_id']}: {e}")
+    await index_transcripts(
+        write_db, [{**r, "spans": spans[r["conversation_id"]]} for r in rows if r["conversation_id"] in spans]
+    )
+
+
+async def search_transcripts(
+    write_db: AsyncSession,
+    q: str,
+    bot_id: Optional[int] = None,
+    role: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """Turns matching `q`, best match first, with `<mark>`-highlighted fragments.
+
+    Ranking and LIMIT run in a subquery so `ts_headline` only processes the returned
+    rows. Highlights keep the original diacritics; folded matches are marked too.
+    """
+    t = ConversationTranscriptIndex
+    query = _search_query(q)
+    rank = func.ts_rank_cd(t.tsv, query)
+    ranked = (
+        select(
+            t.conversation_id,
+            t.turn_idx,
+            t.role,
+            t.text,
+            t.bot_id,
+            t.created_at,
+            rank.label("rank"),
+        )
+        .where(t.tsv.op("@@")(query))
+    )
+    if bot_id is not None:
+        ranked = ranked.where(t.bot_id == bot_id)
+    if role:
+        ranked = ranked.where(t.role == role)
+    ranked = (
+        ranked.order_by(rank.desc(), t.created_at.desc().nulls_last(), t.conversation_id, t.turn_idx)
+        .limit(limit)
+        .offset(offset)
+        .subquery("ranked")
+    )
+    stmt = select(
+        *ranked.c,
+        func.ts_headline(_HEADLINE_TS_CONFIG, ranked.c.text, query, _HEADLINE_OPTIONS).label("highlight"),
+    ).order_by(
+        ranked.c.rank.desc(), ranked.c.created_at.desc().nulls_last(), ranked.c.conversation_id, ranked.c.turn_idx
+    )
+    result = await write_db.execute(stmt)
+    return [dict(r) for r in result.mappings().all()]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Encode a (created_at, id) seek position as an opaque url-safe token."""
+    raw = json.dumps([created_at.isoformat(), row_id if isinstance(row_id, int) else str(row_id)])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """Decode a token produced by `encode_cursor` back to (created_at, id).
+
+    Raises InvalidCursorError for anything that was not produced by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_str, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at_str), row_id
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
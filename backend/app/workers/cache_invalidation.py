@@ -0,0 +1,61 @@
+"""
+Per-worker near-cache maintenance.
+
+Runs inside every API worker (started from the FastAPI lifespan): applies
+invalidations published on CACHE_INVALIDATION_CHANNEL to this worker's
+near-cache and flushes buffered cache hit/miss counters to Redis.
+"""
+
+import asyncio
+import logging
+import time
+from app.core.cache import flush_cache_stats
+from app.core.config import settings
+from app.core.near_cache import CACHE_INVALIDATION_CHANNEL, near_cache
+from app.core.redis import get_redis
+from app.core.serialization import json_loads
+
+logger = logging.getLogger(__name__)
+
+# Reconnect delay after the subscription fails
+_RETRY_SEC = 1
+
+
+async def _listen() -> None:
+    redis = await get_redis()
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+        # Invalidations published while unsubscribed are lost: start empty
+        near_cache.clear()
+        near_cache.active = True
+        next_flush = time.monotonic() + settings.CACHE_STATS_FLUSH_SEC
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message and message["type"] == "message":
+                near_cache.invalidate(json_loads(message["data"]))
+            if time.monotonic() >= next_flush:
+                await flush_cache_stats()
+                next_flush = time.monotonic() + settings.CACHE_STATS_FLUSH_SEC
+    finally:
+        near_cache.active = False
+        near_cache.clear()
+        await pubsub.aclose()
+
+
+async def invalidation_loop() -> None:
+    """Keep the near-cache subscribed forever; cancelled on application shutdown."""
+    try:
+        while True:
+            try:
+                await _listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Near-cache invalidation listener failed: {e}")
+            await asyncio.sleep(_RETRY_SEC)
+    finally:
+        try:
+            await flush_cache_stats()
+        except Exception as e:
+            logger.warning(f"Cache stats flush failed: {e}")
@@ -0,0 +1,60 @@
+"""
+Background sync from the legacy read DB into write-DB mirror and search tables.
+
+Runs inside the API process (started from the FastAPI lifespan). A Redis lock
+makes sure only one API worker polls the legacy DB at a time.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Dict
+from app.core.config import settings
+from app.core.db import async_session, async_read_session
+from app.core.redis import get_redis
+from app.services.conversation_cache import invalidate_stats_for_conversations
+from app.services.conversation_mirror import sync_bot_mirror, sync_conversation_mirror
+
+logger = logging.getLogger(__name__)
+
+SYNC_LOCK_KEY = "lock:legacy_sync"
+
+
+async def run_sync_once() -> Dict[str, int]:
+    """Run one incremental pass of every legacy sync job.
+
+    The conversation sync also maintains the phone and transcript indexes.
+    """
+    batch_size = settings.LEGACY_SYNC_BATCH_SIZE
+    async with async_read_session() as read_db, async_session() as write_db:
+        bot_rows = await sync_bot_mirror(read_db, write_db, batch_size=batch_size)
+        conversation_rows = await sync_conversation_mirror(read_db, write_db, batch_size=batch_size)
+    if conversation_rows:
+        await invalidate_stats_for_conversations(conversation_rows)
+    return {"bots": len(bot_rows), "conversations": len(conversation_rows)}
+
+
+async def _acquire_lock(token: str) -> bool:
+    redis = await get_redis()
+    ttl = max(settings.LEGACY_SYNC_INTERVAL_SEC * 4, 60)
+    if await redis.set(SYNC_LOCK_KEY, token, nx=True, ex=ttl):
+        return True
+    # Refresh our own lock so the leader keeps polling
+    if await redis.get(SYNC_LOCK_KEY) == token:
+        await redis.expire(SYNC_LOCK_KEY, ttl)
+        return True
+    return False
+
+
+async def sync_loop() -> None:
+    """Poll the legacy DB forever; cancelled on application shutdown."""
+    token = uuid.uuid4().hex
+    while True:
+        try:
+            if await _acquire_lock(token):
+                await run_sync_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Legacy sync pass failed: {e}")
+        await asyncio.sleep(settings.LEGACY_SYNC_INTERVAL_SEC)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily QA rollups (`evaluation_daily_rollups`) from `evaluations`.
+
+Run once after the rollup migration, or whenever the rollups are suspected
+to have drifted. Safe while the API is running: evaluation writes wait for
+the rebuild and apply their deltas afterwards.
+"""
+
+import asyncio
+import sys
+from app.core.db import async_session
+from app.services.evaluation_rollup import rebuild_rollups
+
+
+async def backfill_evaluation_rollups():
+    async with async_session() as db:
+        print("Rebuilding evaluation rollups...")
+        rows = await rebuild_rollups(db)
+        print(f"✓ Rebuilt {rows} (bot_index, day) rollup rows")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(backfill_evaluation_rollups())
+    except Exception as e:
+        print(f"✗ Backfill failed: {e}")
+        sys.exit(1)
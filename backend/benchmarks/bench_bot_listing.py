@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark `list_bots` latency: cold (DB query on every call) vs warm cache.
+
+- cold: the `bots:list` generation is bumped before each call, so every call
+  misses and runs the DB query plus the cache write (the old behaviour, minus
+  its extra read-back)
+- warm redis: served from the Redis response cache, near-cache disabled
+- warm near: served from this process's near-cache
+
+Needs DATABASE_URL and REDIS_URL. Usage (from backend/):
+    python -m benchmarks.bench_bot_listing --limit 100 --repeat 200
+"""
+
+import argparse
+import asyncio
+import time
+from app.api.v1.bots import list_bots
+from app.core.cache import bump_generation
+from app.core.db import async_session
+from app.core.near_cache import near_cache
+
+
+async def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def bench(limit: int, repeat: int):
+    async with async_session() as db:
+        async def call():
+            return await list_bots(request=None, limit=limit, db=db)
+
+        async def cold():
+            await bump_generation("bots:list")
+            started = time.perf_counter()
+            await call()
+            return time.perf_counter() - started
+
+        near_cache.active = False
+        samples = sorted([await cold() * 1000 for _ in range(repeat)])
+        print(f"  {'cold':<12} median={samples[len(samples) // 2]:8.3f} ms")
+
+        await call()
+        print(f"  {'warm redis':<12} median={await _median_ms(call, repeat):8.3f} ms")
+
+        # No invalidation listener here; nothing writes bots while this runs
+        near_cache.clear()
+        near_cache.active = True
+        await call()
+        print(f"  {'warm near':<12} median={await _median_ms(call, repeat):8.3f} ms")
+        near_cache.active = False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(f"limit={args.limit} repeat={args.repeat}")
+    asyncio.run(bench(args.limit, args.repeat))
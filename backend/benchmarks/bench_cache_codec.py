@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark Redis cache value encodings for evaluation responses.
+
+Compares the old text entries (stdlib `json.dumps` string, as `eval:list:*`
+and `eval:by_id:*` used to be stored) with the binary envelope of
+`app.core.cache_codec` (orjson body, zstd or zlib above the threshold):
+stored bytes, encode time and decode time. Stored bytes are what Redis keeps
+per value, plus a few dozen bytes of key/object overhead.
+
+With `--redis-url`, each encoding is also written to that Redis under
+`bench:codec:*` keys (deleted afterwards) to report `MEMORY USAGE` per key and
+the `used_memory` growth from `INFO memory` for `--entries` copies.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cache_codec --rows 50 --turns 40
+    python -m benchmarks.bench_cache_codec --redis-url redis://localhost:6379/15 --entries 200
+"""
+
+import argparse
+import json
+import time
+import redis
+from app.core.cache_codec import decode_cache_value, encode_cache_value, zstandard
+from app.core.serialization import json_dumps_bytes, json_loads
+from benchmarks.bench_evaluation_payload import _row
+
+
+def _timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], out
+
+
+def _redis_footprint(client, name: str, value: bytes, entries: int) -> str:
+    prefix = f"bench:codec:{name}"
+    keys = [f"{prefix}:{i}" for i in range(entries)]
+    client.delete(*keys)
+    before = client.info("memory")["used_memory"]
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.set(key, value)
+    pipe.execute()
+    per_key = client.memory_usage(keys[0], samples=0)
+    grown = client.info("memory")["used_memory"] - before
+    client.delete(*keys)
+    return f"MEMORY USAGE={per_key / 1024:9.1f} KiB  used_memory +{grown / 1024 / 1024:7.1f} MiB for {entries} keys"
+
+
+def bench(rows: int, turns: int, repeat: int, client=None, entries: int = 0):
+    pages = {"eval:by_id (1 row)": _row(turns), f"eval:list ({rows} rows)": [_row(turns) for _ in range(rows)]}
+    codec = "zstd" if zstandard is not None else "zlib (zstandard not installed)"
+    print(f"turns={turns} repeat={repeat} codec={codec}")
+    if client is not None:
+        print(f"redis {client.info('server')['redis_version']}")
+    for name, content in pages.items():
+        print(f"  {name}")
+        enc_ms, text_value = _timed(lambda: json.dumps(content).encode("utf-8"), repeat)
+        dec_ms, _ = _timed(lambda: json.loads(text_value), repeat)
+        print(f"    {'text json':<16} size={len(text_value) / 1024:9.1f} KiB  encode={enc_ms:7.2f} ms  decode={dec_ms:7.2f} ms")
+        enc_ms, value = _timed(lambda: encode_cache_value(json_dumps_bytes(content)), repeat)
+        dec_ms, _ = _timed(lambda: json_loads(decode_cache_value(value)), repeat)
+        print(f"    {'binary envelope':<16} size={len(value) / 1024:9.1f} KiB  encode={enc_ms:7.2f} ms  decode={dec_ms:7.2f} ms"
+              f"  ({len(text_value) / len(value):.1f}x smaller)")
+        if client is not None:
+            key_name = name.split()[0]
+            print(f"    {'text json':<16} {_redis_footprint(client, f'text:{key_name}', text_value, entries)}")
+            print(f"    {'binary envelope':<16} {_redis_footprint(client, f'binary:{key_name}', value, entries)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--redis-url", help="Also measure memory in this Redis (use a scratch DB)")
+    parser.add_argument("--entries", type=int, default=200, help="Keys written per encoding with --redis-url")
+    args = parser.parse_args()
+    client = redis.Redis.from_url(args.redis_url) if args.redis_url else None
+    bench(args.rows, args.turns, args.repeat, client, args.entries)
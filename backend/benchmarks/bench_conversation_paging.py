@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark OFFSET vs keyset (cursor) paging on the legacy conversation table.
+
+Usage (from backend/):
+    python -m benchmarks.bench_conversation_paging --page-size 50 --deep-page 500
+"""
+
+import argparse
+import asyncio
+import time
+from app.core.db import async_read_session
+from app.services.legacy_queries import fetch_conversations_time_range
+
+
+async def _timed(coro):
+    started = time.perf_counter()
+    rows = await coro
+    return (time.perf_counter() - started) * 1000, rows
+
+
+async def bench(page_size: int, deep_page: int, repeat: int):
+    async with async_read_session() as db:
+        # Walk to the deep page once with cursors to obtain its seek position
+        before_created_at = before_id = None
+        for _ in range(deep_page - 1):
+            rows = await fetch_conversations_time_range(
+                db, limit=page_size, before_created_at=before_created_at, before_id=before_id
+            )
+            if len(rows) < page_size:
+                print(f"Table has fewer than {deep_page} pages of {page_size} rows; stopping early")
+                return
+            before_created_at, before_id = rows[-1].created_at, rows[-1].id
+
+        results = {"offset page 1": [], f"offset page {deep_page}": [], "cursor page 1": [], f"cursor page {deep_page}": []}
+        for _ in range(repeat):
+            ms, _ = await _timed(fetch_conversations_time_range(db, limit=page_size, offset=0))
+            results["offset page 1"].append(ms)
+            ms, _ = await _timed(fetch_conversations_time_range(db, limit=page_size, offset=(deep_page - 1) * page_size))
+            results[f"offset page {deep_page}"].append(ms)
+            ms, _ = await _timed(fetch_conversations_time_range(db, limit=page_size))
+            results["cursor page 1"].append(ms)
+            ms, _ = await _timed(
+                fetch_conversations_time_range(
+                    db, limit=page_size, before_created_at=before_created_at, before_id=before_id
+                )
+            )
+            results[f"cursor page {deep_page}"].append(ms)
+
+    print(f"page_size={page_size} repeat={repeat}")
+    for name, samples in results.items():
+        samples.sort()
+        print(f"  {name:<22} median={samples[len(samples) // 2]:8.2f} ms  min={samples[0]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--deep-page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(bench(args.page_size, args.deep_page, args.repeat))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark full vs summary evaluation listing at the maximum page size.
+
+Compares DB time (query plus memory loading), encode time and response size
+of `list_evaluations` (ORM rows with `memory`) against
+`list_evaluation_summaries` (Core select of `evaluation_result->'summary'`).
+
+Usage (from backend/):
+    python -m benchmarks.bench_evaluation_listing --limit 200
+"""
+
+import argparse
+import asyncio
+import time
+from sqlalchemy import select
+from app.api.v1.evaluations import EvaluationResponse, EvaluationSummaryResponse, evaluation_summary_query
+from app.core.db import async_session
+from app.core.serialization import json_dumps_bytes
+from app.models.base import Evaluation
+from app.services.evaluation_memory import load_evaluation_memories
+
+
+async def _fetch_full(db, limit: int):
+    result = await db.execute(select(Evaluation).order_by(Evaluation.created_at.desc()).limit(limit))
+    rows = result.scalars().all()
+    return rows, await load_evaluation_memories(db, rows)
+
+
+def _encode_full(fetched) -> bytes:
+    rows, memories = fetched
+    return json_dumps_bytes([
+        EvaluationResponse(
+            id=str(row.id),
+            conversation_id=row.conversation_id,
+            memory=memories[row.id] or {},
+            evaluation_result=row.evaluation_result or {},
+            reviewed=bool(row.reviewed),
+            review_note=row.review_note,
+        ).dict()
+        for row in rows
+    ])
+
+
+async def _fetch_summary(db, limit: int):
+    result = await db.execute(evaluation_summary_query(limit))
+    return result.all()
+
+
+def _encode_summary(rows) -> bytes:
+    return json_dumps_bytes([
+        EvaluationSummaryResponse(
+            id=str(row.id),
+            conversation_id=row.conversation_id,
+            summary=row.summary or {},
+            reviewed=bool(row.reviewed),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        ).dict()
+        for row in rows
+    ])
+
+
+def _median(samples):
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def bench(limit: int, repeat: int):
+    async with async_session() as db:
+        for name, fetch, encode in (("full", _fetch_full, _encode_full), ("summary", _fetch_summary, _encode_summary)):
+            db_ms, encode_ms, size = [], [], 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fetched = await fetch(db, limit)
+                fetched_at = time.perf_counter()
+                body = encode(fetched)
+                db_ms.append((fetched_at - started) * 1000)
+                encode_ms.append((time.perf_counter() - fetched_at) * 1000)
+                size = len(body)
+                db.expunge_all()
+            print(f"  {name:<8} db={_median(db_ms):8.2f} ms  encode={_median(encode_ms):8.2f} ms"
+                  f"  size={size / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"limit={args.limit} repeat={args.repeat}")
+    asyncio.run(bench(args.limit, args.repeat))
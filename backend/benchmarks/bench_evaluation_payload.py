@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark serialization and compression of a full `list_evaluations` page.
+
+Builds synthetic evaluation rows (memory transcript + evaluation_result) and
+compares stdlib json vs orjson, through the Pydantic response model as the
+endpoint does, plus gzip/brotli sizes of the resulting body.
+
+Usage (from backend/):
+    python -m benchmarks.bench_evaluation_payload --rows 200 --turns 40
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+import uuid
+from app.api.v1.evaluations import EvaluationResponse
+from app.core.serialization import json_dumps_bytes
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+_USER_LINES = [
+    "Cho mình hỏi giá vé chuyến {a} - {b} ngày {d}/{m} với ạ",
+    "Mình đi {n} người lớn và {k} trẻ em, có ghế cạnh cửa sổ không?",
+    "Số điện thoại của mình là 09{p}, bạn gọi lại giúp mình nhé",
+    "Nếu đổi sang chuyến chiều thì có mất phí không bạn?",
+    "Thanh toán qua chuyển khoản được không, mình không có thẻ",
+]
+_BOT_LINES = [
+    "Dạ, giá vé chuyến {a} - {b} ngày {d}/{m} là {price}.000đ, anh/chị muốn đặt mấy vé ạ?",
+    "Dạ chuyến {h}h{mm} còn {k} ghế cạnh cửa sổ, em giữ chỗ cho anh/chị nhé.",
+    "Dạ phí đổi chuyến là {fee}.000đ/vé nếu đổi trước giờ khởi hành {n} tiếng ạ.",
+    "Dạ anh/chị có thể chuyển khoản tới tài khoản của nhà xe, nội dung ghi mã đặt chỗ {code} ạ.",
+    "Dạ em đã ghi nhận số 09{p}, tổng đài viên sẽ liên hệ trong {n} phút ạ.",
+]
+_CITIES = ["Hà Nội", "Đà Nẵng", "Huế", "Vinh", "Hải Phòng", "Sài Gòn", "Nha Trang", "Đà Lạt"]
+
+
+def _line(rng: random.Random, templates: list) -> str:
+    a, b = rng.sample(_CITIES, 2)
+    return rng.choice(templates).format(
+        a=a, b=b, d=rng.randint(1, 28), m=rng.randint(1, 12), n=rng.randint(1, 6), k=rng.randint(0, 4),
+        p=rng.randint(10_000_000, 99_999_999), price=rng.randint(150, 1500), fee=rng.randint(20, 200),
+        h=rng.randint(5, 22), mm=rng.choice(["00", "15", "30", "45"]), code=uuid.uuid4().hex[:8].upper(),
+    )
+
+
+def _row(turns: int) -> dict:
+    # Varied turns, so compression ratios are not inflated by one repeated line
+    rng = random.Random()
+    messages = [
+        {
+            "role": "assistant" if i % 2 else "user",
+            "content": " ".join(_line(rng, _BOT_LINES if i % 2 else _USER_LINES) for _ in range(2)),
+        }
+        for i in range(turns)
+    ]
+    return {
+        "id": str(uuid.uuid4()),
+        "conversation_id": uuid.uuid4().hex,
+        "memory": {"messages": messages, "slots": {"route": "HAN-DAD", "date": "2026-10-20"}},
+        "evaluation_result": {
+            "summary": {
+                "overall": "average",
+                "counts": {"repetition": 1, "ask_after_known": 0, "missing_required": 1,
+                           "policy_violation": 0, "kb_mismatch": 1, "tone_issue": 0},
+            },
+            "errors": [{"type": "kb_mismatch", "turn": 3, "evidence": messages[3]["content"][:80]}] * 3,
+            "handoff": {"needed": False},
+            "stats": {"turns": turns},
+        },
+        "reviewed": False,
+        "review_note": None,
+    }
+
+
+def _timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], out
+
+
+def bench(rows: int, turns: int, repeat: int):
+    data = [_row(turns) for _ in range(rows)]
+    models = [EvaluationResponse(**x) for x in data]
+
+    cases = {
+        "stdlib json (model.dict)": lambda: json.dumps([m.dict() for m in models]).encode("utf-8"),
+        "orjson (model.dict)": lambda: json_dumps_bytes([m.dict() for m in models]),
+        "stdlib json (cached dicts)": lambda: json.dumps(data).encode("utf-8"),
+        "orjson (cached dicts)": lambda: json_dumps_bytes(data),
+    }
+    print(f"rows={rows} turns={turns} repeat={repeat}")
+    body = b""
+    for name, fn in cases.items():
+        ms, body_out = _timed(fn, repeat)
+        body = body_out
+        print(f"  {name:<28} median={ms:8.2f} ms  size={len(body_out) / 1024:9.1f} KiB")
+
+    ms, gz = _timed(lambda: gzip.compress(body, compresslevel=9), repeat)
+    print(f"  {'gzip -9':<28} median={ms:8.2f} ms  size={len(gz) / 1024:9.1f} KiB")
+    if brotli is not None:
+        ms, br = _timed(lambda: brotli.compress(body, quality=4), repeat)
+        print(f"  {'brotli q4':<28} median={ms:8.2f} ms  size={len(br) / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+    bench(args.rows, args.turns, args.repeat)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Export evaluations to NDJSON, CSV or Parquet for offline analysis.
+
+Streams from a server-side cursor, so memory use does not grow with the
+number of rows. Same filters and columns as GET /evaluations/export.
+
+    python export_evaluations.py --format parquet --output evals.parquet \\
+        --columns id,conversation_id,created_at,summary --bot-index 12
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from app.core.db import async_session
+from app.models.base import EVALUATION_ERROR_TYPES
+from app.services.evaluation_export import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    export_evaluations,
+    parse_export_columns,
+)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Export evaluations")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--output", help="Output file (default: stdout, except for parquet)")
+    parser.add_argument("--columns", help=f"Comma-separated columns from: {', '.join(EXPORT_COLUMNS)}")
+    parser.add_argument("--overall", choices=("good", "average", "poor"))
+    parser.add_argument("--error-type", choices=EVALUATION_ERROR_TYPES)
+    parser.add_argument("--bot-index", type=int)
+    reviewed = parser.add_mutually_exclusive_group()
+    reviewed.add_argument("--reviewed", action="store_true", default=None)
+    reviewed.add_argument("--unreviewed", dest="reviewed", action="store_false")
+    parser.add_argument("--created-from", type=datetime.fromisoformat, help="created_at >= (ISO 8601)")
+    parser.add_argument("--created-to", type=datetime.fromisoformat, help="created_at < (ISO 8601)")
+    args = parser.parse_args()
+    if args.format == "parquet" and not args.output:
+        parser.error("--output is required for parquet")
+    return args
+
+
+async def export(args):
+    columns = parse_export_columns(args.columns)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async with async_session() as db:
+            chunks = export_evaluations(
+                db,
+                args.format,
+                columns,
+                overall=args.overall,
+                error_type=args.error_type,
+                bot_index=args.bot_index,
+                reviewed=args.reviewed,
+                created_from=args.created_from,
+                created_to=args.created_to,
+            )
+            async for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"✓ Wrote {written} bytes to {args.output}")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(export(_parse_args()))
+    except Exception as e:
+        print(f"✗ Export failed: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,47 @@
+"""
+Shared test setup.
+
+Database tests run against the Postgres in TEST_DATABASE_URL (an async URL,
+e.g. postgresql+asyncpg://postgres@localhost/qa_test) and are skipped when it
+is not set. The tables they use are dropped and recreated for every test.
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("DATABASE_URL", os.environ.get("TEST_DATABASE_URL", "postgresql+asyncpg://localhost/qa_test"))
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/15")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("GOOGLE_SHEET_CREDENTIALS_PATH", "/dev/null")
+os.environ.setdefault("GOOGLE_SHEET_SPREADSHEET_ID", "test")
+os.environ.setdefault("DEBUG", "false")
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.models.base import Base, Evaluation, EvaluationDailyRollup, EvaluationMemory
+
+_TABLES = [Evaluation.__table__, EvaluationMemory.__table__, EvaluationDailyRollup.__table__]
+
+
+@pytest.fixture
+def run_db():
+    """Run `test(session)` on a fresh session against empty tables."""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    def run(test):
+        async def main():
+            engine = create_async_engine(url)
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(lambda c: Base.metadata.drop_all(c, tables=_TABLES))
+                    await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=_TABLES))
+                async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+                    return await test(session)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.services import evaluated_ids
+from app.services.evaluated_ids import QA_SCAN_MAX_ROWS, scan_by_qa_status
+
+_START = datetime(2026, 1, 1)
+# One evaluated conversation per MATCH_EVERY rows: sparser than the scan cap
+MATCH_EVERY = QA_SCAN_MAX_ROWS // 2 + 1
+TOTAL_ROWS = MATCH_EVERY * 6
+
+
+def _rows():
+    # Listing order: newest first, keyed by (created_at, id)
+    return [
+        {"id": i, "conversation_id": f"c{i}", "created_at": _START - timedelta(seconds=i)}
+        for i in range(TOTAL_ROWS)
+    ]
+
+
+def _fetcher(rows):
+    async def fetch(batch_limit, after):
+        start = 0 if after is None else next(i for i, r in enumerate(rows) if r["id"] == after[1]) + 1
+        return rows[start:start + batch_limit]
+
+    return fetch
+
+
+async def _flags(write_db, conversation_ids):
+    return [int(cid[1:]) % MATCH_EVERY == 0 for cid in conversation_ids]
+
+
+def test_offset_scan_fills_the_page_past_the_cap(monkeypatch):
+    monkeypatch.setattr(evaluated_ids, "evaluated_flags", _flags)
+    rows, resume_at = asyncio.run(scan_by_qa_status(None, _fetcher(_rows()), "qa", limit=3, offset=2, max_rows=None))
+    assert [r["id"] for r in rows] == [2 * MATCH_EVERY, 3 * MATCH_EVERY, 4 * MATCH_EVERY]
+    assert resume_at is None
+
+
+def test_capped_scan_returns_where_to_resume(monkeypatch):
+    monkeypatch.setattr(evaluated_ids, "evaluated_flags", _flags)
+    source = _rows()
+    found, after = [], None
+    while True:
+        rows, after = asyncio.run(scan_by_qa_status(None, _fetcher(source), "qa", limit=4, after=after))
+        found.extend(r["id"] for r in rows)
+        if after is None or len(found) >= 4:
+            break
+        assert len(rows) < 4
+    assert found == [0, MATCH_EVERY, 2 * MATCH_EVERY, 3 * MATCH_EVERY]
+
+
+def test_notqa_scan_skips_evaluated_rows(monkeypatch):
+    monkeypatch.setattr(evaluated_ids, "evaluated_flags", _flags)
+    rows, resume_at = asyncio.run(scan_by_qa_status(None, _fetcher(_rows()), "notqa", limit=3, max_rows=None))
+    assert [r["id"] for r in rows] == [1, 2, 3]
+    assert resume_at is None
@@ -0,0 +1,60 @@
+from uuid import uuid4
+from sqlalchemy import select
+from app.api.v1.evaluations import EvaluationReviewBulkRequest, update_evaluation_reviews
+from app.models.base import Evaluation
+
+_RESULT = {"summary": {"overall": "good", "counts": {}}}
+
+
+async def _seed(session, *conversation_ids):
+    session.add_all(
+        Evaluation(id=uuid4(), conversation_id=cid, evaluation_result=_RESULT, review_note="old", bot_index=1)
+        for cid in conversation_ids
+    )
+    await session.commit()
+
+
+async def _review(session, *items):
+    results = await update_evaluation_reviews(EvaluationReviewBulkRequest(items=list(items)), session)
+    return {r.conversation_id: (r.reviewed, r.review_note) for r in results}
+
+
+async def _stored(session):
+    session.expire_all()
+    rows = (await session.execute(select(Evaluation.conversation_id, Evaluation.reviewed, Evaluation.review_note))).all()
+    return {cid: (reviewed, note) for cid, reviewed, note in rows}
+
+
+def test_reviewed_only_batch(run_db):
+    async def test(session):
+        await _seed(session, "a", "b")
+        updated = await _review(session, {"conversation_id": "a", "reviewed": True}, {"conversation_id": "b", "reviewed": True})
+        assert updated == {"a": (True, "old"), "b": (True, "old")}
+        assert await _stored(session) == updated
+
+    run_db(test)
+
+
+def test_note_only_batch(run_db):
+    async def test(session):
+        await _seed(session, "a", "b")
+        updated = await _review(session, {"conversation_id": "a", "review_note": "x"}, {"conversation_id": "b", "review_note": "y"})
+        assert updated == {"a": (False, "x"), "b": (False, "y")}
+        assert await _stored(session) == updated
+
+    run_db(test)
+
+
+def test_mixed_batch(run_db):
+    async def test(session):
+        await _seed(session, "a", "b", "c")
+        updated = await _review(
+            session,
+            {"conversation_id": "a", "reviewed": True},
+            {"conversation_id": "b", "review_note": "y"},
+            {"conversation_id": "missing", "reviewed": True},
+        )
+        assert updated == {"a": (True, "old"), "b": (False, "y")}
+        assert await _stored(session) == {"a": (True, "old"), "b": (False, "y"), "c": (False, "old")}
+
+    run_db(test)